@@ -0,0 +1,112 @@
+# app/question_cards.py
+"""
+Lightweight rendering for question blocks.
+
+question_cards() draws every block, its numbered questions and a copy button in ONE iframe
+(one delta message, one document for the browser) instead of an iframe per block plus an
+st.write per question. Question text comes from the LLM, so everything is escaped before it
+goes into the iframe, which runs scripts. blocks_markdown() is the iframe-free variant for
+places that need no copy button (streaming progress, the Recent list): one st.markdown call.
+
+The builders do not import Streamlit, so they can be tested and timed on their own.
+"""
+import html
+import json
+
+CARD_CSS = """
+<style>
+:root { color-scheme: light dark; --fg: #31333f; --muted: #6b7080; --border: rgba(49,51,63,0.15); }
+@media (prefers-color-scheme: dark) { :root { --fg: #fafafa; --muted: #9aa0a6; --border: rgba(250,250,250,0.12); } }
+body { margin: 0; font-family: "Source Sans Pro", sans-serif; color: var(--fg); background: transparent; }
+.card { border: 1px solid var(--border); border-radius: 8px; padding: 14px 18px; margin-bottom: 12px; }
+.card h4 { margin: 0 0 6px 0; font-size: 18px; }
+.card small { color: var(--muted); font-weight: 400; }
+.card ol { margin: 0 0 10px 0; padding-left: 22px; line-height: 1.5; }
+.copy-btn { background: transparent; color: var(--fg); border: 1px solid var(--border); padding: 6px 10px;
+            border-radius: 6px; cursor: pointer; }
+</style>
+"""
+
+# One delegated listener for every button; the texts travel once, as JSON.
+COPY_SCRIPT = """
+<script>
+const TEXTS = %s;
+document.addEventListener("click", (event) => {
+  const button = event.target.closest(".copy-btn");
+  if (!button) return;
+  const text = TEXTS[Number(button.dataset.block)];
+  const done = () => { button.textContent = "Copied"; setTimeout(() => { button.textContent = "Copy to clipboard"; }, 1500); };
+  if (navigator.clipboard && window.isSecureContext) {
+    navigator.clipboard.writeText(text).then(done);
+  } else {
+    const area = document.createElement("textarea");
+    area.value = text;
+    document.body.appendChild(area);
+    area.select();
+    document.execCommand("copy");
+    area.remove();
+    done();
+  }
+});
+</script>
+"""
+
+# fallback iframe height estimate (components.html cannot size itself to its content)
+CARD_HEIGHT = 90
+LINE_HEIGHT = 24
+CHARS_PER_LINE = 120
+MAX_HEIGHT = 1600
+
+
+def questions_text(block: dict):
+    return "\n".join(f"{i}. {q}" for i, q in enumerate(block.get("questions") or [], 1))
+
+
+def cards_html(blocks):
+    """
+    Self-contained HTML document for all blocks with one copy button each.
+    """
+    cards = []
+    for i, block in enumerate(blocks):
+        tech = html.escape(str(block.get("technology", "Unknown")))
+        diff = html.escape(str(block.get("difficulty", "medium")))
+        items = "".join(f"<li>{html.escape(str(q))}</li>" for q in block.get("questions") or [])
+        cards.append(f'<div class="card"><h4>{tech} <small>({diff})</small></h4><ol>{items}</ol>'
+                     f'<button class="copy-btn" data-block="{i}">Copy to clipboard</button></div>')
+    texts = json.dumps([questions_text(block) for block in blocks], ensure_ascii=False)
+    texts = texts.replace("<", "\\u003c")  # question text cannot open or close tags inside the script
+    return CARD_CSS + "".join(cards) + COPY_SCRIPT % texts
+
+
+def cards_height(blocks):
+    lines = sum(max(1, -(-len(str(q)) // CHARS_PER_LINE)) for block in blocks for q in block.get("questions") or [])
+    return min(MAX_HEIGHT, CARD_HEIGHT * len(blocks) + LINE_HEIGHT * lines)
+
+
+def blocks_markdown(blocks):
+    """
+    All blocks as one markdown string: a bold heading and a numbered list per block.
+    """
+    parts = []
+    for block in blocks:
+        parts.append(f"**{block.get('technology', 'Unknown')}** ({block.get('difficulty', 'medium')})\n")
+        parts.extend(f"{i}. {q}" for i, q in enumerate(block.get("questions") or [], 1))
+        parts.append("")
+    return "\n".join(parts)
+
+
+def question_cards(blocks):
+    """
+    Render blocks with copy buttons as a single iframe.
+    """
+    import streamlit as st # type: ignore
+
+    if not blocks:
+        return
+    doc = cards_html(blocks)
+    if hasattr(st, "iframe"):
+        st.iframe(doc, height="content")
+    else:
+        import streamlit.components.v1 as components # type: ignore
+        height = cards_height(blocks)
+        components.html(doc, height=height, scrolling=height >= MAX_HEIGHT)
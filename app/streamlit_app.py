@@ -4,22 +4,21 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st # type: ignore
+import html
 import json
 import time
-from backend.generator import generate_questions_for_techs
-from backend.storage import save_candidate_with_questions, load_recent_with_questions
+from backend import metrics
+from backend.generator import stream_questions_for_techs
+from backend.jobs import enqueue_generation, get_job, job_dedupe_key
+from backend.event_log import get_default_log, mark_saved
+from backend.matching import match_candidates
+from backend.storage import save_candidate_with_questions, load_recent_page, search_candidates
 from backend.utils import split_tech_stack, format_questions_as_text
+from app.question_cards import blocks_markdown, question_cards
 
-# Basic CSS for nicer cards / layout
+# Basic CSS for the header (question cards are styled in app/question_cards.py)
 CARD_CSS = """
 <style>
-.card {
-  background-color: rgba(255,255,255,0.02);
-  border-radius: 8px;
-  padding: 18px;
-  margin-bottom: 12px;
-  box-shadow: 0 1px 2px rgba(0,0,0,0.3);
-}
 .header {
   display:flex;
   align-items:center;
@@ -34,12 +33,6 @@ CARD_CSS = """
   color:#9aa0a6;
   margin:0;
 }
-.copy-btn {
-  background-color: transparent;
-  border: 1px solid rgba(255,255,255,0.08);
-  padding: 6px 10px;
-  border-radius: 6px;
-}
 </style>
 """
 
@@ -67,6 +60,17 @@ with st.form("candidate_form"):
     difficulty = st.selectbox("Question difficulty", options=["easy", "medium", "hard"], index=1)
     submit = st.form_submit_button("Submit & Generate")
 
+USE_JOB_QUEUE = os.getenv("TALENTSCOUT_JOB_QUEUE", "0") == "1"
+SHOW_ADMIN = os.getenv("TALENTSCOUT_ADMIN", "0") == "1"
+USE_EVENT_LOG = os.getenv("TALENTSCOUT_EVENT_LOG", "1") == "1"
+RECENT_PAGE_SIZE = 8
+
+
+def recent_changed():
+    # a new submission goes on top: go back to the first page (storage's page cache sees the new row itself)
+    st.session_state.recent_cursors = [None]
+
+
 # Ensure session keys
 if "generated" not in st.session_state:
     st.session_state.generated = None
@@ -89,63 +93,201 @@ if submit:
             "tech_stack": techs,
             "timestamp": int(time.time()),
         }
-        with st.spinner("Generating questions..."):
-            questions = generate_questions_for_techs(techs, difficulty=difficulty, years_experience=years_exp)
+        if USE_JOB_QUEUE:
+            # Hand off to the worker pool; the job id survives reruns and reloads via the URL
+            job_candidate = {k: v for k, v in candidate.items() if k not in ("tech_stack", "timestamp")}
+            st.query_params["job"] = str(enqueue_generation(job_candidate, techs, difficulty=difficulty, years_experience=int(years_exp)))
+            st.session_state.candidate = candidate
+            st.session_state.generated = None
+        else:
+            # Stream cards in as each technology's questions complete (one element, replaced per block)
+            live = st.empty()
+            live.caption("Generating questions...")
+            by_tech = {}
+            for tech, block in stream_questions_for_techs(techs, difficulty=difficulty, years_experience=years_exp):
+                by_tech[tech] = block
+                live.markdown(blocks_markdown(list(by_tech.values())))
+            live.empty()
+            questions = [by_tech[t] for t in techs if t in by_tech]
             st.session_state.generated = questions
             st.session_state.candidate = candidate
-            # Save to DB
-            try:
-                db_id = save_candidate_with_questions(candidate, questions)
-                st.success(f"Saved submission (id={db_id}).")
-            except Exception as e:
-                st.warning(f"Could not save to DB: {e}")
-
-# Display generated questions in "cards" with copy-button
+            # Log the submission; a double-submit of the same details is not saved twice
+            logged, after_insert = True, None
+            if USE_EVENT_LOG:
+                key = job_dedupe_key(candidate, techs, difficulty)
+                seq = get_default_log().append(candidate, techs, difficulty, question_blocks=questions, key=key)
+                logged = seq is not None
+                if logged:
+                    after_insert = mark_saved(seq, key)  # so a later log replay does not save it again
+            if not logged:
+                st.info("Duplicate submission: already saved a moment ago.")
+            else:
+                # Save to DB
+                try:
+                    db_id = save_candidate_with_questions(candidate, questions, after_insert=after_insert)
+                    recent_changed()
+                    st.success(f"Saved submission (id={db_id}).")
+                except Exception as e:
+                    if after_insert is not None:
+                        get_default_log().forget(key)  # nothing was saved: let a resubmit through
+                    st.warning(f"Could not save to DB: {e}")
+
+# Poll a queued generation job until the worker finishes it
+job_param = st.query_params.get("job")
+if USE_JOB_QUEUE and job_param:
+    try:
+        job = get_job(int(job_param))
+    except ValueError:
+        job = None
+    if job is None:
+        st.warning("Generation job not found.")
+        del st.query_params["job"]
+    elif job["status"] in ("queued", "running"):
+        st.info(f"Generating questions (job {job['id']}, {job['status']})...")
+        time.sleep(1)
+        st.rerun()
+    elif job["status"] == "failed":
+        st.error(f"Generation failed: {job['error']}")
+        del st.query_params["job"]
+    else:
+        st.session_state.generated = job["result"]
+        if job["candidate_id"]:
+            recent_changed()
+            st.success(f"Saved submission (id={job['candidate_id']}).")
+        del st.query_params["job"]
+
+# Display generated questions in "cards" with copy-button (all blocks in one component)
 if st.session_state.get("generated"):
     st.success("Questions generated:")
-    for i, block in enumerate(st.session_state["generated"]):
-        tech = block.get("technology", "Unknown")
-        diff = block.get("difficulty", "medium")
-        qs = block.get("questions", []) or []
-        st.markdown(f'<div class="card"><h4 style="margin:0;">{tech} <small style="color:#9aa0a6;">({diff})</small></h4>', unsafe_allow_html=True)
-        # Numbered list
-        for idx, q in enumerate(qs, 1):
-            st.write(f"{idx}. {q}")
-        # Copy button (small HTML widget)
-        safe_text = "\n".join([f"{idx}. {q}" for idx, q in enumerate(qs, 1)])
-        # unique id per block
-        uid = f"copy_{i}_{tech}".replace(" ", "_")
-        html = f"""
-        <div style="margin-top:8px;">
-          <button class="copy-btn" onclick="const t=document.getElementById('{uid}'); navigator.clipboard.writeText(t.innerText).then(()=>{{alert('Copied to clipboard')}});">Copy to clipboard</button>
-          <pre id="{uid}" style="display:none;">{safe_text}</pre>
-        </div>
-        """
-        st.components.v1.html(html, height=60)
-        st.markdown("</div>", unsafe_allow_html=True)
+    question_cards(st.session_state["generated"])
 
     payload = {"candidate": st.session_state.get("candidate"), "questions": st.session_state.get("generated")}
     st.download_button("Download JSON", data=json.dumps(payload, ensure_ascii=False, indent=2), file_name="screening_result.json", mime="application/json")
     st.download_button("Download TXT", data=format_questions_as_text(payload), file_name="screening_result.txt")
 
-# Show recent submissions from DB
-st.markdown("---")
-st.subheader("Recent Submissions")
-recent = load_recent_with_questions(8)
-if recent:
-    for item in recent:
+# Search the whole submission history
+# Sections below are fragments: typing, paging or matching reruns only that section, not the page.
+SEARCH_PAGE_SIZE = 10
+
+
+def set_search_page(page):
+    st.session_state.search_page = page
+
+
+@st.fragment
+def search_section():
+    st.subheader("Search Candidates")
+    search_query = st.text_input("Name, position, location, technology or question text", key="search_query")
+    if not search_query.strip():
+        return
+    if st.session_state.get("search_for") != search_query:
+        st.session_state.search_for = search_query
+        st.session_state.search_page = 0
+    page = st.session_state.get("search_page", 0)
+    found = search_candidates(search_query, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+    st.caption(f"{found['total']} match(es)")
+    lines = []
+    for hit in found["items"]:
+        # candidate fields are user input and this markdown allows HTML: escape all of them
+        c = {k: html.escape(str(v if v is not None else "")) for k, v in hit["candidate"].items()}
+        lines.append(f"**{c['full_name']}** — {c['desired_position']} • {c['location']} • {c['created_at']}")
+        if hit["snippet"]:
+            lines.append(f"<small>{html.escape(hit['snippet'])}</small>")
+    if lines:
+        st.markdown("\n\n".join(lines), unsafe_allow_html=True)
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if page > 0:
+            st.button("Previous results", on_click=set_search_page, args=(page - 1,))
+    with next_col:
+        if (page + 1) * SEARCH_PAGE_SIZE < found["total"]:
+            st.button("More results", on_click=set_search_page, args=(page + 1,))
+
+
+# Rank the stored pool against an open role
+@st.fragment
+def match_section():
+    st.subheader("Match Candidates")
+    with st.form("match_form"):
+        role_stack = st.text_input("Role tech stack", placeholder="Python, Django, PostgreSQL, Docker")
+        must_have = st.text_input("Must-have technologies (optional)")
+        exp_col, k_col = st.columns(2)
+        with exp_col:
+            target_years = st.number_input("Target years of experience", min_value=0, max_value=40, value=3)
+        with k_col:
+            top_k = st.number_input("Show top", min_value=1, max_value=200, value=20)
+        find = st.form_submit_button("Match")
+    if find and role_stack.strip():
+        hits = match_candidates(role_stack, must_have=must_have, k=int(top_k), target_years=target_years or None)
+        if hits:
+            st.table([{
+                "score": h["score"],
+                "name": h["candidate"]["full_name"],
+                "position": h["candidate"]["desired_position"],
+                "years": h["years_experience"],
+                "matched": ", ".join(h["matched"]),
+                "stack": h["candidate"]["tech_stack_raw"],
+            } for h in hits])
+        else:
+            st.info("No stored candidates list any of those technologies.")
+
+
+# Show recent submissions from DB, a page at a time (keyset cursors kept in session state)
+def recent_older(cursor):
+    st.session_state.recent_cursors.append(cursor)
+
+
+def recent_newer():
+    st.session_state.recent_cursors.pop()
+
+
+@st.fragment
+def recent_section():
+    st.subheader("Recent Submissions")
+    if "recent_cursors" not in st.session_state:
+        st.session_state.recent_cursors = [None]
+    cursors = st.session_state.recent_cursors
+    page = load_recent_page(limit=RECENT_PAGE_SIZE, cursor=cursors[-1])
+    if not page["items"]:
+        st.info("No submissions yet. Submit a candidate above to create entries.")
+        return
+    for item in page["items"]:
         c = item["candidate"]
-        st.markdown(f"**{c.get('full_name')}** — {c.get('desired_position','')} • {c.get('created_at')}")
-        # show short tech stack
-        st.write(c.get("tech_stack_raw"))
-        # small collapse for questions
-        with st.expander("View generated questions"):
-            for block in item["question_blocks"]:
-                st.write(f"**{block['technology']}** ({block['difficulty']})")
-                for idx, q in enumerate(block["questions"], 1):
-                    st.write(f"{idx}. {q}")
-else:
-    st.info("No submissions yet. Submit a candidate above to create entries.")
+        # one expander per candidate, its whole stack and questions in a single markdown element
+        with st.expander(f"{c.get('full_name')} — {c.get('desired_position','')} • {c.get('created_at')}"):
+            st.markdown(f"{c.get('tech_stack_raw')}\n\n{blocks_markdown(item['question_blocks'])}")
+    newer_col, older_col = st.columns(2)
+    with newer_col:
+        if len(cursors) > 1:
+            st.button("Newer", key="recent_newer", on_click=recent_newer)
+    with older_col:
+        if page["next_cursor"]:
+            st.button("Older", key="recent_older", on_click=recent_older, args=(page["next_cursor"],))
+
+
+st.markdown("---")
+search_section()
+st.markdown("---")
+match_section()
+st.markdown("---")
+recent_section()
+
+# Stage timings and counters for this server process
+if SHOW_ADMIN:
+    with st.sidebar.expander("Admin: metrics"):
+        snap = metrics.snapshot()
+        if not snap["enabled"]:
+            st.caption("Metrics are disabled (TALENTSCOUT_METRICS=0).")
+        for name, rows in snap["histograms"].items():
+            st.markdown(f"**{name}**")
+            st.table([{**r["labels"], "count": r["count"], "p50 ms": r["p50_ms"], "p95 ms": r["p95_ms"], "p99 ms": r["p99_ms"]} for r in rows])
+        counts = [{"metric": name, **r["labels"], "value": r["value"]}
+                  for group in ("counters", "gauges") for name, rows in snap[group].items() for r in rows]
+        if counts:
+            st.table(counts)
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
 
 st.markdown("---")
 st.caption("TalentScout — persisted with SQLite. Keep your DB file secure.")
@@ -2,5 +2,30 @@
 """
 Backend package for TalentScout Hiring Assistant.
 Expose top-level helper(s) for convenience.
+
+Helpers are resolved on first attribute access (PEP 562), so `import backend` or importing a
+light submodule (utils, metrics, normalizer) does not pull in requests, NumPy or SQLAlchemy.
 """
-from .generator import generate_questions_for_techs
+import importlib
+
+_LAZY = {
+    "generate_questions_for_techs": "backend.generator",
+    "stream_questions_for_techs": "backend.generator",
+    "save_candidate_with_questions": "backend.storage",
+    "init_db": "backend.storage",
+}
+
+__all__ = sorted(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
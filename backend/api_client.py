@@ -1,38 +1,362 @@
 # backend/api_client.py
 import os
-import requests
+import json
 import time
+import random
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend import metrics
+
+logger = logging.getLogger(__name__)
 
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 MISTRAL_API_URL = os.getenv("MISTRAL_API_URL", "https://api.mistral.ai")
 MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", "")
 
+MISTRAL_MAX_NEW_TOKENS = int(os.getenv("MISTRAL_MAX_NEW_TOKENS", "512"))  # output budget per request; see prompts.PromptPlanner
+MISTRAL_POOL_SIZE = int(os.getenv("MISTRAL_POOL_SIZE", "10"))
+MISTRAL_MAX_RETRIES = int(os.getenv("MISTRAL_MAX_RETRIES", "3"))
+MISTRAL_BACKOFF_BASE = float(os.getenv("MISTRAL_BACKOFF_BASE", "0.5"))
+MISTRAL_BACKOFF_MAX = float(os.getenv("MISTRAL_BACKOFF_MAX", "8"))
+MISTRAL_RATE_LIMIT = float(os.getenv("MISTRAL_RATE_LIMIT", "5"))  # requests per second, 0 disables
+MISTRAL_RATE_BURST = int(os.getenv("MISTRAL_RATE_BURST", "10"))
+MISTRAL_BREAKER_THRESHOLD = int(os.getenv("MISTRAL_BREAKER_THRESHOLD", "5"))
+MISTRAL_BREAKER_RESET = float(os.getenv("MISTRAL_BREAKER_RESET", "30"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without touching the network while the provider is considered down."""
+
+
+class RequestCancelled(RuntimeError):
+    """Raised instead of sending or retrying once the caller no longer wants the response."""
+
+
+_call_context = threading.local()
+
+
+@contextmanager
+def cancellation(event: threading.Event):
+    """
+    Requests made by this thread inside the block stop retrying (and are not sent) once event
+    is set. Used by backend.routing to call off the losing side of a hedged request.
+    """
+    previous = getattr(_call_context, "cancel", None)
+    _call_context.cancel = event
+    try:
+        yield event
+    finally:
+        _call_context.cancel = previous
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. One instance is shared by every session in the process.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None):
+        """
+        Block until a token is available. Returns False if timeout elapses first.
+        """
+        if not self.rate:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_for = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; after `reset_timeout` seconds a single
+    trial request is let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        # the request allow() let through was abandoned without an outcome
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+def _retry_after_seconds(value):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date). Returns None if absent/invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class MistralClient:
+    """
+    Pooled HTTP client for the Mistral inference endpoint.
+    Keeps connections alive across calls, retries 429/5xx and network errors with exponential
+    backoff + jitter (honouring Retry-After), rate-limits through a token bucket and short-circuits
+    through a circuit breaker while the provider is failing.
+    """
+
+    def __init__(self, base_url: str = None, api_key: str = None, model: str = None, pool_size: int = None,
+                 max_retries: int = None, backoff_base: float = None, backoff_max: float = None,
+                 rate_limiter: TokenBucket = None, breaker: CircuitBreaker = None, session=None):
+        self.base_url = (base_url or MISTRAL_API_URL).rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.max_retries = MISTRAL_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = MISTRAL_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = MISTRAL_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker or CircuitBreaker(MISTRAL_BREAKER_THRESHOLD, MISTRAL_BREAKER_RESET)
+        if session is None:
+            pool_size = pool_size or MISTRAL_POOL_SIZE
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def build_request(self, prompt: str, model: str = None, temperature: float = 0.2, max_new_tokens: int = None):
+        api_key = self.api_key or os.getenv("MISTRAL_API_KEY") or MISTRAL_API_KEY
+        if not api_key:
+            raise RuntimeError("MISTRAL_API_KEY not set in environment. Provide key in .env or Streamlit sidebar.")
+
+        model = model or self.model or MISTRAL_MODEL
+        if model:
+            url = f"{self.base_url}/v1/models/{model}/generate"
+        else:
+            # Generic chat completions endpoint (if modelless)
+            url = f"{self.base_url}/v1/chat/completions"
+
+        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        payload = {
+            # The exact payload expected by Mistral may differ; adapt if necessary.
+            "input": prompt,
+            "temperature": temperature,
+            "max_new_tokens": max_new_tokens or MISTRAL_MAX_NEW_TOKENS,
+        }
+        return url, headers, payload
+
+    def _backoff(self, attempt: int, retry_after: float = None):
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max * 4))
+        return delay
+
+    def _post(self, url, headers, payload, timeout, stream=False):
+        """
+        POST with rate limiting, retries and circuit breaking. Returns a successful response.
+        """
+        if not self.breaker.allow():
+            metrics.inc("talentscout_mistral_errors_total", reason="circuit_open")
+            raise CircuitOpenError("Mistral circuit breaker is open; skipping request")
+
+        cancel = getattr(_call_context, "cancel", None)
+        attempt = 0
+        try:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise RequestCancelled("Mistral request cancelled")
+                if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=timeout):
+                    # our own rate limit, not a provider failure
+                    raise TimeoutError("Timed out waiting for Mistral rate limiter")
+                retry_after = None
+                try:
+                    resp = self.session.post(url, headers=headers, json=payload, timeout=timeout, stream=stream)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                else:
+                    if resp.status_code not in RETRYABLE_STATUS:
+                        # client errors (bad key, bad payload) say nothing about provider health
+                        self.breaker.record_success()
+                        resp.raise_for_status()
+                        return resp
+                    retry_after = _retry_after_seconds(resp.headers.get("Retry-After"))
+                    error = requests.HTTPError(f"{resp.status_code} from Mistral", response=resp)
+                    resp.close()
+
+                if attempt >= self.max_retries:
+                    self.breaker.record_failure()
+                    metrics.inc("talentscout_mistral_errors_total", reason=type(error).__name__)
+                    raise error
+                delay = self._backoff(attempt, retry_after)
+                logger.info("Mistral request failed (%s); retry %d/%d in %.2fs", error, attempt + 1, self.max_retries, delay)
+                metrics.inc("talentscout_mistral_retries_total")
+                if cancel is not None:
+                    if cancel.wait(delay):
+                        raise RequestCancelled("Mistral request cancelled")
+                else:
+                    time.sleep(delay)
+                attempt += 1
+        except BaseException:
+            # cancelled, rate-limited locally or an unexpected error (e.g. ChunkedEncodingError):
+            # free a half-open trial so the breaker is not stuck open (a no-op after an outcome)
+            self.breaker.release()
+            raise
+
+    def generate(self, prompt: str, model: str = None, temperature: float = 0.2, timeout: float = 30,
+                 max_new_tokens: int = None):
+        """
+        Returns the raw parsed JSON response (caller should extract text).
+        """
+        url, headers, payload = self.build_request(prompt, model=model, temperature=temperature, max_new_tokens=max_new_tokens)
+        return self._post(url, headers, payload, timeout).json()
+
+    def stream(self, prompt: str, model: str = None, temperature: float = 0.2, timeout: float = 30,
+               max_new_tokens: int = None):
+        """
+        Streaming variant of generate(). Yields each server-sent event as parsed JSON (or the raw
+        string if an event is not JSON). Servers that ignore "stream" and answer with a single JSON
+        body yield that body once. Retries only happen before the first byte is received.
+        """
+        url, headers, payload = self.build_request(prompt, model=model, temperature=temperature, max_new_tokens=max_new_tokens)
+        payload["stream"] = True
+        headers = dict(headers, Accept="text/event-stream")
+        resp = self._post(url, headers, payload, timeout, stream=True)
+        try:
+            if "text/event-stream" not in resp.headers.get("Content-Type", ""):
+                yield resp.json()
+                return
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    yield json.loads(data)
+                except ValueError:
+                    yield data
+        except (requests.ConnectionError, requests.Timeout):
+            self.breaker.record_failure()
+            raise
+        finally:
+            resp.close()
+
+    async def agenerate(self, prompt: str, model: str = None, temperature: float = 0.2, timeout: float = 30,
+                        max_new_tokens: int = None):
+        """
+        Awaitable wrapper around generate(), not async I/O: the blocking call runs on a worker thread
+        from the default executor, so each in-flight request holds a thread. Cancelling the awaiting
+        task stops further retries and backoff, but an HTTP request already on the wire runs until it
+        completes or hits timeout.
+        """
+        cancel = threading.Event()
+
+        def call():
+            with cancellation(cancel):
+                return self.generate(prompt, model, temperature, timeout, max_new_tokens)
+
+        try:
+            return await asyncio.to_thread(call)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+
+    def close(self):
+        self.session.close()
+
+
+_shared_rate_limiter = TokenBucket(MISTRAL_RATE_LIMIT, MISTRAL_RATE_BURST)
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Process-wide client, so all Streamlit sessions share the connection pool, rate limiter and breaker.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = MistralClient(rate_limiter=_shared_rate_limiter)
+        return _default_client
+
+
 def call_mistral(prompt: str, model: str = None, temperature: float = 0.2, timeout: int = 30):
     """
     Minimal HTTP client to call Mistral inference endpoint.
     Adjust path/payload per your Mistral docs.
     Returns the raw parsed JSON response (caller should extract text).
     """
-    api_key = os.getenv("MISTRAL_API_KEY") or MISTRAL_API_KEY
-    if not api_key:
-        raise RuntimeError("MISTRAL_API_KEY not set in environment. Provide key in .env or Streamlit sidebar.")
-
-    model = model or MISTRAL_MODEL
-    if model:
-        url = f"{MISTRAL_API_URL}/v1/models/{model}/generate"
-    else:
-        # Generic chat completions endpoint (if modelless)
-        url = f"{MISTRAL_API_URL}/v1/chat/completions"
-
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-
-    payload = {
-        # The exact payload expected by Mistral may differ; adapt if necessary.
-        "input": prompt,
-        "temperature": temperature,
-        "max_new_tokens": 512,
-    }
-
-    resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
-    resp.raise_for_status()
-    return resp.json()
+    return get_default_client().generate(prompt, model=model, temperature=temperature, timeout=timeout)
+
+
+async def acall_mistral(prompt: str, model: str = None, temperature: float = 0.2, timeout: int = 30):
+    return await get_default_client().agenerate(prompt, model=model, temperature=temperature, timeout=timeout)
+
+
+def stream_mistral(prompt: str, model: str = None, temperature: float = 0.2, timeout: int = 30):
+    """
+    Yields streamed response events from the shared client (see MistralClient.stream).
+    """
+    return get_default_client().stream(prompt, model=model, temperature=temperature, timeout=timeout)
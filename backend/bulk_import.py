@@ -0,0 +1,198 @@
+# backend/bulk_import.py
+"""
+Batch entry point for screening a whole hiring drive from a CSV or JSONL export.
+
+    python -m backend.bulk_import candidates.jsonl --difficulty medium --workers 4
+
+Questions are generated once per unique (technology, difficulty) across each batch, and
+candidates are written with bulk inserts. Progress is checkpointed after every committed
+batch so an interrupted run resumes where it stopped.
+"""
+import os
+import csv
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.generator import generate_questions_for_techs
+from backend.storage import save_candidates_bulk
+from backend.utils import split_tech_stack
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_FIELDS = ("full_name", "email", "phone", "years_experience", "desired_position", "location", "tech_stack_raw")
+
+
+def iter_candidate_records(path: str):
+    """
+    Stream raw records from a .jsonl or .csv file, one dict at a time.
+    Unparseable JSONL lines are yielded as None so line offsets stay stable for checkpoints.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield row
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                yield None
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed line: %.80s", line)
+                yield None
+
+
+def normalize_record(record: dict, default_difficulty: str = "medium"):
+    """
+    Map a raw export record (submissions.jsonl or CSV row) to (candidate, techs, difficulty).
+    Returns None if the record has no usable tech stack.
+    """
+    if not isinstance(record, dict):
+        return None
+    raw = record.get("tech_stack_raw")
+    stack = record.get("tech_stack")
+    if not raw and stack:
+        raw = ", ".join(stack) if isinstance(stack, list) else str(stack)
+    techs = split_tech_stack(raw or "")
+    if not techs:
+        return None
+    candidate = {k: record.get(k) for k in CANDIDATE_FIELDS}
+    candidate["tech_stack_raw"] = raw
+    try:
+        candidate["years_experience"] = int(candidate["years_experience"]) if candidate["years_experience"] not in (None, "") else None
+    except (TypeError, ValueError):
+        candidate["years_experience"] = None
+    difficulty = (record.get("difficulty") or default_difficulty).lower()
+    return candidate, techs, difficulty
+
+
+def _read_checkpoint(path: str):
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        return int(json.load(f).get("records_done", 0))
+
+
+def _write_checkpoint(path: str, source: str, records_done: int, candidates_saved: int):
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"source": os.path.abspath(source), "records_done": records_done,
+                   "candidates_saved": candidates_saved, "updated_at": int(time.time())}, f)
+    os.replace(tmp, path)  # atomic, so a crash never leaves a half-written checkpoint
+
+
+def _generate_unique(pairs, workers: int, group_size: int = 5, model=None):
+    """
+    Generate questions once per unique (tech, difficulty) pair on a worker pool.
+    Returns {(tech, difficulty): block}.
+    """
+    by_difficulty = {}
+    for tech, difficulty in pairs:
+        by_difficulty.setdefault(difficulty, []).append(tech)
+    jobs = []
+    for difficulty, techs in by_difficulty.items():
+        for i in range(0, len(techs), group_size):
+            jobs.append((techs[i:i + group_size], difficulty))
+
+    def run(job):
+        techs, difficulty = job
+        return techs, difficulty, generate_questions_for_techs(techs, difficulty=difficulty, model=model)
+
+    out = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for techs, difficulty, blocks in pool.map(run, jobs):
+            for tech, block in zip(techs, blocks):
+                out[(tech, difficulty)] = block
+    return out
+
+
+def import_candidates(path: str, default_difficulty: str = "medium", batch_size: int = 200, workers: int = 4,
+                      checkpoint: str = None, resume: bool = True, model=None, chunk_size: int = 500):
+    """
+    Import every candidate in `path`. Returns a summary dict with counts and throughput.
+    """
+    skip = _read_checkpoint(checkpoint) if resume else 0
+    if skip:
+        logger.info("Resuming %s after %d records", path, skip)
+
+    started = time.monotonic()
+    records_done = skip
+    saved = 0
+    skipped = 0
+    batch = []
+    generated_pairs = set()
+
+    def flush():
+        nonlocal saved
+        pairs = {(tech, difficulty) for _, techs, difficulty in batch for tech in techs}
+        generated = _generate_unique(sorted(pairs), workers=workers, model=model)
+        generated_pairs.update(pairs)
+        items = [(candidate, [generated[(tech, difficulty)] for tech in techs]) for candidate, techs, difficulty in batch]
+        save_candidates_bulk(items, chunk_size=chunk_size)
+        saved += len(items)
+        _write_checkpoint(checkpoint, path, records_done, saved)
+        elapsed = time.monotonic() - started
+        logger.info("Imported %d candidates (%.1f candidates/s)", saved, saved / elapsed if elapsed else 0.0)
+        batch.clear()
+
+    for index, record in enumerate(iter_candidate_records(path)):
+        if index < skip:
+            continue
+        normalized = normalize_record(record, default_difficulty)
+        records_done = index + 1
+        if normalized is None:
+            skipped += 1
+            continue
+        batch.append(normalized)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    else:
+        _write_checkpoint(checkpoint, path, records_done, saved)
+
+    elapsed = time.monotonic() - started
+    return {
+        "records": records_done - skip,
+        "candidates_saved": saved,
+        "skipped": skipped,
+        "unique_tech_difficulty": len(generated_pairs),
+        "seconds": round(elapsed, 3),
+        "candidates_per_second": round(saved / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-import candidates and generate screening questions.")
+    parser.add_argument("path", help="CSV or JSONL file of candidates (submissions.jsonl format)")
+    parser.add_argument("--difficulty", default="medium", choices=["easy", "medium", "hard"])
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--checkpoint", default=None, help="progress file (default: <path>.checkpoint.json)")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    summary = import_candidates(
+        args.path,
+        default_difficulty=args.difficulty,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint=args.checkpoint or args.path + ".checkpoint.json",
+        resume=not args.no_resume,
+        model=args.model,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
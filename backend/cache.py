@@ -0,0 +1,185 @@
+# backend/cache.py
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+CACHE_DB_FILE = os.getenv("TALENTSCOUT_CACHE_DB", "talentscout_cache.db")
+CACHE_TTL_SECONDS = int(os.getenv("TALENTSCOUT_CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("TALENTSCOUT_CACHE_MAX_ENTRIES", "5000"))
+CACHE_MEMORY_ENTRIES = int(os.getenv("TALENTSCOUT_CACHE_MEMORY_ENTRIES", "512"))
+
+
+def experience_band(years_experience):
+    """
+    Bucket years of experience so that candidates with similar seniority share cache entries.
+    """
+    if years_experience is None:
+        return "any"
+    try:
+        years = int(years_experience)
+    except (TypeError, ValueError):
+        return "any"
+    if years <= 1:
+        return "junior"
+    if years <= 4:
+        return "mid"
+    if years <= 9:
+        return "senior"
+    return "staff"
+
+
+def normalize_tech_key(tech: str):
+    return " ".join((tech or "").lower().split())
+
+
+def make_cache_key(tech: str, difficulty: str = "medium", years_experience=None):
+    return f"{normalize_tech_key(tech)}|{(difficulty or 'medium').lower()}|{experience_band(years_experience)}"
+
+
+class QuestionCache:
+    """
+    Two-tier cache for generated question blocks.
+    Tier 1 is an in-process LRU, tier 2 a SQLite table with TTL and size-based eviction.
+    Values are the block dicts returned by the generator ({technology, difficulty, questions}).
+    """
+
+    def __init__(self, path: str = None, ttl: int = None, max_entries: int = None, memory_entries: int = None):
+        self.path = path or CACHE_DB_FILE
+        self.ttl = CACHE_TTL_SECONDS if ttl is None else ttl
+        self.max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.memory_entries = CACHE_MEMORY_ENTRIES if memory_entries is None else memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS question_cache ("
+            " cache_key TEXT PRIMARY KEY,"
+            " value_json TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_question_cache_last_access ON question_cache (last_access)")
+        self._conn.commit()
+
+    def _remember(self, key, value, stored_at):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if not self.ttl or now - stored_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value_json, created_at FROM question_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value_json, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM question_cache WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE question_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            value = json.loads(value_json)
+            self._remember(key, value, created_at)
+            self.hits += 1
+            return value
+
+    def get_many(self, keys):
+        """
+        Returns {key: value} for the keys that are cached.
+        """
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO question_cache (cache_key, value_json, created_at, last_access) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now, now) for key, value in items.items()],
+            )
+            for key, value in items.items():
+                self._remember(key, value, now)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self.ttl:
+            self._conn.execute("DELETE FROM question_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        if self.max_entries:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                # drop the least recently used rows
+                self._conn.execute(
+                    "DELETE FROM question_cache WHERE cache_key IN ("
+                    " SELECT cache_key FROM question_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM question_cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Process-wide cache shared by all Streamlit sessions.
+    Set TALENTSCOUT_CACHE=0 to disable caching entirely.
+    """
+    global _default_cache
+    if os.getenv("TALENTSCOUT_CACHE", "1") == "0":
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QuestionCache()
+        return _default_cache
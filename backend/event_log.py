@@ -0,0 +1,536 @@
+# backend/event_log.py
+"""
+Append-only submission event log (JSONL), the durable record behind the SQLite store.
+
+    log = get_default_log()
+    log.append(candidate, techs, difficulty="medium", question_blocks=blocks)
+
+Appends are queued to one background writer that flushes in batches (every
+EVENT_LOG_FLUSH_MS or EVENT_LOG_BATCH events). The active segment is current.jsonl; once it
+passes EVENT_LOG_MAX_BYTES or EVENT_LOG_MAX_AGE_SECONDS it is rotated to a gzip segment named
+after the sequence numbers it holds (events-<first>-<last>.jsonl.gz), so readers can skip whole
+segments without opening them.
+
+Each event carries an idempotency key (the job dedupe key: candidate details, stack and
+difficulty). A second submission with the same key within EVENT_LOG_DEDUP_SECONDS is dropped,
+which is what the double-submits in submissions.jsonl need. A caller whose save failed calls
+forget(key) so a retry of the same submission is not taken for a duplicate.
+
+A log directory has ONE writer process: sequence numbers, the dedup window and rotation live
+in the writing process (threads within it are safe), so two processes appending to the same
+directory would hand out clashing seqs. Run the app (or an import) as the only writer per
+directory; tail, replay and stats only read and can run anywhere.
+
+    python -m backend.event_log import submissions.jsonl   # legacy export -> log (deduped)
+    python -m backend.event_log replay                      # log -> SQLite, checkpointed, skips saved events
+    python -m backend.event_log tail --follow
+    python -m backend.event_log stats
+"""
+import os
+import re
+import json
+import mmap
+import gzip
+import time
+import queue
+import shutil
+import atexit
+import logging
+import argparse
+import threading
+
+from backend import metrics
+from backend.bulk_import import iter_candidate_records, normalize_record, _generate_unique
+from backend.jobs import job_dedupe_key
+from backend.models import SavedEvent
+from backend.storage import SessionLocal, save_candidates_bulk
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_DIR = os.getenv("TALENTSCOUT_EVENT_LOG_DIR", "talentscout_events")
+EVENT_LOG_MAX_BYTES = int(os.getenv("TALENTSCOUT_EVENT_LOG_MAX_BYTES", str(16 * 1024 * 1024)))
+EVENT_LOG_MAX_AGE_SECONDS = int(os.getenv("TALENTSCOUT_EVENT_LOG_MAX_AGE_SECONDS", "86400"))
+EVENT_LOG_FLUSH_MS = float(os.getenv("TALENTSCOUT_EVENT_LOG_FLUSH_MS", "200"))
+EVENT_LOG_BATCH = int(os.getenv("TALENTSCOUT_EVENT_LOG_BATCH", "256"))
+EVENT_LOG_FSYNC = os.getenv("TALENTSCOUT_EVENT_LOG_FSYNC", "0") == "1"
+EVENT_LOG_DEDUP_SECONDS = int(os.getenv("TALENTSCOUT_EVENT_LOG_DEDUP_SECONDS", "600"))
+
+ACTIVE_NAME = "current.jsonl"
+SEGMENT_RE = re.compile(r"^events-(\d+)-(\d+)\.jsonl(\.gz)?$")
+
+
+def list_segments(directory: str):
+    """
+    Rotated segments in sequence order as (first_seq, last_seq, path). A segment left
+    uncompressed by a crash mid-rotation is listed unless its .gz finished.
+    """
+    if not os.path.isdir(directory):
+        return []
+    found = {}
+    for name in os.listdir(directory):
+        m = SEGMENT_RE.match(name)
+        if not m:
+            continue
+        first, last = int(m.group(1)), int(m.group(2))
+        if m.group(3) or (first, last) not in found:
+            found[(first, last)] = os.path.join(directory, name)
+    return [(first, last, path) for (first, last), path in sorted(found.items())]
+
+
+def _iter_mmap_lines(path: str):
+    # a trailing line without "\n" is an append still in flight (or torn by a crash): skip it
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while True:
+                end = mm.find(b"\n", pos)
+                if end < 0:
+                    return
+                if end > pos:
+                    yield mm[pos:end]
+                pos = end + 1
+
+
+def _iter_segment_lines(path: str):
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield line[:-1]
+    else:
+        yield from _iter_mmap_lines(path)
+
+
+def _decode(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        logger.warning("Skipping malformed event: %.80r", line)
+        return None
+
+
+def iter_events(directory: str = None, since_seq: int = 0):
+    """
+    Stream every event with seq > since_seq, oldest first: gzip segments are decompressed
+    incrementally, the active segment is read through mmap. Segments entirely at or below
+    since_seq are skipped by name.
+    """
+    directory = directory or EVENT_LOG_DIR
+    for first, last, path in list_segments(directory):
+        if last <= since_seq:
+            continue
+        for line in _iter_segment_lines(path):
+            event = _decode(line)
+            if event and event["seq"] > since_seq:
+                yield event
+    active = os.path.join(directory, ACTIVE_NAME)
+    if os.path.exists(active):
+        for line in _iter_mmap_lines(active):
+            event = _decode(line)
+            if event and event["seq"] > since_seq:
+                yield event
+
+
+def tail(directory: str = None, since_seq: int = None, poll_interval: float = 0.5, stop_event=None):
+    """
+    Yield events as they are flushed to the active segment, following rotations.
+    since_seq=None starts at the current end of the log; pass 0 to read everything first.
+    """
+    directory = directory or EVENT_LOG_DIR
+    last_seq = 0
+    if since_seq is not None:
+        for event in iter_events(directory, since_seq):
+            last_seq = event["seq"]
+            yield event
+    active = os.path.join(directory, ACTIVE_NAME)
+    f = None
+    buf = b""
+    try:
+        while stop_event is None or not stop_event.is_set():
+            if f is None:
+                try:
+                    f = open(active, "rb")
+                except FileNotFoundError:
+                    time.sleep(poll_interval)
+                    continue
+                if since_seq is None and not last_seq:
+                    f.seek(0, os.SEEK_END)
+            chunk = f.read()
+            if chunk:
+                buf += chunk
+                *lines, buf = buf.split(b"\n")
+                for line in lines:
+                    event = _decode(line) if line else None
+                    if event and event["seq"] > last_seq:
+                        last_seq = event["seq"]
+                        yield event
+                continue
+            try:
+                rotated = os.stat(active).st_ino != os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                # the old handle has been drained; the writer reopens a fresh current.jsonl
+                f.close()
+                f, buf = None, b""
+                since_seq = 0
+                continue
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def _last_event(path: str):
+    last = None
+    for line in _iter_segment_lines(path):
+        last = line
+    return _decode(last) if last else None
+
+
+class EventLog:
+    """
+    Buffered writer for one log directory. append() dedupes and assigns the sequence number
+    on the caller's thread, then hands the line to the writer thread; flush() blocks until
+    everything appended so far is on disk.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None, max_age_seconds: int = None,
+                 flush_ms: float = None, batch: int = None, dedup_seconds: int = None, fsync: bool = None):
+        self.directory = directory or EVENT_LOG_DIR
+        self.max_bytes = max_bytes or EVENT_LOG_MAX_BYTES
+        self.max_age = EVENT_LOG_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        self.flush_interval = (EVENT_LOG_FLUSH_MS if flush_ms is None else flush_ms) / 1000
+        self.batch = batch or EVENT_LOG_BATCH
+        self.dedup_seconds = EVENT_LOG_DEDUP_SECONDS if dedup_seconds is None else dedup_seconds
+        self.fsync = EVENT_LOG_FSYNC if fsync is None else fsync
+        self.appended = 0
+        self.duplicates = 0
+        self.rotations = 0
+        self._recent = {}  # idempotency key -> ts, pruned to the dedup window
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._file = None
+        self._segment_first = None
+        self._segment_started = None
+        self._last_written = None
+        self._seq = None
+
+    @property
+    def active_path(self):
+        return os.path.join(self.directory, ACTIVE_NAME)
+
+    def _recover(self):
+        # runs once, under self._lock: finish interrupted rotations, find the last seq and
+        # re-seed the dedup window from the active segment
+        os.makedirs(self.directory, exist_ok=True)
+        for first, last, path in list_segments(self.directory):
+            if not path.endswith(".gz"):
+                self._compress(path)
+        segments = list_segments(self.directory)
+        self._seq = segments[-1][1] if segments else 0
+        if os.path.exists(self.active_path):
+            for line in _iter_mmap_lines(self.active_path):
+                event = _decode(line)
+                if not event:
+                    continue
+                self._seq = max(self._seq, event["seq"])
+                if self._segment_first is None:
+                    self._segment_first, self._segment_started = event["seq"], event["ts"]
+                self._recent[event["key"]] = max(event["ts"], self._recent.get(event["key"], event["ts"]))
+
+    def append(self, candidate: dict, techs: list, difficulty: str = "medium", question_blocks=None,
+               key: str = None, ts: float = None, event_type: str = "submission"):
+        """
+        Queue one submission event. Returns its seq, or None when it is a duplicate of an
+        event appended within the dedup window.
+        """
+        key = key or job_dedupe_key(candidate, techs, difficulty)
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            if self._seq is None:
+                self._recover()
+            seen = self._recent.get(key)
+            if seen is not None and ts - seen < self.dedup_seconds:
+                self.duplicates += 1
+                metrics.inc("talentscout_event_log_duplicates_total")
+                return None
+            if len(self._recent) > 4 * self.batch:
+                cutoff = ts - self.dedup_seconds
+                self._recent = {k: t for k, t in self._recent.items() if t >= cutoff}
+            self._recent[key] = ts
+            self._seq += 1
+            event = {"seq": self._seq, "key": key, "ts": ts, "type": event_type, "candidate": candidate,
+                     "techs": list(techs), "difficulty": difficulty, "question_blocks": question_blocks}
+            self._queue.put((self._seq, ts, json.dumps(event, ensure_ascii=False, default=str) + "\n"))
+            self.appended += 1
+            self._ensure_started()
+        return event["seq"]
+
+    def forget(self, key: str):
+        """
+        Drop key from the dedup window (the logged event stays) so the same submission can be
+        appended again, e.g. after saving it failed.
+        """
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def flush(self, timeout: float = None):
+        done = threading.Event()
+        with self._lock:
+            self._ensure_started()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="talentscout-event-log", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch:
+                    break
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._write(batch)
+                if self._file is not None and self._segment_started is not None and \
+                        time.time() - self._segment_started >= self.max_age:
+                    self._rotate()
+            except Exception:
+                logger.exception("Event log write failed; %d events lost", len(batch))
+            for done in waiters:
+                done.set()
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, batch):
+        if self._file is None:
+            self._file = open(self.active_path, "ab")
+        if self._segment_first is None:
+            self._segment_first, self._segment_started = batch[0][0], time.time()
+        self._file.write("".join(line for _, _, line in batch).encode("utf-8"))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._last_written = batch[-1][0]
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        last = self._last_written or _last_event(self.active_path)["seq"]
+        self._file.close()
+        self._file = None
+        path = os.path.join(self.directory, f"events-{self._segment_first:012d}-{last:012d}.jsonl")
+        os.replace(self.active_path, path)
+        self._segment_first = self._segment_started = None
+        self._compress(path)
+        self.rotations += 1
+
+    @staticmethod
+    def _compress(path):
+        tmp = path + ".gz.tmp"
+        with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, path + ".gz")
+        os.remove(path)
+
+    def stats(self):
+        with self._lock:
+            if self._seq is None:
+                self._recover()
+        segments = list_segments(self.directory)
+        active = os.path.getsize(self.active_path) if os.path.exists(self.active_path) else 0
+        return {
+            "directory": self.directory,
+            "segments": len(segments),
+            "segment_bytes": sum(os.path.getsize(p) for _, _, p in segments),
+            "active_bytes": active,
+            "last_seq": self._seq,
+            "appended": self.appended,
+            "duplicates": self.duplicates,
+            "rotations": self.rotations,
+        }
+
+
+_default_log = None
+_default_lock = threading.Lock()
+
+
+def get_default_log():
+    global _default_log
+    with _default_lock:
+        if _default_log is None:
+            _default_log = EventLog()
+            atexit.register(_default_log.close)
+        return _default_log
+
+
+def import_records(path: str, log: EventLog = None, default_difficulty: str = "medium"):
+    """
+    Append a CSV/JSONL export (submissions.jsonl format) to the log. Records keep their own
+    "timestamp", so double-submits within the dedup window are dropped. Returns (appended, dropped).
+    """
+    log = log or get_default_log()
+    appended = dropped = 0
+    for record in iter_candidate_records(path):
+        normalized = normalize_record(record, default_difficulty)
+        if normalized is None:
+            continue
+        candidate, techs, difficulty = normalized
+        ts = (record or {}).get("timestamp")
+        if log.append(candidate, techs, difficulty, ts=float(ts) if ts else None) is None:
+            dropped += 1
+        else:
+            appended += 1
+    log.flush()
+    return appended, dropped
+
+
+def mark_saved(seq: int, key: str):
+    """
+    after_insert hook for storage.save_candidate_with_questions when saving a logged event:
+    records (seq, key) in saved_events in the same transaction so replay() skips it.
+    """
+    def after_insert(session, candidate_id):
+        session.add(SavedEvent(seq=seq, event_key=key, candidate_id=candidate_id))
+    return after_insert
+
+
+def _saved(events):
+    session = SessionLocal()
+    try:
+        rows = session.query(SavedEvent.seq, SavedEvent.event_key).filter(
+            SavedEvent.seq.in_([e["seq"] for e in events]))
+        return {(seq, key) for seq, key in rows}
+    finally:
+        session.close()
+
+
+def replay(directory: str = None, checkpoint: str = None, since_seq: int = None, batch_size: int = 500,
+           workers: int = 4, model=None):
+    """
+    Rebuild or backfill SQLite from the log. Events that carry question_blocks are saved as-is;
+    the rest get questions generated once per unique (tech, difficulty) per batch, like
+    bulk_import. Events already in saved_events (saved by the app or an earlier replay) are
+    skipped, and the rest are recorded there as they are saved. The last replayed seq is
+    checkpointed after every batch, so a rerun only reads new events. Returns a summary dict.
+    """
+    directory = directory or EVENT_LOG_DIR
+    checkpoint = checkpoint or os.path.join(directory, "replay.checkpoint.json")
+    if since_seq is None:
+        since_seq = 0
+        if os.path.exists(checkpoint):
+            with open(checkpoint, encoding="utf-8") as f:
+                since_seq = int(json.load(f).get("seq", 0))
+    started = time.monotonic()
+    saved = generated = skipped = 0
+    batch = []
+
+    def flush():
+        nonlocal saved, generated, skipped
+        done = _saved(batch)
+        pending = [e for e in batch if (e["seq"], e["key"]) not in done]
+        skipped += len(batch) - len(pending)
+        pairs = {(t, e["difficulty"]) for e in pending if not e.get("question_blocks") for t in e["techs"]}
+        made = _generate_unique(sorted(pairs), workers=workers, model=model) if pairs else {}
+        generated += len(made)
+        items = [(e["candidate"], e.get("question_blocks") or [made[(t, e["difficulty"])] for t in e["techs"]])
+                 for e in pending]
+
+        def record(session, start, candidate_ids):
+            session.add_all(SavedEvent(seq=e["seq"], event_key=e["key"], candidate_id=candidate_id)
+                            for e, candidate_id in zip(pending[start:], candidate_ids))
+
+        save_candidates_bulk(items, chunk_size=batch_size, after_insert=record)
+        saved += len(items)
+        tmp = checkpoint + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": batch[-1]["seq"], "updated_at": int(time.time())}, f)
+        os.replace(tmp, checkpoint)
+        batch.clear()
+
+    for event in iter_events(directory, since_seq):
+        if event.get("type") != "submission":
+            continue
+        batch.append(event)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    elapsed = time.monotonic() - started
+    return {
+        "since_seq": since_seq,
+        "candidates_saved": saved,
+        "already_saved": skipped,
+        "pairs_generated": generated,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(saved / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout submission event log")
+    parser.add_argument("--dir", default=None, help=f"log directory (default: {EVENT_LOG_DIR})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help="append a CSV/JSONL export to the log")
+    p_import.add_argument("path")
+    p_import.add_argument("--difficulty", default="medium", choices=["easy", "medium", "hard"])
+    p_replay = sub.add_parser("replay", help="save logged submissions into the database")
+    p_replay.add_argument("--since-seq", type=int, default=None, help="ignore the checkpoint and start after this seq")
+    p_replay.add_argument("--checkpoint", default=None)
+    p_replay.add_argument("--batch-size", type=int, default=500)
+    p_replay.add_argument("--workers", type=int, default=4)
+    p_tail = sub.add_parser("tail", help="print events as JSON lines")
+    p_tail.add_argument("--since-seq", type=int, default=0)
+    p_tail.add_argument("--follow", action="store_true")
+    sub.add_parser("stats")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    directory = args.dir or EVENT_LOG_DIR
+    if args.command == "import":
+        log = EventLog(directory)
+        appended, dropped = import_records(args.path, log, args.difficulty)
+        log.close()
+        print(json.dumps({"appended": appended, "duplicates_dropped": dropped}))
+    elif args.command == "replay":
+        print(json.dumps(replay(directory, args.checkpoint, args.since_seq, args.batch_size, args.workers), indent=2))
+    elif args.command == "tail":
+        events = tail(directory, args.since_seq) if args.follow else iter_events(directory, args.since_seq)
+        try:
+            for event in events:
+                print(json.dumps(event, ensure_ascii=False), flush=True)
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(EventLog(directory).stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
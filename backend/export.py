@@ -0,0 +1,238 @@
+# backend/export.py
+"""
+Streaming export of the whole submission history for reporting.
+
+Each export is one query read through a server-side cursor in yield_per batches (rows are
+fetched as they are written out; PostgreSQL gets a named cursor via stream_results), so
+memory stays flat however many candidates and questions are stored:
+
+    python -m backend.export candidates candidates.ndjson     # one JSON object per candidate, with its question blocks
+    python -m backend.export questions questions.csv.gz      # one row per question
+    python -m backend.export rollups rollups.csv --since 2026-01-01
+
+The format follows the file extension (.ndjson / .jsonl / .csv, optionally .gz); "-" writes
+to stdout (NDJSON unless --format csv). Per-day aggregates come from storage.rollup_summary.
+"""
+import io
+import os
+import sys
+import csv
+import gzip
+import json
+import time
+import logging
+import argparse
+from datetime import date, datetime, timedelta
+from itertools import groupby
+
+from sqlalchemy import select # type: ignore
+
+from backend.models import Candidate, QuestionBlock, QuestionBlockItem, QuestionRollup, QuestionText
+from backend.storage import SessionLocal, _block_rows_questions
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = int(os.getenv("TALENTSCOUT_EXPORT_BATCH_SIZE", "1000"))
+
+CANDIDATE_FIELDS = ("id", "full_name", "email", "phone", "years_experience", "desired_position", "location",
+                    "tech_stack_raw", "created_at")
+CANDIDATE_CSV_FIELDS = CANDIDATE_FIELDS + ("technologies", "question_count")
+QUESTION_FIELDS = ("candidate_id", "full_name", "email", "desired_position", "candidate_created_at",
+                   "technology", "difficulty", "position", "question")
+ROLLUP_FIELDS = ("day", "tech_key", "difficulty", "blocks", "questions", "fallback_blocks")
+KINDS = ("candidates", "questions", "rollups")
+
+
+def _day(value):
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _stream(session, stmt, batch_size=None):
+    # Core execution on the session's connection: rows are fetched in batches through a
+    # server-side cursor and skip ORM result processing
+    conn = session.connection().execution_options(yield_per=batch_size or EXPORT_BATCH_SIZE)
+    return conn.execute(stmt)
+
+
+def iter_candidates(since=None, until=None, batch_size: int = None):
+    """
+    Every candidate created between since and until (dates, inclusive), oldest first, in the
+    shape of storage.load_recent_with_questions items. One streamed outer-join scan; only the
+    current candidate's rows are held at a time.
+    """
+    stmt = (
+        select(*[getattr(Candidate, f) for f in CANDIDATE_FIELDS],
+               QuestionBlock.id.label("block_id"), QuestionBlock.technology, QuestionBlock.difficulty,
+               QuestionBlock.questions_json, QuestionBlock.created_at.label("block_created_at"), QuestionText.text)
+        .outerjoin(QuestionBlock, QuestionBlock.candidate_id == Candidate.id)
+        .outerjoin(QuestionBlockItem, QuestionBlockItem.block_id == QuestionBlock.id)
+        .outerjoin(QuestionText, QuestionText.id == QuestionBlockItem.question_id)
+        .order_by(Candidate.id, QuestionBlock.id, QuestionBlockItem.position)
+    )
+    if since is not None:
+        stmt = stmt.where(Candidate.created_at >= datetime.combine(_day(since), datetime.min.time()))
+    if until is not None:
+        stmt = stmt.where(Candidate.created_at < datetime.combine(_day(until) + timedelta(days=1), datetime.min.time()))
+    session = SessionLocal()
+    try:
+        rows = _stream(session, stmt, batch_size)
+        for _, candidate_rows in groupby(rows, key=lambda r: r.id):
+            candidate_rows = list(candidate_rows)
+            first = candidate_rows[0]
+            candidate = {f: getattr(first, f) for f in CANDIDATE_FIELDS}
+            candidate["created_at"] = _iso(candidate["created_at"])
+            blocks = []
+            for block_id, block_rows in groupby(candidate_rows, key=lambda r: r.block_id):
+                if block_id is None:
+                    continue
+                block_rows = list(block_rows)
+                blocks.append({
+                    "technology": block_rows[0].technology,
+                    "difficulty": block_rows[0].difficulty,
+                    "questions": _block_rows_questions(block_rows),
+                    "created_at": _iso(block_rows[0].block_created_at),
+                })
+            yield {"candidate": candidate, "question_blocks": blocks}
+    finally:
+        session.close()
+
+
+def iter_question_rows(since=None, until=None, batch_size: int = None):
+    """
+    One flat dict per stored question (QUESTION_FIELDS); candidates without questions are skipped.
+    """
+    for record in iter_candidates(since, until, batch_size):
+        c = record["candidate"]
+        for block in record["question_blocks"]:
+            for position, question in enumerate(block["questions"], 1):
+                yield {
+                    "candidate_id": c["id"], "full_name": c["full_name"], "email": c["email"],
+                    "desired_position": c["desired_position"], "candidate_created_at": c["created_at"],
+                    "technology": block["technology"], "difficulty": block["difficulty"],
+                    "position": position, "question": question,
+                }
+
+
+def iter_candidate_rows(since=None, until=None, batch_size: int = None):
+    """
+    One flat dict per candidate (CANDIDATE_CSV_FIELDS): the candidate columns plus its block
+    technologies and question count.
+    """
+    for record in iter_candidates(since, until, batch_size):
+        row = dict(record["candidate"])
+        row["technologies"] = "; ".join(str(b["technology"]) for b in record["question_blocks"])
+        row["question_count"] = sum(len(b["questions"]) for b in record["question_blocks"])
+        yield row
+
+
+def iter_rollups(since=None, until=None, batch_size: int = None):
+    """
+    question_rollups rows (ROLLUP_FIELDS) between since and until (inclusive), oldest first.
+    """
+    stmt = select(*[getattr(QuestionRollup, f) for f in ROLLUP_FIELDS]).order_by(
+        QuestionRollup.day, QuestionRollup.tech_key, QuestionRollup.difficulty)
+    if since is not None:
+        stmt = stmt.where(QuestionRollup.day >= _day(since))
+    if until is not None:
+        stmt = stmt.where(QuestionRollup.day <= _day(until))
+    session = SessionLocal()
+    try:
+        for row in _stream(session, stmt, batch_size):
+            out = dict(row._mapping)
+            out["day"] = _iso(out["day"])
+            yield out
+    finally:
+        session.close()
+
+
+def write_ndjson(records, fp):
+    """
+    Write one JSON object per line. Returns the number of records.
+    """
+    count = 0
+    for record in records:
+        fp.write(json.dumps(record, ensure_ascii=False))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(rows, fp, fields):
+    """
+    Write a header and one CSV row per dict (extra keys ignored). Returns the number of rows.
+    """
+    writer = csv.DictWriter(fp, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def export(kind: str, fp, fmt: str = "ndjson", since=None, until=None, batch_size: int = None):
+    """
+    Stream one export to the text file object fp. kind is candidates, questions or rollups;
+    fmt is ndjson or csv. Returns the number of records written.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"kind must be one of {', '.join(KINDS)}")
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError("fmt must be ndjson or csv")
+    if kind == "rollups":
+        return (write_csv(iter_rollups(since, until, batch_size), fp, ROLLUP_FIELDS) if fmt == "csv"
+                else write_ndjson(iter_rollups(since, until, batch_size), fp))
+    if kind == "questions":
+        return (write_csv(iter_question_rows(since, until, batch_size), fp, QUESTION_FIELDS) if fmt == "csv"
+                else write_ndjson(iter_question_rows(since, until, batch_size), fp))
+    if fmt == "csv":
+        return write_csv(iter_candidate_rows(since, until, batch_size), fp, CANDIDATE_CSV_FIELDS)
+    return write_ndjson(iter_candidates(since, until, batch_size), fp)
+
+
+def format_for(path: str):
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def open_output(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=False)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream candidates, questions or rollups to NDJSON/CSV")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("out", help='output file (.ndjson/.jsonl/.csv, optionally .gz) or "-" for stdout')
+    parser.add_argument("--format", choices=("ndjson", "csv"), default=None, help="default: from the file extension")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--until", type=date.fromisoformat, default=None, help="YYYY-MM-DD, inclusive")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    fmt = args.format or format_for(args.out)
+    started = time.perf_counter()
+    fp = open_output(args.out)
+    try:
+        count = export(args.kind, fp, fmt, since=args.since, until=args.until, batch_size=args.batch_size)
+    finally:
+        if args.out == "-":
+            fp.flush()
+            fp.detach()
+        else:
+            fp.close()
+    logger.info("Exported %d %s to %s (%s) in %.1fs", count, args.kind, args.out, fmt, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,32 @@
 # backend/generator.py
+import os
 import json
+import time
 import logging
-from backend.api_client import call_mistral
-from backend.prompts import build_generation_prompt
-from backend.utils import extract_json_blob, fallback_generate_questions
+from concurrent.futures import ThreadPoolExecutor, wait
+from backend import metrics
+from backend.api_client import call_mistral, stream_mistral
+from backend.cache import get_default_cache, make_cache_key, normalize_tech_key
+from backend.prompts import build_generation_prompt, estimate_tokens, get_default_planner
+from backend.routing import get_default_router
+from backend.similarity import DEDUP_ENABLED, DEDUP_MIN_QUESTIONS, dedupe_blocks, novel
+from backend.utils import extract_json, fallback_generate_questions, StreamingBlockParser
 
 logger = logging.getLogger(__name__)
 
+FANOUT_ENABLED = os.getenv("TALENTSCOUT_FANOUT", "0") == "1"
+FANOUT_WORKERS = int(os.getenv("TALENTSCOUT_FANOUT_WORKERS", "4"))
+FANOUT_GROUP_SIZE = int(os.getenv("TALENTSCOUT_FANOUT_GROUP_SIZE", "1"))
+REQUEST_DEADLINE = float(os.getenv("TALENTSCOUT_REQUEST_DEADLINE", "30"))
+DEDUP_REGENERATE = os.getenv("TALENTSCOUT_DEDUP_REGENERATE", "1") == "1"
+
+STAGE_METRIC = "talentscout_stage_seconds"
+
+def _default_bank():
+    # imported on first use: the bank pulls in SQLAlchemy, which generation-only processes may never need
+    from backend.question_bank import get_default_bank
+    return get_default_bank()
+
 def _extract_text_from_mistral_response(resp):
     """
     Attempts to extract a text/yielded string from a Mistral response object.
@@ -42,41 +62,368 @@ def _extract_text_from_mistral_response(resp):
     except Exception:
         return None
 
-def generate_questions_for_techs(techs, difficulty="medium", model=None, years_experience=None):
+def _validate_item(item, difficulty="medium"):
     """
-    High-level function: returns list of {technology, difficulty, questions: [...]}
+    Returns a clean {technology, difficulty, questions} block, or None if the item is unusable.
     """
-    if not techs:
-        return []
+    if not isinstance(item, dict):
+        return None
+    tech = item.get("technology")
+    qs = item.get("questions") or []
+    diff = item.get("difficulty") or difficulty
+    if not tech or not isinstance(qs, list):
+        return None
+    return {"technology": tech, "difficulty": diff, "questions": qs}
 
-    prompt = build_generation_prompt(techs, difficulty=difficulty, years_experience=years_experience)
 
-    try:
-        resp = call_mistral(prompt, model=model)
+def _extract_delta_text(event):
+    """
+    Text carried by one streamed event (chat-style delta, TGI-style token, or a whole response).
+    """
+    if isinstance(event, str):
+        return event
+    if not isinstance(event, dict):
+        return ""
+    choices = event.get("choices")
+    if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+        delta = choices[0].get("delta")
+        if isinstance(delta, dict):
+            return delta.get("content") or ""
+    token = event.get("token")
+    if isinstance(token, dict):
+        return token.get("text") or ""
+    if any(k in event for k in ("output", "result", "text", "generations", "choices")):
+        return _extract_text_from_mistral_response(event) or ""
+    return ""
+
+
+def _parse_generation_response(resp, difficulty="medium"):
+    """
+    Turn a raw Mistral response into a list of validated question blocks.
+    Raises ValueError when the output cannot be used.
+    """
+    with metrics.span(STAGE_METRIC, stage="extract_text"):
         text = _extract_text_from_mistral_response(resp)
-        if not text:
-            raise ValueError("No text extracted from Mistral response")
+    if not text:
+        raise ValueError("No text extracted from Mistral response")
 
-        # Extract JSON blob from text and parse
-        json_blob = extract_json_blob(text)
-        parsed = json.loads(json_blob)
+    with metrics.span(STAGE_METRIC, stage="parse"):
+        # Extract and parse the JSON object in one pass (tolerates fences, trailing commas, truncation)
+        parsed = extract_json(text)
         tech_questions = parsed.get("technology_questions") or parsed.get("technology_questions".lower())
         if not isinstance(tech_questions, list):
             raise ValueError("Parsed JSON missing 'technology_questions' list")
 
         # Validate items and ensure fields present
-        out = []
-        for item in tech_questions:
-            tech = item.get("technology")
-            qs = item.get("questions") or []
-            diff = item.get("difficulty") or difficulty
-            if not tech or not isinstance(qs, list):
-                continue
-            out.append({"technology": tech, "difficulty": diff, "questions": qs})
-        if out:
-            return out
-        raise ValueError("No valid items parsed from LLM output")
+        out = [block for block in (_validate_item(item, difficulty) for item in tech_questions) if block]
+    if out:
+        return out
+    raise ValueError("No valid items parsed from LLM output")
+
+
+def _match_blocks_to_techs(techs, blocks):
+    """
+    Map each requested tech to the block the LLM returned for it.
+    Matches on the normalized name first and falls back to position when the model renamed a tech.
+    """
+    by_key = {}
+    for block in blocks:
+        by_key.setdefault(normalize_tech_key(block["technology"]), block)
+    matched = {}
+    for i, tech in enumerate(techs):
+        block = by_key.get(normalize_tech_key(tech))
+        if block is None and len(blocks) == len(techs):
+            block = blocks[i]
+        if block is not None:
+            matched[tech] = block
+    return matched
+
+
+def _output_tokens(resp):
+    """
+    Completion tokens the provider reports for resp, else an estimate from the output text.
+    """
+    usage = resp.get("usage") if isinstance(resp, dict) else None
+    if isinstance(usage, dict):
+        for key in ("completion_tokens", "generated_tokens", "output_tokens"):
+            if isinstance(usage.get(key), int):
+                return usage[key]
+    return estimate_tokens(_extract_text_from_mistral_response(resp))
+
+
+def _call_llm(prompt, model=None, temperature=0.2, timeout=30):
+    with metrics.span(STAGE_METRIC, stage="mistral_call"):
+        return call_mistral(prompt, model=model, temperature=temperature, timeout=timeout)
 
+
+def _generate_batch(techs, difficulty="medium", model=None, years_experience=None, timeout=30, temperature=0.2):
+    """
+    One LLM round trip for a group of techs, through the router (hedged when the first response
+    is slow, abandoned after timeout seconds). Returns {tech: block} for the techs the model covered.
+    Raises on transport or parse failure, or when the deadline passes, so the caller can fall back
+    for this group only. Actual output size is fed back to the prompt planner.
+    """
+    prompt = build_generation_prompt(techs, difficulty=difficulty, years_experience=years_experience)
+    planner = get_default_planner()
+
+    def parse(resp):
+        try:
+            blocks = _parse_generation_response(resp, difficulty=difficulty)
+        except Exception:
+            planner.record(techs, difficulty, _output_tokens(resp), 0)
+            raise
+        matched = _match_blocks_to_techs(techs, blocks)
+        planner.record(techs, difficulty, _output_tokens(resp), len(matched))
+        if not matched:
+            raise ValueError("LLM output did not cover any requested technology")
+        return matched
+
+    return get_default_router().generate(prompt, parse, model=model, temperature=temperature, deadline=timeout,
+                                         call=_call_llm)
+
+
+def _chunk(items, size):
+    size = max(1, int(size))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _plan_groups(techs, difficulty, group_size=None):
+    """
+    Request groups for techs: positional chunks of group_size (when given), each split further
+    by the prompt planner so its expected output fits the token budget.
+    """
+    planner = get_default_planner()
+    chunks = _chunk(techs, group_size) if group_size else [techs]
+    return [group for chunk in chunks for group in planner.plan(chunk, difficulty)]
+
+
+def _generate_fan_out(groups, difficulty, model, years_experience, max_workers, deadline):
+    """
+    Generate groups of techs in parallel. Groups that fail or miss the deadline are simply left out;
+    the caller fills them in with the fallback.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups))), thread_name_prefix="talentscout-gen")
+    futures = {
+        executor.submit(_generate_batch, group, difficulty, model, years_experience, deadline): group
+        for group in groups
+    }
+    done, not_done = wait(futures, timeout=deadline)
+    # do not block on stragglers; their results are discarded
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    matched = {}
+    for future in done:
+        try:
+            matched.update(future.result())
+        except Exception as e:
+            logger.warning("LLM generation failed for %s (%s). Using fallback. Error: %s", futures[future], type(e).__name__, e)
+    for future in not_done:
+        logger.warning("LLM generation for %s missed the %.1fs deadline. Using fallback.", futures[future], deadline)
+    return matched
+
+
+def _diversify(matched, difficulty, model, years_experience, timeout):
+    """
+    Drop near-duplicate questions within and across the LLM blocks. A block that dedupe left
+    with fewer than DEDUP_MIN_QUESTIONS gets one regeneration round (if enabled and timeout,
+    the time left before the request deadline, allows) and is then topped up from its own
+    dropped questions, so it never ends up shorter than that.
+    """
+    techs = list(matched)
+    blocks, dropped = dedupe_blocks([matched[tech] for tech in techs])
+    out = dict(zip(techs, blocks))
+    short = [tech for tech, extra in zip(techs, dropped) if extra and len(out[tech]["questions"]) < DEDUP_MIN_QUESTIONS]
+    if short and DEDUP_REGENERATE and timeout > 0:
+        try:
+            regenerated = _generate_batch(short, difficulty, model, years_experience, timeout=timeout, temperature=0.7)
+        except Exception as e:
+            logger.info("Regenerating near-duplicate questions for %s failed: %s", short, e)
+            regenerated = {}
+        seen = [q for block in out.values() for q in block["questions"]]
+        for tech, block in regenerated.items():
+            fresh = novel(block["questions"], seen, mask_terms=techs)[:DEDUP_MIN_QUESTIONS - len(out[tech]["questions"])]
+            out[tech]["questions"].extend(fresh)
+            seen.extend(fresh)
+    for tech, extra in zip(techs, dropped):
+        need = DEDUP_MIN_QUESTIONS - len(out[tech]["questions"])
+        if need > 0:
+            out[tech]["questions"].extend(extra[:need])
+    return out
+
+
+def _dedupe_streamed(block, seen, mask_terms):
+    """
+    Streaming variant of _diversify for one block: drop questions that repeat earlier streamed
+    ones, keeping at least DEDUP_MIN_QUESTIONS and the model's order.
+    """
+    questions = block["questions"]
+    keep = set(novel(questions, seen, mask_terms=mask_terms))
+    for q in questions:
+        if len(keep) >= DEDUP_MIN_QUESTIONS:
+            break
+        keep.add(q)
+    return dict(block, questions=[q for q in questions if q in keep])
+
+
+@metrics.timed(STAGE_METRIC, stage="total")
+def generate_questions_for_techs(techs, difficulty="medium", model=None, years_experience=None, cache=None,
+                                 fan_out=None, group_size=None, max_workers=None, deadline=None, bank=None):
+    """
+    High-level function: returns list of {technology, difficulty, questions: [...]}
+    Banked and cached techs skip the LLM; the rest get the templated fallback if not generated within
+    deadline seconds. Pass cache=False / bank=False to bypass the cache / question bank.
+    """
+    if not techs:
+        return []
+
+    fan_out = FANOUT_ENABLED if fan_out is None else fan_out
+    group_size = group_size or FANOUT_GROUP_SIZE
+    max_workers = max_workers or FANOUT_WORKERS
+    deadline = deadline or REQUEST_DEADLINE
+    ends_at = time.monotonic() + deadline
+
+    if bank is None:
+        bank = _default_bank()
+    results = bank.sample_many(techs, difficulty) if bank else {}
+    metrics.inc("talentscout_bank_hits_total", len(results))
+    if cache is None:
+        cache = get_default_cache()
+    keys = {tech: make_cache_key(tech, difficulty, years_experience) for tech in techs}
+    unbanked = [keys[tech] for tech in techs if tech not in results]
+    cached = cache.get_many(unbanked) if cache and unbanked else {}
+    if cache:
+        metrics.inc("talentscout_cache_hits_total", len(cached))
+        metrics.inc("talentscout_cache_misses_total", len(unbanked) - len(cached))
+    results.update({tech: cached[keys[tech]] for tech in techs if keys[tech] in cached})
+    missing = [tech for tech in techs if tech not in results]
+
+    if missing:
+        groups = _plan_groups(missing, difficulty, group_size if fan_out else None)
+        if len(groups) > 1:
+            matched = _generate_fan_out(groups, difficulty, model, years_experience, max_workers, deadline)
+        else:
+            try:
+                matched = _generate_batch(missing, difficulty, model, years_experience, timeout=deadline)
+            except Exception as e:
+                logger.warning("LLM generation failed or produced unexpected output (%s). Using fallback. Error: %s", type(e).__name__, e)
+                matched = {}
+        if DEDUP_ENABLED and matched:
+            with metrics.span(STAGE_METRIC, stage="dedupe"):
+                matched = _diversify(matched, difficulty, model, years_experience, ends_at - time.monotonic())
+        results.update(matched)
+        if cache and matched:
+            cache.set_many({keys[tech]: block for tech, block in matched.items()})
+
+        # anything the LLM did not cover gets the templated fallback (never cached)
+        uncovered = [tech for tech in missing if tech not in results]
+        if uncovered:
+            metrics.inc("talentscout_fallbacks_total", len(uncovered))
+            with metrics.span(STAGE_METRIC, stage="fallback"):
+                for block in fallback_generate_questions(uncovered, difficulty=difficulty):
+                    results[block["technology"]] = block
+
+    # copy so callers can edit blocks without touching the in-memory cache tier
+    return [dict(results[tech], questions=list(results[tech].get("questions") or [])) for tech in techs]
+
+
+def stream_questions_for_techs(techs, difficulty="medium", model=None, years_experience=None, cache=None, bank=None):
+    """
+    Streaming counterpart of generate_questions_for_techs: yields (requested_tech, block) pairs.
+    Banked and cached blocks come first, then each LLM block as soon as its JSON object is complete in the
+    token stream, then blocks for techs the planner moved to extra requests (they run alongside the stream
+    when the stack does not fit one request's token budget), then fallback blocks for anything still
+    uncovered. Consumers that need request order can sort on requested_tech.
+    """
+    if not techs:
+        return
+
+    if bank is None:
+        bank = _default_bank()
+    banked = bank.sample_many(techs, difficulty) if bank else {}
+    metrics.inc("talentscout_bank_hits_total", len(banked))
+    if cache is None:
+        cache = get_default_cache()
+    keys = {tech: make_cache_key(tech, difficulty, years_experience) for tech in techs}
+    cached = cache.get_many(keys.values()) if cache else {}
+    if cache:
+        hits = sum(1 for tech in techs if tech not in banked and keys[tech] in cached)
+        metrics.inc("talentscout_cache_hits_total", hits)
+        metrics.inc("talentscout_cache_misses_total", len(techs) - len(banked) - hits)
+    missing = []
+    for tech in techs:
+        if tech in banked:
+            yield tech, banked[tech]
+        elif keys[tech] in cached:
+            block = cached[keys[tech]]
+            yield tech, dict(block, questions=list(block.get("questions") or []))
+        else:
+            missing.append(tech)
+    if not missing:
+        return
+
+    # the first planned group is streamed; groups beyond the token budget run alongside it
+    groups = _plan_groups(missing, difficulty)
+    streamed = groups[0]
+    executor = futures = None
+    if len(groups) > 1:
+        executor = ThreadPoolExecutor(max_workers=max(1, min(FANOUT_WORKERS, len(groups) - 1)), thread_name_prefix="talentscout-gen")
+        futures = {executor.submit(_generate_batch, group, difficulty, model, years_experience, REQUEST_DEADLINE): group
+                   for group in groups[1:]}
+    by_key = {normalize_tech_key(tech): tech for tech in streamed}
+    covered = {}
+    seen = []
+    started = time.perf_counter()
+    output = []
+    try:
+        prompt = build_generation_prompt(streamed, difficulty=difficulty, years_experience=years_experience)
+        parser = StreamingBlockParser()
+        for event in stream_mistral(prompt, model=model, timeout=REQUEST_DEADLINE):
+            delta = _extract_delta_text(event)
+            output.append(delta)
+            for item in parser.feed(delta):
+                block = _validate_item(item, difficulty)
+                if block is None:
+                    continue
+                tech = by_key.get(normalize_tech_key(block["technology"]))
+                if tech is None:
+                    # model renamed the tech; give the block to the first requested tech still uncovered
+                    tech = next((t for t in streamed if t not in covered), None)
+                if tech is None or tech in covered:
+                    continue
+                if DEDUP_ENABLED:
+                    block = _dedupe_streamed(block, seen, missing)
+                    seen.extend(block["questions"])
+                if not covered:
+                    metrics.observe(STAGE_METRIC, time.perf_counter() - started, stage="stream_first_block")
+                covered[tech] = block
+                yield tech, dict(block, questions=list(block["questions"]))
+            if parser.done:
+                break
+        get_default_planner().record(streamed, difficulty, estimate_tokens("".join(output)), len(covered))
     except Exception as e:
-        logger.warning("LLM generation failed or produced unexpected output (%s). Using fallback. Error: %s", type(e).__name__, e)
-        return fallback_generate_questions(techs, difficulty=difficulty)
+        logger.warning("LLM streaming failed (%s). Using fallback for remaining techs. Error: %s", type(e).__name__, e)
+
+    if futures:
+        done, not_done = wait(futures, timeout=max(0.0, REQUEST_DEADLINE - (time.perf_counter() - started)))
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in done:
+            try:
+                matched = future.result()
+            except Exception as e:
+                logger.warning("LLM generation failed for %s (%s). Using fallback. Error: %s", futures[future], type(e).__name__, e)
+                continue
+            for tech, block in matched.items():
+                if DEDUP_ENABLED:
+                    block = _dedupe_streamed(block, seen, missing)
+                    seen.extend(block["questions"])
+                covered[tech] = block
+                yield tech, dict(block, questions=list(block["questions"]))
+        for future in not_done:
+            logger.warning("LLM generation for %s missed the %.1fs deadline. Using fallback.", futures[future], REQUEST_DEADLINE)
+
+    if cache and covered:
+        cache.set_many({keys[tech]: block for tech, block in covered.items()})
+    uncovered = [tech for tech in missing if tech not in covered]
+    metrics.inc("talentscout_fallbacks_total", len(uncovered))
+    for tech, block in zip(uncovered, fallback_generate_questions(uncovered, difficulty=difficulty)):
+        yield tech, block
@@ -0,0 +1,157 @@
+# backend/http_api.py
+"""
+Small JSON HTTP API over the generation job queue (stdlib only).
+
+    python -m backend.http_api --port 8765
+
+    POST /jobs        {"candidate": {...}, "tech_stack_raw": "...", "difficulty": "medium"}
+                      (or "techs": [...] instead of tech_stack_raw)  -> 202 {"job_id": ..., "status": ...}
+    GET  /jobs/<id>   -> job status and result
+    GET  /healthz     -> {"ok": true}
+    GET  /metrics     -> Prometheus text exposition (backend.metrics)
+    GET  /metrics.json -> the same metrics as a JSON snapshot with p50/p95/p99
+    GET  /export/<candidates|questions|rollups>.<ndjson|csv>?since=YYYY-MM-DD&until=YYYY-MM-DD
+                      -> the export streamed as it is read (backend.export)
+    GET  /stats?since=YYYY-MM-DD&until=YYYY-MM-DD -> reporting aggregates from the rollup tables
+"""
+import io
+import json
+import logging
+import argparse
+from datetime import date
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend import export, metrics
+from backend.jobs import enqueue_generation, get_job
+from backend.storage import rollup_summary
+from backend.utils import split_tech_stack
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "TalentScout/1.0"
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_export(self, kind, fmt, since, until):
+        # no Content-Length: the body is written while rows are read and ends when the connection closes
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson")
+        self.send_header("Content-Disposition", f'attachment; filename="{kind}.{fmt}"')
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        fp = io.TextIOWrapper(self.wfile, encoding="utf-8", newline="", write_through=False)
+        try:
+            export.export(kind, fp, fmt, since=since, until=until)
+            fp.flush()
+        finally:
+            fp.detach()
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        path = path.rstrip("/")
+        params = {k: v[-1] for k, v in parse_qs(query).items()}
+        if path.startswith("/export/") or path == "/stats":
+            try:
+                since = date.fromisoformat(params["since"]) if params.get("since") else None
+                until = date.fromisoformat(params["until"]) if params.get("until") else None
+            except ValueError:
+                return self._send(400, {"error": "since/until must be YYYY-MM-DD"})
+            if path == "/stats":
+                return self._send(200, rollup_summary(since, until))
+            kind, _, fmt = path[len("/export/"):].partition(".")
+            if kind not in export.KINDS or fmt not in ("ndjson", "csv"):
+                return self._send(404, {"error": "export must be /export/<candidates|questions|rollups>.<ndjson|csv>"})
+            return self._stream_export(kind, fmt, since, until)
+        if path == "/healthz":
+            return self._send(200, {"ok": True})
+        if path == "/metrics":
+            return self._send(200, metrics.render_prometheus().encode("utf-8"),
+                              content_type="text/plain; version=0.0.4; charset=utf-8")
+        if path == "/metrics.json":
+            return self._send(200, metrics.snapshot())
+        if path.startswith("/jobs/"):
+            try:
+                job = get_job(int(path.rsplit("/", 1)[1]))
+            except ValueError:
+                return self._send(400, {"error": "job id must be an integer"})
+            if job is None:
+                return self._send(404, {"error": "job not found"})
+            return self._send(200, job)
+        return self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0].rstrip("/") != "/jobs":
+            return self._send(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._send(400, {"error": "invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            return self._send(413, {"error": "request body too large"})
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send(400, {"error": "body must be JSON"})
+        if not isinstance(body, dict):
+            return self._send(400, {"error": "body must be a JSON object"})
+        candidate = body.get("candidate") or {}
+        if not isinstance(candidate, dict):
+            return self._send(400, {"error": "candidate must be an object"})
+        raw = body.get("tech_stack_raw") or candidate.get("tech_stack_raw") or ""
+        if not isinstance(raw, str):
+            return self._send(400, {"error": "tech_stack_raw must be a string"})
+        techs = body.get("techs")
+        if techs is not None and not (isinstance(techs, list) and all(isinstance(t, str) for t in techs)):
+            return self._send(400, {"error": "techs must be a list of strings"})
+        techs = techs or split_tech_stack(raw)
+        if not techs:
+            return self._send(400, {"error": "provide techs or tech_stack_raw"})
+        difficulty = body.get("difficulty", "medium")
+        if difficulty not in ("easy", "medium", "hard"):
+            return self._send(400, {"error": "difficulty must be easy, medium or hard"})
+        candidate.setdefault("tech_stack_raw", raw or ", ".join(techs))
+        job_id = enqueue_generation(candidate, techs, difficulty=difficulty,
+                                    years_experience=candidate.get("years_experience"),
+                                    save=body.get("save", True))
+        return self._send(202, {"job_id": job_id, "status": get_job(job_id)["status"]})
+
+    def log_message(self, fmt, *args):
+        logger.info("%s %s", self.address_string(), fmt % args)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765):
+    return ThreadingHTTPServer((host, port), ApiHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout job API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = make_server(args.host, args.port)
+    logger.info("Listening on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
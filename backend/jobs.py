@@ -0,0 +1,276 @@
+# backend/jobs.py
+"""
+Local job queue for question generation, decoupled from Streamlit reruns.
+
+Jobs live in the generation_jobs table, so any process sharing the database can enqueue,
+work or poll. Workers are separate processes:
+
+    python -m backend.jobs worker --processes 4
+
+Identical submissions (same candidate details, stack and difficulty) reuse the existing job
+and its stored result instead of generating and saving twice.
+"""
+import os
+import json
+import time
+import socket
+import hashlib
+import logging
+import argparse
+import multiprocessing
+from datetime import datetime, timedelta
+
+from sqlalchemy import update, func # type: ignore
+
+from backend.generator import generate_questions_for_techs
+from backend.models import GenerationJob
+from backend.storage import SessionLocal, run_write, save_candidate_with_questions
+
+logger = logging.getLogger(__name__)
+
+JOB_POLL_INTERVAL = float(os.getenv("TALENTSCOUT_JOB_POLL_INTERVAL", "0.5"))
+JOB_LEASE_SECONDS = int(os.getenv("TALENTSCOUT_JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("TALENTSCOUT_JOB_MAX_ATTEMPTS", "3"))
+
+ACTIVE_STATUSES = ("queued", "running", "done")
+CANDIDATE_KEY_FIELDS = ("full_name", "email", "phone", "years_experience", "desired_position", "location")
+
+
+def job_dedupe_key(candidate: dict, techs: list, difficulty: str):
+    key = {
+        "candidate": {k: (candidate or {}).get(k) for k in CANDIDATE_KEY_FIELDS},
+        "techs": [t.lower() for t in techs],
+        "difficulty": difficulty,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _job_to_dict(job):
+    return {
+        "id": job.id,
+        "status": job.status,
+        "result": json.loads(job.result_json) if job.result_json else None,
+        "candidate_id": job.candidate_id,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def enqueue_generation(candidate: dict, techs: list, difficulty: str = "medium", years_experience=None,
+                       model=None, save: bool = True):
+    """
+    Queue a generation job and return its id. A duplicate of a queued, running or finished
+    job returns that job's id instead.
+    """
+    key = job_dedupe_key(candidate, techs, difficulty)
+    payload = json.dumps({
+        "candidate": candidate,
+        "techs": list(techs),
+        "difficulty": difficulty,
+        "years_experience": years_experience,
+        "model": model,
+        "save": save,
+    }, default=str)
+
+    def write(session):
+        existing = (session.query(GenerationJob.id)
+                    .filter(GenerationJob.dedupe_key == key, GenerationJob.status.in_(ACTIVE_STATUSES))
+                    .order_by(GenerationJob.id.desc())
+                    .first())
+        if existing:
+            return existing[0]
+        job = GenerationJob(dedupe_key=key, status="queued", payload_json=payload, attempts=0,
+                            created_at=datetime.utcnow())
+        session.add(job)
+        session.flush()
+        return job.id
+
+    return run_write(write)
+
+
+def get_job(job_id: int):
+    """
+    Status and (when done) result of a job as a dict, or None if it does not exist.
+    """
+    session = SessionLocal()
+    try:
+        job = session.get(GenerationJob, job_id)
+        return _job_to_dict(job) if job is not None else None
+    finally:
+        session.close()
+
+
+def wait_for_job(job_id: int, timeout: float = 60, poll_interval: float = None):
+    """
+    Poll until the job is done or failed (or timeout elapses); returns the last job dict.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        job = get_job(job_id)
+        if job is None or job["status"] in ("done", "failed") or time.monotonic() >= deadline:
+            return job
+        time.sleep(poll_interval or JOB_POLL_INTERVAL)
+
+
+class LeaseLost(Exception):
+    """The job was requeued and claimed again after this worker's lease expired."""
+
+
+def claim_next_job(worker_id: str):
+    """
+    Atomically move the oldest queued job to running for this worker. Returns
+    (id, payload, claim) or None; claim identifies this run of the job for run_job.
+    """
+    def write(session):
+        row = (session.query(GenerationJob.id, GenerationJob.payload_json, GenerationJob.attempts)
+               .filter(GenerationJob.status == "queued")
+               .order_by(GenerationJob.id)
+               .first())
+        if row is None:
+            return None
+        attempt = (row[2] or 0) + 1
+        claimed = session.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == row[0], GenerationJob.status == "queued")
+            .values(status="running", worker=worker_id, started_at=datetime.utcnow(), attempts=attempt)
+        ).rowcount
+        return (row[0], json.loads(row[1]), (worker_id, attempt)) if claimed == 1 else None
+
+    return run_write(write)
+
+
+def requeue_stale_jobs(lease_seconds: int = None):
+    """
+    Put jobs whose worker died mid-run back on the queue (or fail them after JOB_MAX_ATTEMPTS).
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds or JOB_LEASE_SECONDS)
+
+    def write(session):
+        stale = (GenerationJob.status == "running", GenerationJob.started_at < cutoff)
+        failed = session.execute(
+            update(GenerationJob).where(*stale, GenerationJob.attempts >= JOB_MAX_ATTEMPTS)
+            .values(status="failed", error="worker lease expired", finished_at=datetime.utcnow())
+        ).rowcount
+        requeued = session.execute(
+            update(GenerationJob).where(*stale).values(status="queued", worker=None)
+        ).rowcount
+        return requeued, failed
+
+    return run_write(write)
+
+
+def _finish(session, job_id, claim=None, **values):
+    stmt = update(GenerationJob).where(GenerationJob.id == job_id)
+    if claim is not None:
+        # only the run that still holds the job may finish it (a requeued job has a new claim)
+        worker_id, attempt = claim
+        stmt = stmt.where(GenerationJob.status == "running", GenerationJob.worker == worker_id,
+                          GenerationJob.attempts == attempt)
+    if session.execute(stmt.values(finished_at=datetime.utcnow(), **values)).rowcount == 0 and claim is not None:
+        raise LeaseLost(f"job {job_id} is no longer claimed by {claim[0]} (attempt {claim[1]})")
+
+
+def run_job(job_id: int, payload: dict, claim=None):
+    """
+    Generate (and optionally save) one claimed job; the save and the job update commit together.
+    With the claim from claim_next_job, a run whose lease was lost to another worker commits
+    nothing (its candidate save is rolled back).
+    """
+    try:
+        blocks = generate_questions_for_techs(
+            payload["techs"],
+            difficulty=payload.get("difficulty", "medium"),
+            model=payload.get("model"),
+            years_experience=payload.get("years_experience"),
+        )
+        result_json = json.dumps(blocks, ensure_ascii=False)
+        if payload.get("save", True):
+            save_candidate_with_questions(
+                payload["candidate"], blocks,
+                after_insert=lambda session, candidate_id: _finish(
+                    session, job_id, claim, status="done", result_json=result_json, candidate_id=candidate_id),
+            )
+        else:
+            run_write(lambda session: _finish(session, job_id, claim, status="done", result_json=result_json))
+    except LeaseLost as e:
+        logger.warning("Dropping result: %s", e)
+    except Exception as e:
+        logger.exception("Job %s failed", job_id)
+        try:
+            run_write(lambda session: _finish(session, job_id, claim, status="failed", error=f"{type(e).__name__}: {e}"))
+        except LeaseLost:
+            pass
+
+
+def worker_loop(worker_id: str = None, poll_interval: float = None, max_jobs: int = None, stop_when_idle: bool = False):
+    """
+    Claim and run jobs until stopped. Returns the number of jobs processed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    poll_interval = poll_interval or JOB_POLL_INTERVAL
+    processed = 0
+    last_reap = 0.0
+    while max_jobs is None or processed < max_jobs:
+        if time.monotonic() - last_reap > 30:
+            requeue_stale_jobs()
+            last_reap = time.monotonic()
+        claimed = claim_next_job(worker_id)
+        if claimed is None:
+            if stop_when_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+        job_id, payload, claim = claimed
+        logger.info("Worker %s running job %s", worker_id, job_id)
+        run_job(job_id, payload, claim)
+        processed += 1
+    return processed
+
+
+def _worker_main(index: int):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    worker_loop(worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}")
+
+
+def run_workers(processes: int = 2):
+    """
+    Start a pool of worker processes and wait on them. Uses spawn so every worker opens
+    its own database connections instead of inheriting the parent's.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker_main, args=(i,), name=f"talentscout-worker-{i}", daemon=False)
+             for i in range(max(1, processes))]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout generation job queue.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    worker = sub.add_parser("worker", help="run generation workers")
+    worker.add_argument("--processes", type=int, default=2)
+    sub.add_parser("status", help="print job counts by status")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "worker":
+        run_workers(args.processes)
+    elif args.command == "status":
+        session = SessionLocal()
+        try:
+            for status, count in session.query(GenerationJob.status, func.count()).group_by(GenerationJob.status):
+                print(f"{status:8} {count}")
+        finally:
+            session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# backend/matching.py
+"""
+Rank the candidate pool against an open role's required stack.
+
+The candidate_techs inverted index is held in memory as one packed bitset per technology
+(bit i = the i-th candidate by id) plus a years-of-experience vector, so a match is a few
+NumPy operations over the whole pool instead of re-parsing every tech_stack_raw:
+
+    must-have filter   AND of the must-have bitsets (on packed bytes)
+    overlap            weighted sum of the role's unpacked bitsets / total weight
+    experience         min(years / target_years, 1)
+    score              (1 - experience_weight) * overlap + experience_weight * experience
+
+and the top k come from np.argpartition. The view is extended in place when candidates are
+added and reloaded when the index changes otherwise (checked at most every reload_seconds).
+
+    python -m backend.matching "Python, Django, PostgreSQL" --must-have Python --target-years 5 -k 10
+"""
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+
+import numpy as np
+
+from sqlalchemy import func, select # type: ignore
+
+from backend.cache import normalize_tech_key
+from backend.models import Candidate, CandidateTech
+from backend.storage import SessionLocal
+from backend.utils import split_tech_stack
+
+logger = logging.getLogger(__name__)
+
+MATCH_RELOAD_SECONDS = float(os.getenv("TALENTSCOUT_MATCH_RELOAD_SECONDS", "30"))
+MATCH_EXPERIENCE_WEIGHT = float(os.getenv("TALENTSCOUT_MATCH_EXPERIENCE_WEIGHT", "0.2"))
+MUST_HAVE_WEIGHT = 2.0  # must-have technologies count double in the overlap score
+
+
+def _tech_keys(techs):
+    if isinstance(techs, str):
+        techs = split_tech_stack(techs)
+    return list(dict.fromkeys(k for k in (normalize_tech_key(t) for t in techs) if k))
+
+
+class CandidateMatcher:
+    """
+    In-memory bitset view of candidate_techs. Rows are candidates in id order; `ids[row]` maps
+    back to Candidate.id.
+    """
+
+    def __init__(self, session_factory=None, reload_seconds: float = None):
+        self.session_factory = session_factory or SessionLocal
+        self.reload_seconds = MATCH_RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        self.ids = np.empty(0, dtype=np.int64)
+        self.years = np.empty(0, dtype=np.float32)  # NaN when unknown
+        self._bits = {}  # tech_key -> packed uint8 bitset, len == capacity // 8
+        self._capacity = 0
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, ids, years, pairs):
+        """
+        Build a detached matcher from arrays: ids (ascending), years (None/NaN = unknown) and
+        (tech_key, candidate_id) pairs. Used by the loader and by benchmarks.
+        """
+        matcher = cls(session_factory=lambda: None, reload_seconds=float("inf"))
+        matcher._append(ids, years, pairs)
+        matcher._checked_at = time.monotonic()
+        return matcher
+
+    def _probe(self, session):
+        return (
+            tuple(session.execute(select(func.max(Candidate.id), func.count(Candidate.id))).one()),
+            session.execute(select(func.count()).select_from(CandidateTech)).scalar(),
+        )
+
+    def _append(self, ids, years, pairs):
+        ids = np.asarray(ids, dtype=np.int64)
+        years = np.array([np.nan if y is None else y for y in years], dtype=np.float32)
+        start = len(self.ids)
+        total = start + len(ids)
+        if total > self._capacity:
+            capacity = max(1024, self._capacity * 2, (total + 7) // 8 * 8)
+            self._bits = {key: np.concatenate([bits, np.zeros((capacity - self._capacity) // 8, dtype=np.uint8)])
+                          for key, bits in self._bits.items()}
+            self._capacity = capacity
+        self.ids = np.concatenate([self.ids, ids])
+        self.years = np.concatenate([self.years, years])
+        if not total:
+            return
+
+        by_key = {}
+        for tech_key, candidate_id in pairs:
+            by_key.setdefault(tech_key, []).append(candidate_id)
+        for tech_key, candidate_ids in by_key.items():
+            rows = np.searchsorted(self.ids, np.asarray(candidate_ids, dtype=np.int64))
+            rows = rows[(rows < total) & (self.ids[np.minimum(rows, total - 1)] == candidate_ids)]
+            bits = self._bits.get(tech_key)
+            if bits is None:
+                bits = self._bits[tech_key] = np.zeros(self._capacity // 8, dtype=np.uint8)
+            np.bitwise_or.at(bits, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+
+    def _load(self, session, after_id: int = 0):
+        candidates = session.execute(
+            select(Candidate.id, Candidate.years_experience).where(Candidate.id > after_id).order_by(Candidate.id)
+        ).all()
+        pairs = session.execute(
+            select(CandidateTech.tech_key, CandidateTech.candidate_id).where(CandidateTech.candidate_id > after_id)
+        ).all()
+        self._append([c[0] for c in candidates], [c[1] for c in candidates], pairs)
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+                return
+            session = self.session_factory()
+            try:
+                version = self._probe(session)
+                if force or version != self._version:
+                    if not force and self._version is not None and self._only_appended(session, self._version, version):
+                        self._load(session, after_id=int(self.ids[-1]) if len(self.ids) else 0)
+                    else:
+                        self.ids = np.empty(0, dtype=np.int64)
+                        self.years = np.empty(0, dtype=np.float32)
+                        self._bits = {}
+                        self._capacity = 0
+                        self._load(session)
+                    self._version = version
+            finally:
+                session.close()
+            self._checked_at = time.monotonic()
+
+    def _only_appended(self, session, old, new):
+        # True when every change between the two probes is new candidates (ids above the old
+        # max) with their techs, so the view can be extended instead of reloaded
+        (old_max, old_count), old_tech_rows = old
+        (_, count), tech_rows = new
+        old_max = old_max or 0
+        added = session.execute(select(func.count(Candidate.id)).where(Candidate.id > old_max)).scalar()
+        added_techs = session.execute(
+            select(func.count()).select_from(CandidateTech).where(CandidateTech.candidate_id > old_max)).scalar()
+        return count - old_count == added and tech_rows - old_tech_rows == added_techs
+
+    def invalidate(self):
+        self._checked_at = None
+
+    def techs(self):
+        """
+        {tech_key: number of candidates}, most common first.
+        """
+        self._refresh()
+        n = len(self.ids)
+        counts = {key: int(np.unpackbits(bits, count=n).sum()) for key, bits in self._bits.items()}
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+    def match(self, techs, must_have=(), k: int = 20, min_years: float = None, target_years: float = None,
+              experience_weight: float = None, weights: dict = None):
+        """
+        Top-k candidates for a role. techs / must_have are lists or free-text stacks; weights
+        optionally maps a technology to its weight (default 1, must-haves MUST_HAVE_WEIGHT).
+        Returns [{"candidate_id", "score", "overlap", "matched": [tech_key, ...], "years_experience"}].
+        """
+        self._refresh()
+        must = _tech_keys(must_have)
+        keys = list(dict.fromkeys(_tech_keys(techs) + must))
+        n = len(self.ids)
+        if not keys or not n:
+            return []
+        custom = {normalize_tech_key(t): float(w) for t, w in (weights or {}).items()}
+        w = np.array([custom.get(key, MUST_HAVE_WEIGHT if key in must else 1.0) for key in keys], dtype=np.float32)
+        ew = MATCH_EXPERIENCE_WEIGHT if experience_weight is None else experience_weight
+        empty = np.zeros(self._capacity // 8, dtype=np.uint8)
+        packed = [self._bits.get(key, empty) for key in keys]
+
+        eligible = None
+        for key in must:
+            bits = packed[keys.index(key)]
+            eligible = bits if eligible is None else np.bitwise_and(eligible, bits)
+        overlap = np.zeros(n, dtype=np.float32)
+        for weight, bits in zip(w, packed):
+            if bits is not empty:
+                overlap += weight * np.unpackbits(bits, count=n)
+        overlap /= w.sum()
+
+        mask = overlap > 0
+        if eligible is not None:
+            mask &= np.unpackbits(eligible, count=n).astype(bool)
+        years = self.years[:n]
+        if min_years is not None:
+            mask &= years >= min_years  # unknown (NaN) never passes
+        score = overlap
+        if ew and target_years:
+            experience = np.nan_to_num(np.clip(years / float(target_years), 0, 1), nan=0.0)
+            score = (1 - ew) * overlap + ew * experience
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        if len(rows) > k:
+            rows = rows[np.argpartition(-score[rows], k - 1)[:k]]
+        rows = rows[np.lexsort((self.ids[rows], -score[rows]))]  # best first, older candidate on ties
+
+        out = []
+        for row in rows:
+            byte, bit = row >> 3, 0x80 >> (row & 7)
+            out.append({
+                "candidate_id": int(self.ids[row]),
+                "score": round(float(score[row]), 4),
+                "overlap": round(float(overlap[row]), 4),
+                "matched": [key for key, bits in zip(keys, packed) if bits[byte] & bit],
+                "years_experience": None if np.isnan(years[row]) else float(years[row]),
+            })
+        return out
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_default_matcher():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = CandidateMatcher()
+        return _default
+
+
+def match_candidates(techs, must_have=(), k: int = 20, min_years: float = None, target_years: float = None,
+                     experience_weight: float = None, matcher: CandidateMatcher = None):
+    """
+    CandidateMatcher.match plus each hit's candidate record under "candidate".
+    """
+    matcher = matcher or get_default_matcher()
+    hits = matcher.match(techs, must_have=must_have, k=k, min_years=min_years, target_years=target_years,
+                         experience_weight=experience_weight)
+    if not hits:
+        return []
+    session = matcher.session_factory()
+    try:
+        rows = session.query(Candidate).filter(Candidate.id.in_([h["candidate_id"] for h in hits])).all()
+        by_id = {c.id: c for c in rows}
+        for hit in hits:
+            c = by_id.get(hit["candidate_id"])
+            hit["candidate"] = None if c is None else {
+                "id": c.id, "full_name": c.full_name, "email": c.email, "desired_position": c.desired_position,
+                "location": c.location, "tech_stack_raw": c.tech_stack_raw,
+                "created_at": c.created_at.isoformat() if c.created_at else None,
+            }
+    finally:
+        session.close()
+    return [h for h in hits if h["candidate"] is not None]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank stored candidates against a role's stack")
+    parser.add_argument("stack", help='required technologies, e.g. "Python, Django, PostgreSQL"')
+    parser.add_argument("--must-have", default="", help="technologies every match must list")
+    parser.add_argument("--min-years", type=float, default=None)
+    parser.add_argument("--target-years", type=float, default=None)
+    parser.add_argument("-k", type=int, default=20)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    started = time.perf_counter()
+    hits = match_candidates(args.stack, must_have=args.must_have, k=args.k, min_years=args.min_years,
+                            target_years=args.target_years)
+    for hit in hits:
+        print(json.dumps(hit, ensure_ascii=False))
+    logger.info("%d matches in %.1f ms", len(hits), (time.perf_counter() - started) * 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+# backend/metrics.py
+"""
+In-process instrumentation: timing spans, counters and gauges, exported as Prometheus text
+(render_prometheus) or a JSON snapshot (snapshot).
+
+    with metrics.span("talentscout_stage_seconds", stage="mistral_call"):
+        ...
+    metrics.inc("talentscout_fallbacks_total", len(uncovered))
+
+    @metrics.timed("talentscout_storage_seconds", op="save_candidate_with_questions")
+    def save_candidate_with_questions(...): ...
+
+Set TALENTSCOUT_METRICS=0 to disable: span() then returns a shared no-op context manager and
+inc()/observe() return immediately, so instrumented code pays one attribute check per call.
+Metrics are per process; the HTTP API (backend.http_api) serves /metrics and /metrics.json.
+"""
+import os
+import time
+import bisect
+import threading
+from functools import wraps
+
+ENABLED = os.getenv("TALENTSCOUT_METRICS", "1") == "1"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "talentscout_stage_seconds": "Time spent in each question-generation stage.",
+    "talentscout_storage_seconds": "Time spent in each storage function.",
+    "talentscout_fallbacks_total": "Technologies served by the templated fallback.",
+    "talentscout_cache_hits_total": "Question cache lookups that hit.",
+    "talentscout_cache_misses_total": "Question cache lookups that missed.",
+    "talentscout_bank_hits_total": "Technologies served from the question bank.",
+    "talentscout_mistral_retries_total": "Mistral requests retried after a retryable failure.",
+    "talentscout_mistral_errors_total": "Mistral requests that failed after all retries.",
+    "talentscout_llm_tokens_total": "Output tokens generated (provider usage, else estimated from the text).",
+    "talentscout_llm_tokens_estimated_total": "Output tokens the prompt planner expected for the same requests.",
+    "talentscout_llm_truncated_total": "Generation responses that hit the output token budget.",
+    "talentscout_route_seconds": "Latency of each LLM request attempt, per route (model/endpoint).",
+    "talentscout_hedges_total": "Hedged duplicate requests sent, per route.",
+    "talentscout_hedge_wins_total": "Hedged requests whose response was used, per route.",
+    "talentscout_deadline_exceeded_total": "LLM requests abandoned at the deadline and served by the fallback.",
+}
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets):
+        self.counts = [0] * (n_buckets + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+
+class Registry:
+    """
+    Thread-safe store of counters ({name: {labels: value}}) and fixed-bucket histograms.
+    Labels are kept as sorted (key, value) tuples.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, labels=()):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def observe(self, name, seconds, labels=()):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            h = series.get(labels)
+            if h is None:
+                h = series[labels] = _Histogram(len(self.buckets))
+            h.counts[i] += 1
+            h.sum += seconds
+            h.count += 1
+
+    def register_gauge(self, name, fn, help_text=None):
+        """
+        fn() -> number or {labels_dict_items_tuple: number}, read at export time.
+        """
+        self.gauges[name] = fn
+        if help_text:
+            HELP.setdefault(name, help_text)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def _quantile(self, h, q):
+        # linear interpolation inside the bucket, like Prometheus' histogram_quantile
+        if not h.count:
+            return 0.0
+        rank = q * h.count
+        seen = 0
+        lower = 0.0
+        for i, c in enumerate(h.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+            if seen + c >= rank and c:
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+            lower = upper
+        return self.buckets[-1]
+
+    def _gauge_values(self):
+        out = {}
+        for name, fn in list(self.gauges.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            out[name] = value if isinstance(value, dict) else {(): value}
+        return out
+
+    def snapshot(self):
+        with self._lock:
+            counters = {name: dict(series) for name, series in self.counters.items()}
+            histograms = {name: {labels: (list(h.counts), h.sum, h.count) for labels, h in series.items()}
+                          for name, series in self.histograms.items()}
+        out = {"enabled": ENABLED, "counters": {}, "gauges": {}, "histograms": {}}
+        for name, series in sorted(counters.items()):
+            out["counters"][name] = [{"labels": dict(labels), "value": v} for labels, v in sorted(series.items())]
+        for name, series in sorted(self._gauge_values().items()):
+            out["gauges"][name] = [{"labels": dict(labels), "value": v} for labels, v in sorted(series.items())]
+        for name, series in sorted(histograms.items()):
+            rows = []
+            for labels, (counts, total, count) in sorted(series.items()):
+                h = _Histogram(len(self.buckets))
+                h.counts, h.sum, h.count = counts, total, count
+                rows.append({
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum_seconds": round(total, 6),
+                    "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+                    "p50_ms": round(self._quantile(h, 0.50) * 1000, 3),
+                    "p95_ms": round(self._quantile(h, 0.95) * 1000, 3),
+                    "p99_ms": round(self._quantile(h, 0.99) * 1000, 3),
+                })
+            out["histograms"][name] = rows
+        return out
+
+    def render_prometheus(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        def fmt(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items) + "}"
+
+        with self._lock:
+            counters = {name: dict(series) for name, series in self.counters.items()}
+            histograms = {name: {labels: (list(h.counts), h.sum, h.count) for labels, h in series.items()}
+                          for name, series in self.histograms.items()}
+        lines = []
+        for name, series in sorted(counters.items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{fmt(labels)} {value}" for labels, value in sorted(series.items()))
+        for name, series in sorted(self._gauge_values().items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{fmt(labels)} {value}" for labels, value in sorted(series.items()))
+        for name, series in sorted(histograms.items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (counts, total, count) in sorted(series.items()):
+                cumulative = 0
+                for le, c in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += c
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{fmt(labels)} {total}")
+                lines.append(f"{name}_count{fmt(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, self.labels)
+        if exc_type is not None:
+            REGISTRY.inc(self.name.replace("_seconds", "") + "_errors_total", 1, self.labels)
+        return False
+
+
+def set_enabled(enabled: bool):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def span(name, **labels):
+    """
+    Context manager timing its block into histogram `name`. Exceptions also count into
+    <name without _seconds>_errors_total.
+    """
+    if not ENABLED:
+        return _NOOP_SPAN
+    return Span(name, tuple(sorted(labels.items())))
+
+
+def timed(name, **labels):
+    """
+    Decorator form of span().
+    """
+    key = tuple(sorted(labels.items()))
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with Span(name, key):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def inc(name, amount=1, **labels):
+    if ENABLED and amount:
+        REGISTRY.inc(name, amount, tuple(sorted(labels.items())))
+
+
+def observe(name, seconds, **labels):
+    if ENABLED:
+        REGISTRY.observe(name, seconds, tuple(sorted(labels.items())))
+
+
+def register_gauge(name, fn, help_text=None):
+    REGISTRY.register_gauge(name, fn, help_text)
+
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+
+def render_prometheus():
+    return REGISTRY.render_prometheus()
+
+
+def reset():
+    REGISTRY.reset()
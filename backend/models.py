@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime # type: ignore
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, Index, UniqueConstraint # type: ignore
 from sqlalchemy.orm import declarative_base, relationship # type: ignore
 from datetime import datetime
 
@@ -17,7 +17,13 @@ class Candidate(Base):
     tech_stack_raw = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    questions = relationship("QuestionBlock", back_populates="candidate", cascade="all, delete-orphan")
+    questions = relationship("QuestionBlock", back_populates="candidate", cascade="all, delete-orphan",
+                             order_by="QuestionBlock.id")
+
+    __table_args__ = (
+        # newest-first listing and keyset pagination on (created_at, id)
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+    )
 
 class QuestionBlock(Base):
     __tablename__ = "questions"
@@ -25,7 +31,129 @@ class QuestionBlock(Base):
     candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"))
     technology = Column(String(128))
     difficulty = Column(String(32))
-    questions_json = Column(Text)  # JSON array of questions as text
+    questions_json = Column(Text)  # legacy: JSON array of questions as text; new rows use `items`
     created_at = Column(DateTime, default=datetime.utcnow)
 
     candidate = relationship("Candidate", back_populates="questions")
+    items = relationship("QuestionBlockItem", back_populates="block", cascade="all, delete-orphan",
+                         order_by="QuestionBlockItem.position")
+
+    __table_args__ = (
+        Index("ix_questions_candidate_id", "candidate_id", "id"),
+    )
+
+class QuestionText(Base):
+    """
+    One row per distinct question, keyed by a hash of its normalized text.
+    """
+    __tablename__ = "question_texts"
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), unique=True, nullable=False)
+    text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class QuestionBlockItem(Base):
+    """
+    Ordered link from a question block to its questions; candidate and technology are
+    denormalized here so per-question analytics don't need to join through blocks.
+    """
+    __tablename__ = "question_block_items"
+    block_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    question_id = Column(Integer, ForeignKey("question_texts.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"))
+    technology = Column(String(128))
+
+    block = relationship("QuestionBlock", back_populates="items")
+    question = relationship("QuestionText", lazy="joined")
+
+    __table_args__ = (
+        Index("ix_question_block_items_question_id", "question_id"),
+        Index("ix_question_block_items_candidate_id", "candidate_id"),
+        Index("ix_question_block_items_technology", "technology", "question_id"),
+    )
+
+class GenerationJob(Base):
+    """
+    Queued question-generation request, processed by backend.jobs workers.
+    """
+    __tablename__ = "generation_jobs"
+    id = Column(Integer, primary_key=True)
+    dedupe_key = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")  # queued | running | done | failed
+    payload_json = Column(Text, nullable=False)
+    result_json = Column(Text)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"))
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    worker = Column(String(64))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_generation_jobs_status_id", "status", "id"),
+        Index("ix_generation_jobs_dedupe_key", "dedupe_key", "status"),
+    )
+
+class QuestionBankEntry(Base):
+    """
+    Pre-generated question for a (technology, difficulty), served by backend.question_bank
+    without an LLM call. tech_key is the normalized cache key form of the technology name.
+    """
+    __tablename__ = "question_bank"
+    id = Column(Integer, primary_key=True)
+    tech_key = Column(String(128), nullable=False)
+    technology = Column(String(128), nullable=False)
+    difficulty = Column(String(16), nullable=False)
+    question_id = Column(Integer, ForeignKey("question_texts.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    question = relationship("QuestionText", lazy="joined")
+
+    __table_args__ = (
+        UniqueConstraint("tech_key", "difficulty", "question_id", name="uq_question_bank_entry"),
+        Index("ix_question_bank_created_at", "created_at"),
+    )
+
+class SavedEvent(Base):
+    """
+    Event-log submission (seq and idempotency key) already saved as a candidate, written in the
+    same transaction as the candidate, so `python -m backend.event_log replay` skips events the
+    app saved directly.
+    """
+    __tablename__ = "saved_events"
+    seq = Column(Integer, primary_key=True, autoincrement=False)
+    event_key = Column(String(64), primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"))
+
+class CandidateTech(Base):
+    """
+    Inverted index from normalized technology (cache key form) to candidate, built from
+    tech_stack_raw on insert. Rebuild with `python -m backend.storage rebuild-tech-index`.
+    """
+    __tablename__ = "candidate_techs"
+    tech_key = Column(String(128), primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_candidate_techs_candidate_id", "candidate_id"),
+    )
+
+class QuestionRollup(Base):
+    """
+    Per-day (UTC) counts of question blocks by normalized technology and difficulty, kept up
+    to date in the same transaction as every save so reports read these small rows instead of
+    scanning candidates and questions. Rebuild with `python -m backend.storage rebuild-rollups`.
+    """
+    __tablename__ = "question_rollups"
+    day = Column(Date, primary_key=True)
+    tech_key = Column(String(128), primary_key=True)
+    difficulty = Column(String(32), primary_key=True)
+    blocks = Column(Integer, nullable=False, default=0)  # candidates asked about the technology
+    questions = Column(Integer, nullable=False, default=0)
+    fallback_blocks = Column(Integer, nullable=False, default=0)  # served by the templated fallback
+
+    __table_args__ = (
+        Index("ix_question_rollups_tech_key_day", "tech_key", "day"),
+    )
@@ -0,0 +1,311 @@
+# backend/normalizer.py
+"""
+Tech-stack normalization engine.
+
+Maps free-form technology mentions ("nodejs", "Node.js", "node", "python3.11", "k8s", "Djangoo")
+to one canonical display name, using a loadable alias dictionary (backend/data/tech_aliases.json),
+a token-level trie for multi-word names and free-text blobs, version stripping, bounded fuzzy
+matching for typos and memoization of every lookup.
+
+The bundled dictionary is a seed set (about 520 canonical technologies); extend it with a
+TALENTSCOUT_TECH_ALIASES JSON file in the same format (see get_default_normalizer) rather
+than code changes. Unknown names are title-cased and passed through.
+"""
+import os
+import re
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_ALIASES_FILE = Path(__file__).parent / "data" / "tech_aliases.json"
+EXTRA_ALIASES_FILE = os.getenv("TALENTSCOUT_TECH_ALIASES")
+
+# Aliases that are also ordinary words (or too short to trust); they only count when a whole
+# list entry is exactly that word, never when found inside free text.
+AMBIGUOUS_IN_TEXT = {
+    "c", "r", "go", "sh", "js", "ts", "tf", "ml", "dl", "cv", "rl", "ui", "ux", "md", "wp", "rn", "pd", "np", "xd",
+    "ds", "vb", "kt", "rb", "es", "pg", "dj", "jq", "fp", "gae", "gcf", "rpi", "algo", "stats", "statistics",
+    "next", "solid", "rest", "make", "echo", "flux", "ray", "beam", "lambda", "spark", "hive", "chef", "puppet",
+    "elastic", "unity", "compose", "remix", "expo", "lit", "dash", "sketch", "segment", "rocket", "crystal",
+    "scheme", "shell", "less", "sanity", "prefect", "luigi", "camel", "kong", "mule", "sonar", "parcel", "relay",
+    "emotion", "astro", "ember", "backbone", "nest", "express", "rabbit", "dynamo", "elm", "nim", "vault",
+    "consul", "nomad", "packer", "helm", "argo", "bamboo", "karma", "jasmine", "mocha", "chai", "cucumber",
+    "leaflet", "amplitude", "looker", "excel", "electron", "unreal", "security", "crypto", "networking",
+    "embedded", "agile", "algorithms", "http", "dns", "yarn", "pip", "poetry", "eclipse", "apache", "oracle",
+    "rails", "phoenix", "tornado", "pyramid", "gin", "fiber", "three", "transformers", "torch", "presto",
+    "ros", "firmware", "scrum", "kanban", "containers", "concurrency",
+}
+
+_TOKEN = re.compile(r"\.?[\w#+]+(?:[./\-][\w#+]+)*\+*")
+_VERSION = re.compile(r"^(?P<name>.*?[a-z#+])[\s\-_]*v?(?P<version>\d+(?:\.\d+)*(?:\.x)?\+?)$")
+_STRIP_CHARS = re.compile(r"[^\w\+\#\.\-/& ]+")
+_SPACES = re.compile(r"\s+")
+_LIST_SPLIT = re.compile(r"[,\n;|]+|\s+\+\s+|\s+(?:and|&)\s+", re.IGNORECASE)
+
+
+def _clean(text: str):
+    # lowercase, drop stray punctuation (keep + # . - / & for c++, c#, node.js, ci/cd), collapse spaces
+    return _SPACES.sub(" ", _STRIP_CHARS.sub(" ", text.lower())).strip(" .-/&")
+
+
+def _tokens(text: str):
+    return [t.rstrip(".") if not t.startswith(".") or len(t) > 1 else t for t in _TOKEN.findall(text)]
+
+
+def _variants(alias: str):
+    # punctuation/spacing variants: "node.js" -> "nodejs", "node js"; "react-native" -> "react native"
+    out = {alias}
+    for a, b in ((".", ""), (".", " "), ("-", " "), ("-", ""), (" ", ""), (" ", "-")):
+        if a in alias and not alias.startswith(a):
+            out.add(alias.replace(a, b))
+    return {v for v in out if len(v) >= 3 or v == alias}
+
+
+def _deletes(word: str, distance: int):
+    """
+    All strings obtained by deleting up to `distance` characters (SymSpell neighbourhood).
+    """
+    out = {word}
+    frontier = {word}
+    for _ in range(distance):
+        nxt = set()
+        for w in frontier:
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def _edit_distance(a: str, b: str, limit: int):
+    """
+    Optimal-string-alignment (Damerau-Levenshtein) distance, or limit + 1 once it exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _max_typos(word: str):
+    if len(word) < 5:
+        return 0
+    return 1 if len(word) < 9 else 2
+
+
+class TechNormalizer:
+    """
+    Canonicalizes technology names. Build once (see get_default_normalizer) and reuse;
+    lookups are memoized per list entry (entries repeat far more often than whole stacks),
+    so memoized results are tuples.
+    """
+
+    def __init__(self, aliases: dict, cache_size: int = 65536):
+        self.aliases = {}   # cleaned alias -> canonical
+        self.canonical = set()
+        self._trie = {}     # token -> {token -> ..., None: canonical}
+        self._fuzzy = {}    # delete-neighbourhood key -> {alias, ...}
+        explicit = []
+        for canonical, names in aliases.items():
+            self.canonical.add(canonical)
+            explicit.append((_clean(canonical), canonical))
+            explicit.extend((_clean(name), canonical) for name in names)
+        # explicit aliases win over generated variants of other entries
+        for alias, canonical in explicit:
+            self.aliases.setdefault(alias, canonical)
+        for alias, canonical in explicit:
+            for variant in _variants(alias):
+                self.aliases.setdefault(variant, canonical)
+        for alias, canonical in self.aliases.items():
+            self._add_to_trie(alias, canonical)
+            typos = _max_typos(alias)
+            if typos:
+                for key in _deletes(alias, typos):
+                    self._fuzzy.setdefault(key, set()).add(alias)
+
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self.split_entry = lru_cache(maxsize=cache_size)(self._split_entry)
+        self.extract = lru_cache(maxsize=cache_size // 16)(self._extract)
+
+    @classmethod
+    def from_file(cls, path=None, extra_aliases: dict = None):
+        """
+        Load the alias dictionary (JSON: {"Canonical Name": ["alias", ...]}) plus optional extras.
+        Extra aliases may be {"alias": "Canonical"} pairs or the same list form.
+        """
+        with open(path or DEFAULT_ALIASES_FILE, encoding="utf-8") as f:
+            aliases = json.load(f)
+        for alias, target in (extra_aliases or {}).items():
+            if isinstance(target, str):
+                aliases.setdefault(target, []).append(alias)
+            else:
+                aliases.setdefault(alias, []).extend(target)
+        return cls(aliases)
+
+    def _add_to_trie(self, alias, canonical):
+        node = self._trie
+        for token in _tokens(alias):
+            node = node.setdefault(token, {})
+        node.setdefault(None, canonical)
+
+    def _lookup(self, key: str):
+        canonical = self.aliases.get(key)
+        if canonical:
+            return canonical
+        m = _VERSION.match(key)
+        if m:
+            return self.aliases.get(m.group("name").strip())
+        return None
+
+    def _fuzzy_lookup(self, key: str):
+        typos = _max_typos(key)
+        if not typos:
+            return None
+        best = None
+        best_distance = typos + 1
+        for k in _deletes(key, typos):
+            for alias in self._fuzzy.get(k, ()):
+                d = _edit_distance(key, alias, typos)
+                if d < best_distance or (d == best_distance and best is not None and alias < best):
+                    best, best_distance = alias, d
+        return self.aliases[best] if best is not None and best_distance <= typos else None
+
+    def _scan(self, tokens, allow_ambiguous: bool):
+        """
+        Longest-match walk of the token trie; returns canonical names in order of appearance.
+        """
+        # map versioned tokens ("python3.11", "vue3") onto their base token and split
+        # compound tokens the trie does not know ("python/django", "react-redux")
+        expanded = []
+        for token in tokens:
+            if token in self._trie:
+                expanded.append(token)
+                continue
+            m = _VERSION.match(token)
+            if m and m.group("name") in self._trie:
+                expanded.append(m.group("name"))
+            elif any(sep in token for sep in "/-") and len(token) > 1:
+                expanded.extend(t for t in re.split(r"[/\-]", token) if t)
+            else:
+                expanded.append(token)
+
+        found = []
+        i = 0
+        while i < len(expanded):
+            node = self._trie
+            match = None
+            j = i
+            while j < len(expanded) and expanded[j] in node:
+                node = node[expanded[j]]
+                j += 1
+                if None in node:
+                    alias = " ".join(expanded[i:j])
+                    if allow_ambiguous or alias not in AMBIGUOUS_IN_TEXT:
+                        match = (j, node[None])
+            if match:
+                i, canonical = match
+                found.append(canonical)
+            else:
+                i += 1
+        return found
+
+    def _normalize(self, name: str):
+        """
+        Canonical name for one technology mention, or None if it is not recognized.
+        """
+        key = _clean(name or "")
+        if not key:
+            return None
+        return self._lookup(key) or self._fuzzy_lookup(key)
+
+    def _split_entry(self, part: str):
+        """
+        Canonical names for one list entry. Entries that hold several technologies
+        ("React + Redux", "5 yrs react", "python/django") are expanded; an unknown entry is
+        kept, title-cased the way the form always displayed it.
+        """
+        key = _clean(part)
+        if not key:
+            return ()
+        canonical = self._lookup(key)
+        if canonical:
+            return (canonical,)
+        pieces = [p.strip() for p in key.split("/") if p.strip()] if "/" in key else [key]
+        out = []
+        for piece in pieces:
+            canonical = self._lookup(piece)
+            if canonical:
+                out.append(canonical)
+                continue
+            found = self._scan(_tokens(piece), allow_ambiguous=True)
+            if found:
+                out.extend(found)
+                continue
+            canonical = self._fuzzy_lookup(piece)
+            if canonical:
+                out.append(canonical)
+            else:
+                display = _STRIP_CHARS.sub("", part if len(pieces) == 1 else piece).strip()
+                if display:
+                    out.append(display.title())
+        return tuple(out)
+
+    def split(self, text: str):
+        """
+        Split a comma/newline/semicolon separated stack into a normalized, deduped list.
+        """
+        out = []
+        seen = set()
+        for part in _LIST_SPLIT.split(text or ""):
+            for name in self.split_entry(part.strip()):
+                if name not in seen:
+                    seen.add(name)
+                    out.append(name)
+        return out
+
+    def _extract(self, text: str):
+        """
+        Find every known technology in unstructured text ("5 yrs react + redux, some k8s").
+        Ambiguous everyday words are ignored here; unknown words are dropped.
+        """
+        out = []
+        seen = set()
+        for canonical in self._scan(_tokens(_clean(text or "")), allow_ambiguous=False):
+            if canonical not in seen:
+                seen.add(canonical)
+                out.append(canonical)
+        return tuple(out)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_default_normalizer(extra_aliases: dict = None):
+    """
+    Process-wide normalizer built from the bundled dictionary, TALENTSCOUT_TECH_ALIASES (if set)
+    and extra_aliases (only used on first call).
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            extra = dict(extra_aliases or {})
+            if EXTRA_ALIASES_FILE and os.path.exists(EXTRA_ALIASES_FILE):
+                with open(EXTRA_ALIASES_FILE, encoding="utf-8") as f:
+                    extra.update(json.load(f))
+            _default = TechNormalizer.from_file(extra_aliases=extra)
+        return _default
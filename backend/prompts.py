@@ -1,4 +1,10 @@
 # backend/prompts.py
+import os
+import math
+import threading
+
+from backend import metrics
+from backend.api_client import MISTRAL_MAX_NEW_TOKENS
 
 SYSTEM_PROMPT = (
     "You are an interview assistant that generates technical screening questions in JSON only.\n"
@@ -9,13 +15,135 @@ SYSTEM_PROMPT = (
     "Include a mix of conceptual and practical questions; for frameworks include at least one question about pitfalls or performance considerations."
 )
 
+# Every prompt starts with this exact string and only the tail varies, so provider-side
+# prefix caching can reuse it across requests.
+PROMPT_PREFIX = SYSTEM_PROMPT + "\n\n"
+
 def build_generation_prompt(techs: list, difficulty: str = "medium", years_experience: int = None):
     techs_str = ", ".join(techs)
     years = f"Candidate years of experience: {years_experience}." if years_experience is not None else ""
     return (
-        SYSTEM_PROMPT + "\n\n"
+        PROMPT_PREFIX +
         f"Technologies: {techs_str}\n"
         f"Requested difficulty: {difficulty}\n"
         f"{years}\n"
         "Return JSON only."
     )
+
+
+PLANNER_SAFETY = float(os.getenv("TALENTSCOUT_PLANNER_SAFETY", "0.15"))  # headroom on the learned estimate
+PLANNER_ALPHA = float(os.getenv("TALENTSCOUT_PLANNER_ALPHA", "0.2"))  # EMA weight of each new observation
+ENVELOPE_TOKENS = 12  # {"technology_questions":[ ... ]} plus a code fence
+# prior output tokens per block (keys, difficulty, 3-5 one-sentence questions), before the tech name
+DEFAULT_BLOCK_TOKENS = {"easy": 100.0, "medium": 115.0, "hard": 130.0}
+TRUNCATION_RATIO = 0.95  # output at this share of the budget is treated as cut off
+
+
+def estimate_tokens(text: str):
+    # ~4 characters per token for English/JSON; no tokenizer dependency
+    return max(1, (len(text or "") + 3) // 4)
+
+
+class PromptPlanner:
+    """
+    Splits a tech list into as few generation requests as fit the output token budget
+    (MISTRAL_MAX_NEW_TOKENS), so no request is planned to be truncated.
+
+    Output per block is estimated per difficulty as an exponential moving average of what
+    responses actually used (provider usage when reported, else ~chars/4 of the output), plus
+    a deviation term and PLANNER_SAFETY headroom. A response that hits the budget raises the
+    estimate by a quarter instead of being averaged in.
+    """
+
+    def __init__(self, budget: int = None, safety: float = None, alpha: float = None):
+        self.budget = budget or MISTRAL_MAX_NEW_TOKENS
+        self.safety = PLANNER_SAFETY if safety is None else safety
+        self.alpha = PLANNER_ALPHA if alpha is None else alpha
+        self._stats = {}  # difficulty -> [mean block tokens, mean absolute deviation, observations]
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.truncated = 0
+        self.estimated_tokens = 0
+        self.actual_tokens = 0
+
+    def _block_stats(self, difficulty):
+        default = DEFAULT_BLOCK_TOKENS.get(difficulty, DEFAULT_BLOCK_TOKENS["medium"])
+        return self._stats.get(difficulty, [default, default * 0.1, 0])
+
+    def block_tokens(self, tech: str, difficulty: str = "medium"):
+        mean, dev, _ = self._block_stats(difficulty)
+        return math.ceil((mean + 2 * dev) * (1 + self.safety)) + estimate_tokens(tech)
+
+    def estimate(self, techs, difficulty: str = "medium"):
+        return ENVELOPE_TOKENS + sum(self.block_tokens(t, difficulty) for t in techs)
+
+    def plan(self, techs, difficulty: str = "medium", max_group: int = None):
+        """
+        Group techs into requests whose estimated output fits the budget (first-fit decreasing,
+        at most max_group techs each). Groups keep the techs' original order and are ordered by
+        their first tech. A tech too large for the budget on its own still gets a request.
+        """
+        capacity = self.budget - ENVELOPE_TOKENS
+        sizes = {i: self.block_tokens(t, difficulty) for i, t in enumerate(techs)}
+        bins = []  # [remaining capacity, [indexes]]
+        for i in sorted(sizes, key=lambda i: (-sizes[i], i)):
+            for b in bins:
+                if sizes[i] <= b[0] and (not max_group or len(b[1]) < max_group):
+                    b[0] -= sizes[i]
+                    b[1].append(i)
+                    break
+            else:
+                bins.append([capacity - sizes[i], [i]])
+        groups = sorted(sorted(b[1]) for b in bins)
+        return [[techs[i] for i in group] for group in groups]
+
+    def record(self, techs, difficulty: str, output_tokens: int, blocks_returned: int):
+        """
+        Feed back one response: output_tokens actually generated for the request covering techs,
+        of which blocks_returned came back usable. Returns True when it looked truncated.
+        """
+        estimated = self.estimate(techs, difficulty)
+        truncated = output_tokens >= self.budget * TRUNCATION_RATIO
+        with self._lock:
+            self.requests += 1
+            self.estimated_tokens += estimated
+            self.actual_tokens += output_tokens
+            stats = self._stats.setdefault(difficulty, list(self._block_stats(difficulty)))
+            if truncated:
+                self.truncated += 1
+                stats[0] *= 1.25
+            elif blocks_returned:
+                names = sum(estimate_tokens(t) for t in techs[:blocks_returned])
+                sample = max(1.0, (output_tokens - ENVELOPE_TOKENS - names) / blocks_returned)
+                stats[1] += self.alpha * (abs(sample - stats[0]) - stats[1])
+                stats[0] += self.alpha * (sample - stats[0])
+                stats[2] += 1
+        metrics.inc("talentscout_llm_tokens_estimated_total", estimated)
+        metrics.inc("talentscout_llm_tokens_total", output_tokens)
+        if truncated:
+            metrics.inc("talentscout_llm_truncated_total")
+        return truncated
+
+    def stats(self):
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "requests": self.requests,
+                "truncated": self.truncated,
+                "estimated_tokens": self.estimated_tokens,
+                "actual_tokens": self.actual_tokens,
+                "block_tokens": {d: {"mean": round(s[0], 1), "deviation": round(s[1], 1), "observations": s[2]}
+                                 for d, s in self._stats.items()},
+            }
+
+
+_default_planner = None
+_default_planner_lock = threading.Lock()
+
+
+def get_default_planner():
+    global _default_planner
+    with _default_planner_lock:
+        if _default_planner is None:
+            _default_planner = PromptPlanner()
+        return _default_planner
@@ -0,0 +1,393 @@
+# backend/question_bank.py
+"""
+Question bank: pre-generated questions per (technology, difficulty), served without an LLM call.
+
+    python -m backend.question_bank warm-up --top 300 --per-pair 20 --workers 4
+    python -m backend.question_bank refresh --max-age-days 30 --every 3600
+    python -m backend.question_bank stats
+
+generate_questions_for_techs samples from the bank first (one dict lookup plus a k-item sample
+per tech) and only calls the LLM for technologies the bank does not cover. Only parsed LLM
+output is banked; templated fallback questions never are.
+"""
+import os
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, func, select # type: ignore
+
+from backend.cache import normalize_tech_key
+from backend.models import QuestionBankEntry, QuestionBlock, QuestionText
+from backend.normalizer import DEFAULT_ALIASES_FILE
+from backend.similarity import DEDUP_ENABLED, novel
+from backend.storage import SessionLocal, run_write, _insert_ignore, _intern_questions, _clean_questions, question_hash
+
+logger = logging.getLogger(__name__)
+
+BANK_ENABLED = os.getenv("TALENTSCOUT_QUESTION_BANK", "0") == "1"
+BANK_PER_PAIR = int(os.getenv("TALENTSCOUT_BANK_PER_PAIR", "20"))
+BANK_SAMPLE_SIZE = int(os.getenv("TALENTSCOUT_BANK_SAMPLE_SIZE", "4"))
+BANK_MIN_ENTRIES = int(os.getenv("TALENTSCOUT_BANK_MIN_ENTRIES", "5"))  # pairs with fewer are not served
+BANK_RELOAD_SECONDS = float(os.getenv("TALENTSCOUT_BANK_RELOAD_SECONDS", "60"))
+BANK_MAX_AGE_DAYS = float(os.getenv("TALENTSCOUT_BANK_MAX_AGE_DAYS", "30"))
+BANK_TEMPERATURE = float(os.getenv("TALENTSCOUT_BANK_TEMPERATURE", "0.7"))  # variety across warm-up rounds
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class QuestionBank:
+    """
+    In-memory view of the question_bank table: {(tech_key, difficulty): (technology, questions)}.
+    The view is reloaded when another process changed the table (checked at most every
+    reload_seconds with a MAX(id)/COUNT probe); questions added through this instance are
+    appended to the view directly.
+    """
+
+    def __init__(self, session_factory=None, sample_size: int = None, min_entries: int = None,
+                 reload_seconds: float = None, seed=None):
+        self.session_factory = session_factory or SessionLocal
+        self.sample_size = sample_size or BANK_SAMPLE_SIZE
+        self.min_entries = BANK_MIN_ENTRIES if min_entries is None else min_entries
+        self.reload_seconds = BANK_RELOAD_SECONDS if reload_seconds is None else reload_seconds
+        self._pool = {}
+        self._version = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+
+    def _probe(self, session):
+        return tuple(session.execute(select(func.max(QuestionBankEntry.id), func.count(QuestionBankEntry.id))).one())
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.reload_seconds:
+                return
+            session = self.session_factory()
+            try:
+                version = self._probe(session)
+                if force or version != self._version:
+                    rows = session.execute(
+                        select(QuestionBankEntry.tech_key, QuestionBankEntry.technology,
+                               QuestionBankEntry.difficulty, QuestionText.text)
+                        .join(QuestionText, QuestionText.id == QuestionBankEntry.question_id)
+                    ).all()
+                    grouped = {}
+                    for tech_key, technology, difficulty, text in rows:
+                        grouped.setdefault((tech_key, difficulty), (technology, []))[1].append(text)
+                    self._pool = {key: (technology, tuple(texts)) for key, (technology, texts) in grouped.items()}
+                    self._version = version
+            finally:
+                session.close()
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        self._checked_at = None
+
+    def count(self, tech: str, difficulty: str):
+        self._refresh()
+        entry = self._pool.get((normalize_tech_key(tech), difficulty))
+        return len(entry[1]) if entry else 0
+
+    def sample(self, tech: str, difficulty: str = "medium", k: int = None):
+        """
+        A block of k random banked questions for tech, or None when the bank has too few.
+        """
+        self._refresh()
+        entry = self._pool.get((normalize_tech_key(tech), difficulty))
+        if entry is None or len(entry[1]) < max(1, self.min_entries):
+            self.misses += 1
+            return None
+        self.hits += 1
+        texts = entry[1]
+        return {"technology": tech, "difficulty": difficulty,
+                "questions": self._rng.sample(texts, min(k or self.sample_size, len(texts)))}
+
+    def sample_many(self, techs, difficulty: str = "medium", k: int = None):
+        """
+        Returns {tech: block} for the techs the bank can serve.
+        """
+        out = {}
+        for tech in techs:
+            block = self.sample(tech, difficulty, k)
+            if block is not None:
+                out[tech] = block
+        return out
+
+    def add(self, technology: str, difficulty: str, questions):
+        """
+        Bank questions for (technology, difficulty). Exact and near-duplicates of questions already
+        banked for the pair are skipped; returns how many were new.
+        """
+        texts = _clean_questions(questions)
+        tech_key = normalize_tech_key(technology)
+        self._refresh()
+        banked = self._pool.get((tech_key, difficulty), (None, ()))[1]
+        if DEDUP_ENABLED and texts:
+            texts = novel(texts, banked, mask_terms=[technology])
+        texts = [t for t in texts if t not in set(banked)]
+        if not texts:
+            return 0
+
+        def write(session):
+            ids = _intern_questions(session, texts)
+            now = datetime.utcnow()
+            rows = [{"tech_key": tech_key, "technology": technology, "difficulty": difficulty,
+                     "question_id": ids[question_hash(t)], "created_at": now} for t in texts]
+            before = self._probe(session)
+            session.execute(_insert_ignore(QuestionBankEntry, "tech_key", "difficulty", "question_id"), rows)
+            return before, self._probe(session)
+
+        before, after = run_write(write)
+        added = after[1] - before[1]
+        if added != len(texts):
+            self.invalidate()  # some were banked elsewhere meanwhile: reload on the next read
+            return added
+        with self._lock:
+            # append to the in-memory view instead of reloading the table; a write from another
+            # process (version moved under us) still triggers a full reload on the next check
+            entry = self._pool.get((tech_key, difficulty), (technology, ()))
+            self._pool[(tech_key, difficulty)] = (entry[0], entry[1] + tuple(texts))
+            if self._version == before:
+                self._version = after
+        return added
+
+    def counts(self):
+        """
+        {(technology, difficulty): number of banked questions}.
+        """
+        self._refresh()
+        return {(technology, difficulty): len(texts) for (_, difficulty), (technology, texts) in self._pool.items()}
+
+    def stats(self):
+        self._refresh()
+        servable = sum(1 for _, texts in self._pool.values() if len(texts) >= max(1, self.min_entries))
+        return {"pairs": len(self._pool), "servable_pairs": servable,
+                "questions": sum(len(texts) for _, texts in self._pool.values()),
+                "hits": self.hits, "misses": self.misses}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_default_bank():
+    """
+    Process-wide bank used by generate_questions_for_techs, or None unless TALENTSCOUT_QUESTION_BANK=1.
+    """
+    global _default
+    if not BANK_ENABLED:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = QuestionBank()
+        return _default
+
+
+def popular_technologies(limit: int = 300):
+    """
+    The technologies worth banking: most frequent in stored submissions first, then the bundled
+    alias dictionary in file order.
+    """
+    session = SessionLocal()
+    try:
+        rows = session.execute(
+            select(QuestionBlock.technology, func.count(QuestionBlock.id).label("n"))
+            .where(QuestionBlock.technology.isnot(None))
+            .group_by(QuestionBlock.technology)
+            .order_by(func.count(QuestionBlock.id).desc())
+            .limit(limit)
+        ).all()
+    finally:
+        session.close()
+    out = {}
+    for technology, _ in rows:
+        out.setdefault(normalize_tech_key(technology), technology)
+    with open(DEFAULT_ALIASES_FILE, encoding="utf-8") as f:
+        for technology in json.load(f):
+            if len(out) >= limit:
+                break
+            out.setdefault(normalize_tech_key(technology), technology)
+    return list(out.values())[:limit]
+
+
+def _fill(needs: dict, bank: QuestionBank, workers: int = 4, group_size: int = 5, model=None, max_rounds: int = None):
+    """
+    Generate until each (technology, difficulty) in needs has that many new banked questions, or
+    max_rounds of LLM calls have run. Pairs whose round adds nothing new are dropped early.
+    Returns {(technology, difficulty): questions added}.
+    """
+    # generator imports this module for serving, so import it lazily here
+    from backend.generator import _generate_batch, _plan_groups
+
+    added = {pair: 0 for pair in needs}
+    pending = {pair for pair, n in needs.items() if n > 0}
+    max_rounds = max_rounds or max(2, max(needs.values(), default=0) // 3 + 2)
+    for round_no in range(max_rounds):
+        if not pending:
+            break
+        groups = []
+        for difficulty in DIFFICULTIES:
+            techs = sorted(t for t, d in pending if d == difficulty)
+            groups.extend((group, difficulty) for group in _plan_groups(techs, difficulty, group_size))
+
+        def run(job):
+            techs, difficulty = job
+            try:
+                return difficulty, _generate_batch(techs, difficulty, model, temperature=BANK_TEMPERATURE)
+            except Exception as e:
+                logger.warning("Bank generation failed for %s/%s: %s", techs, difficulty, e)
+                return difficulty, {}
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="talentscout-bank") as pool:
+            results = list(pool.map(run, groups))
+
+        for difficulty, matched in results:
+            for technology, block in matched.items():
+                pair = (technology, difficulty)
+                new = bank.add(technology, difficulty, block.get("questions"))
+                added[pair] += new
+                if new == 0 or added[pair] >= needs[pair]:
+                    pending.discard(pair)
+        logger.info("Bank round %d: %d pairs still short", round_no + 1, len(pending))
+    return added
+
+
+def warm_up(techs, difficulties=DIFFICULTIES, per_pair: int = None, workers: int = 4, group_size: int = 5,
+            model=None, bank: QuestionBank = None):
+    """
+    Pre-generate questions until every (tech, difficulty) holds per_pair banked questions.
+    workers bounds the number of LLM requests in flight. Returns a summary dict.
+    """
+    bank = bank or QuestionBank()
+    per_pair = per_pair or BANK_PER_PAIR
+    needs = {}
+    for tech in techs:
+        for difficulty in difficulties:
+            short = per_pair - bank.count(tech, difficulty)
+            if short > 0:
+                needs[(tech, difficulty)] = short
+    started = time.monotonic()
+    added = _fill(needs, bank, workers=workers, group_size=group_size, model=model)
+    return {
+        "pairs": len(techs) * len(difficulties),
+        "pairs_filled": len(needs),
+        "questions_added": sum(added.values()),
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def refresh_stale(max_age_days: float = None, max_pairs: int = 50, workers: int = 4, model=None,
+                  bank: QuestionBank = None):
+    """
+    Rotate entries older than max_age_days: generate replacements for up to max_pairs pairs, then
+    delete as many of their oldest stale entries as were replaced, so a pair never drops below
+    what it could serve before. Returns {"pairs": n, "added": n, "removed": n}.
+    """
+    bank = bank or QuestionBank()
+    cutoff = datetime.utcnow() - timedelta(days=BANK_MAX_AGE_DAYS if max_age_days is None else max_age_days)
+    session = SessionLocal()
+    try:
+        rows = session.execute(
+            select(QuestionBankEntry.tech_key, QuestionBankEntry.difficulty,
+                   func.min(QuestionBankEntry.technology), func.count(QuestionBankEntry.id))
+            .where(QuestionBankEntry.created_at < cutoff)
+            .group_by(QuestionBankEntry.tech_key, QuestionBankEntry.difficulty)
+            .order_by(func.min(QuestionBankEntry.created_at))
+            .limit(max_pairs)
+        ).all()
+    finally:
+        session.close()
+    if not rows:
+        return {"pairs": 0, "added": 0, "removed": 0}
+
+    needs = {(technology, difficulty): n for _, difficulty, technology, n in rows}
+    added = _fill(needs, bank, workers=workers, model=model)
+
+    def write(session):
+        removed = 0
+        for tech_key, difficulty, technology, _ in rows:
+            n = added.get((technology, difficulty), 0)
+            if not n:
+                continue
+            oldest = select(QuestionBankEntry.id).where(
+                QuestionBankEntry.tech_key == tech_key, QuestionBankEntry.difficulty == difficulty,
+                QuestionBankEntry.created_at < cutoff,
+            ).order_by(QuestionBankEntry.created_at, QuestionBankEntry.id).limit(n)
+            removed += session.execute(delete(QuestionBankEntry).where(QuestionBankEntry.id.in_(oldest))).rowcount
+        return removed
+
+    removed = run_write(write)
+    bank.invalidate()
+    return {"pairs": len(rows), "added": sum(added.values()), "removed": removed}
+
+
+def start_background_refresh(interval: float = 3600, stop_event: threading.Event = None, **kwargs):
+    """
+    Run refresh_stale every interval seconds on a daemon thread. Set stop_event to stop it.
+    """
+    stop_event = stop_event or threading.Event()
+
+    def loop():
+        while not stop_event.is_set():
+            try:
+                logger.info("Bank refresh: %s", refresh_stale(**kwargs))
+            except Exception:
+                logger.exception("Bank refresh failed")
+            stop_event.wait(interval)
+
+    thread = threading.Thread(target=loop, name="talentscout-bank-refresh", daemon=True)
+    thread.start()
+    return stop_event
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TalentScout question bank.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm-up", help="pre-generate questions for popular technologies")
+    warm.add_argument("--top", type=int, default=300, help="number of technologies to bank")
+    warm.add_argument("--techs", default=None, help="comma-separated technologies (overrides --top)")
+    warm.add_argument("--difficulties", default=",".join(DIFFICULTIES))
+    warm.add_argument("--per-pair", type=int, default=BANK_PER_PAIR)
+    warm.add_argument("--workers", type=int, default=4)
+    warm.add_argument("--model", default=None)
+    refresh = sub.add_parser("refresh", help="rotate stale entries")
+    refresh.add_argument("--max-age-days", type=float, default=BANK_MAX_AGE_DAYS)
+    refresh.add_argument("--max-pairs", type=int, default=50)
+    refresh.add_argument("--workers", type=int, default=4)
+    refresh.add_argument("--every", type=float, default=None, help="keep running, refreshing every N seconds")
+    sub.add_parser("stats", help="print bank size")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "warm-up":
+        techs = [t.strip() for t in args.techs.split(",") if t.strip()] if args.techs else popular_technologies(args.top)
+        difficulties = [d.strip() for d in args.difficulties.split(",") if d.strip()]
+        print(json.dumps(warm_up(techs, difficulties, per_pair=args.per_pair, workers=args.workers, model=args.model), indent=2))
+    elif args.command == "refresh":
+        if args.every:
+            stop = start_background_refresh(args.every, max_age_days=args.max_age_days,
+                                            max_pairs=args.max_pairs, workers=args.workers)
+            try:
+                while not stop.wait(1):
+                    pass
+            except KeyboardInterrupt:
+                stop.set()
+        else:
+            print(json.dumps(refresh_stale(args.max_age_days, args.max_pairs, args.workers), indent=2))
+    elif args.command == "stats":
+        print(json.dumps(QuestionBank().stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
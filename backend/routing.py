@@ -0,0 +1,269 @@
+# backend/routing.py
+"""
+Latency-aware routing and hedged requests for LLM generation.
+
+Each route is a model (optionally on its own endpoint). The router keeps a rolling window of
+latencies and errors per route and, for every request:
+
+    1. sends it to the healthy route with the lowest observed p50 (configured order until a
+       route has enough samples; a route with too many recent errors is tried last),
+    2. once that request has run past the route's observed p95 (TALENTSCOUT_HEDGE_DELAY until
+       there is data), sends one duplicate to the next route (the same route when only one is
+       configured); a failed request fails over to a different route straight away, if any,
+    3. returns the first response that parse() accepts and cancels the other request
+       (api_client.cancellation: it is not sent or retried any further), and
+    4. raises TimeoutError when the overall deadline passes, so the caller serves the fallback.
+
+Hedges are paid for from a budget that every request tops up by TALENTSCOUT_HEDGE_BUDGET, so
+at most that share of requests is duplicated however slow the provider gets.
+
+Routes are configured as a comma-separated list of "model" or "model@base_url" entries:
+
+    TALENTSCOUT_ROUTES="mistral-medium,mistral-small@https://eu.example.com"
+"""
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from backend import metrics
+from backend import api_client
+
+logger = logging.getLogger(__name__)
+
+HEDGE_ENABLED = os.getenv("TALENTSCOUT_HEDGE", "1") == "1"
+HEDGE_DELAY = float(os.getenv("TALENTSCOUT_HEDGE_DELAY", "8"))  # until a route has ROUTE_MIN_SAMPLES
+HEDGE_MIN_DELAY = float(os.getenv("TALENTSCOUT_HEDGE_MIN_DELAY", "0.05"))
+HEDGE_BUDGET = float(os.getenv("TALENTSCOUT_HEDGE_BUDGET", "0.1"))  # hedges per request, long-run
+HEDGE_BURST = float(os.getenv("TALENTSCOUT_HEDGE_BURST", "5"))
+ROUTE_WINDOW = int(os.getenv("TALENTSCOUT_ROUTE_WINDOW", "200"))  # samples kept per route
+ROUTE_WINDOW_SECONDS = float(os.getenv("TALENTSCOUT_ROUTE_WINDOW_SECONDS", "300"))
+ROUTE_MIN_SAMPLES = int(os.getenv("TALENTSCOUT_ROUTE_MIN_SAMPLES", "20"))
+ROUTE_MAX_ERROR_RATE = float(os.getenv("TALENTSCOUT_ROUTE_MAX_ERROR_RATE", "0.5"))
+
+ROUTE_METRIC = "talentscout_route_seconds"
+
+
+class RouteStats:
+    """
+    Rolling latency/error window for one route. Samples older than window_seconds are dropped,
+    so a route that was failing is tried again once its bad samples age out.
+    """
+
+    def __init__(self, window: int = None, window_seconds: float = None):
+        self.window_seconds = ROUTE_WINDOW_SECONDS if window_seconds is None else window_seconds
+        self._samples = deque(maxlen=window or ROUTE_WINDOW)  # (monotonic time, seconds, error)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, error: bool = False):
+        with self._lock:
+            self._samples.append((time.monotonic(), seconds, error))
+
+    def _recent(self):
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+            return list(self._samples)
+
+    def summary(self):
+        samples = self._recent()
+        latencies = sorted(s[1] for s in samples if not s[2])
+        errors = sum(1 for s in samples if s[2])
+
+        def quantile(q):
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+
+        return {
+            "samples": len(samples),
+            "p50": quantile(0.5),
+            "p95": quantile(0.95),
+            "error_rate": errors / len(samples) if samples else 0.0,
+        }
+
+
+class Route:
+    def __init__(self, model: str = None, base_url: str = None):
+        self.model = model or None
+        self.base_url = base_url or None
+        self.name = (model or "default") + (f"@{base_url}" if base_url else "")
+        self.stats = RouteStats()
+        self._client = None
+
+    def client(self):
+        if self._client is None:
+            # same process-wide rate limiter as the default client: hedges never exceed it
+            self._client = api_client.MistralClient(base_url=self.base_url, rate_limiter=api_client._shared_rate_limiter)
+        return self._client
+
+
+def parse_routes(spec: str):
+    routes = []
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if entry:
+            model, _, base_url = entry.partition("@")
+            routes.append(Route(model.strip(), base_url.strip()))
+    return routes or [Route(api_client.MISTRAL_MODEL)]
+
+
+class Router:
+    def __init__(self, routes=None, hedge: bool = None, hedge_delay: float = None, budget: float = None,
+                 burst: float = None, min_samples: int = None):
+        self.routes = list(routes) if routes else parse_routes(os.getenv("TALENTSCOUT_ROUTES", ""))
+        self.hedge = HEDGE_ENABLED if hedge is None else hedge
+        self.hedge_delay = HEDGE_DELAY if hedge_delay is None else hedge_delay
+        self.budget = HEDGE_BUDGET if budget is None else budget
+        self.burst = HEDGE_BURST if burst is None else burst
+        self.min_samples = ROUTE_MIN_SAMPLES if min_samples is None else min_samples
+        self._credits = 1.0
+        self._lock = threading.Lock()
+
+    def _route_for(self, model):
+        with self._lock:
+            for route in self.routes:
+                if route.model == model and route.base_url is None:
+                    return route
+            route = Route(model)
+            self.routes.append(route)
+            return route
+
+    def order(self, model: str = None):
+        """
+        Routes in the order they would be tried: an explicitly requested model first, then
+        healthy routes by observed p50 (routes without enough samples keep configured order and
+        go first, so they get measured), then routes over ROUTE_MAX_ERROR_RATE.
+        """
+        def key(indexed):
+            index, route = indexed
+            s = route.stats.summary()
+            unhealthy = s["samples"] >= 5 and s["error_rate"] >= ROUTE_MAX_ERROR_RATE
+            p50 = s["p50"] if s["samples"] >= self.min_samples and s["p50"] is not None else 0.0
+            return unhealthy, p50, index
+
+        ranked = [route for _, route in sorted(enumerate(list(self.routes)), key=key)]
+        if model:
+            primary = self._route_for(model)
+            ranked = [primary] + [route for route in ranked if route is not primary]
+        return ranked
+
+    def _delay(self, route):
+        s = route.stats.summary()
+        if s["samples"] < self.min_samples or s["p95"] is None:
+            return self.hedge_delay
+        return max(HEDGE_MIN_DELAY, s["p95"])
+
+    def _take_credit(self):
+        with self._lock:
+            if self._credits >= 1:
+                self._credits -= 1
+                return True
+            return False
+
+    def _send(self, route, prompt, temperature, timeout, call):
+        if route.base_url:
+            return route.client().generate(prompt, model=route.model, temperature=temperature, timeout=timeout)
+        return call(prompt, model=route.model, temperature=temperature, timeout=timeout)
+
+    def _launch(self, route, prompt, parse, temperature, timeout, call, cancel):
+        future = Future()
+
+        def attempt():
+            started = time.monotonic()
+            try:
+                with api_client.cancellation(cancel):
+                    resp = self._send(route, prompt, temperature, timeout, call)
+                if cancel.is_set():
+                    raise api_client.RequestCancelled("request lost the race")
+                result = parse(resp)
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                # a request called off after running `elapsed` says its latency was at least that
+                route.stats.record(elapsed, error=not cancel.is_set())
+                metrics.observe(ROUTE_METRIC, elapsed, route=route.name)
+                future.set_exception(e)
+            else:
+                elapsed = time.monotonic() - started
+                route.stats.record(elapsed)
+                metrics.observe(ROUTE_METRIC, elapsed, route=route.name)
+                future.set_result(result)
+
+        threading.Thread(target=attempt, name="talentscout-route", daemon=True).start()
+        return future
+
+    def generate(self, prompt: str, parse, model: str = None, temperature: float = 0.2, deadline: float = 30,
+                 call=None):
+        """
+        Send prompt and return parse(response) for the first response parse() accepts (parse
+        raises to reject one). call(prompt, model=, temperature=, timeout=) sends to routes on
+        the default endpoint (api_client.call_mistral by default). Raises TimeoutError after
+        deadline seconds, or the last error when every attempt failed.
+        """
+        call = call or api_client.call_mistral
+        started = time.monotonic()
+        end = started + deadline
+        routes = self.order(model)
+        primary = routes[0]
+        backup = routes[1] if len(routes) > 1 else primary
+        with self._lock:
+            self._credits = min(self.burst, self._credits + self.budget)
+
+        cancel = threading.Event()
+        pending = {self._launch(primary, prompt, parse, temperature, deadline, call, cancel): primary}
+        hedge_at = started + self._delay(primary) if self.hedge else float("inf")
+        hedged = not self.hedge
+        hedge = error = None
+        try:
+            while True:
+                now = time.monotonic()
+                if pending and now < end:
+                    wake = end if hedged else min(end, hedge_at)
+                    done, _ = wait(pending, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        route = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            logger.info("LLM request to %s failed (%s): %s", route.name, type(e).__name__, e)
+                            error = e
+                            continue
+                        if future is hedge:
+                            metrics.inc("talentscout_hedge_wins_total", route=route.name)
+                        return result
+                if time.monotonic() >= end:
+                    break
+                # a failed request moves on to a different route only; retrying the same
+                # endpoint is api_client's job
+                if not hedged and (time.monotonic() >= hedge_at if pending else backup is not primary):
+                    hedged = True
+                    if self._take_credit():
+                        remaining = end - time.monotonic()
+                        metrics.inc("talentscout_hedges_total", route=backup.name)
+                        logger.info("Hedging LLM request to %s after %.2fs", backup.name, time.monotonic() - started)
+                        hedge = self._launch(backup, prompt, parse, temperature, remaining, call, cancel)
+                        pending[hedge] = backup
+                if not pending:
+                    break
+            if pending or error is None:
+                metrics.inc("talentscout_deadline_exceeded_total")
+                raise TimeoutError(f"LLM request missed the {deadline:.1f}s deadline")
+            raise error
+        finally:
+            cancel.set()
+
+    def stats(self):
+        return {route.name: route.stats.summary() for route in self.routes}
+
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+def get_default_router():
+    global _default_router
+    with _default_router_lock:
+        if _default_router is None:
+            _default_router = Router()
+        return _default_router
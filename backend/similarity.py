@@ -0,0 +1,347 @@
+# backend/similarity.py
+"""
+Local near-duplicate detection for generated questions (NumPy only, no models, no network).
+
+Questions are embedded as signed, hashed character 3/4/5-gram vectors with sublinear term
+frequency (and IDF when a corpus is available), L2-normalized, so cosine similarity is a
+matrix product. Technology names can be masked out, so "Explain the main use-cases of Python"
+and "... of Django" count as the same template.
+
+The whole stored corpus is indexed on disk (append-only vector/id files read through a
+memory map) for corpus-wide duplicate reports:
+
+    python -m backend.similarity index
+    python -m backend.similarity duplicates --threshold 0.85 --out near_duplicates.jsonl
+    python -m backend.similarity check "What is Kubernetes used for?"
+"""
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+from functools import lru_cache
+
+import numpy as np # type: ignore
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = os.getenv("TALENTSCOUT_DEDUP", "1") == "1"
+DEDUP_THRESHOLD = float(os.getenv("TALENTSCOUT_DEDUP_THRESHOLD", "0.8"))
+DEDUP_MIN_QUESTIONS = int(os.getenv("TALENTSCOUT_DEDUP_MIN_QUESTIONS", "3"))
+VECTOR_DIM = int(os.getenv("TALENTSCOUT_VECTOR_DIM", "1024"))
+VECTOR_INDEX_DIR = os.getenv("TALENTSCOUT_VECTOR_INDEX", "talentscout_vectors")
+
+NGRAMS = (3, 4, 5)
+_WORD = re.compile(r"[a-z0-9#+]+")
+_FNV_OFFSET = np.uint64(1469598103934665603)
+_FNV_PRIME = np.uint64(1099511628211)
+_MIX = np.uint64(0xFF51AFD7ED558CCD)
+
+
+@lru_cache(maxsize=256)
+def _mask_pattern(terms):
+    # whole terms only: "C" must not match inside "arithmetic", while "C++" and "C#" still match
+    alternatives = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(r"(?<![a-z0-9#+])(?:%s)(?![a-z0-9#+])" % alternatives)
+
+
+def _prepare(text: str, mask_terms=()):
+    text = str(text).lower()
+    terms = tuple(sorted({str(t).lower() for t in mask_terms if t}))
+    if terms:
+        text = _mask_pattern(terms).sub(" tech ", text)
+    return (" " + " ".join(_WORD.findall(text)) + " ").encode("utf-8")
+
+
+def hash_vectors(texts, dim: int = None, mask_terms=()):
+    """
+    Raw signed n-gram counts, shape (len(texts), dim). All texts are hashed in one pass over a
+    concatenated byte buffer; n-grams that straddle two texts are discarded.
+    """
+    dim = dim or VECTOR_DIM
+    docs = [_prepare(t, mask_terms) for t in texts]
+    out = np.zeros((len(docs), dim), dtype=np.float32)
+    if not docs:
+        return out
+    lengths = np.fromiter(map(len, docs), dtype=np.int64, count=len(docs))
+    buf = np.frombuffer(b"".join(docs), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(docs)), lengths)
+    rows, cols, signs = [], [], []
+    for n in NGRAMS:
+        m = len(buf) - n + 1
+        if m <= 0:
+            continue
+        h = np.full(m, _FNV_OFFSET)
+        for k in range(n):
+            h = (h ^ buf[k:k + m]) * _FNV_PRIME
+        h ^= h >> np.uint64(33)
+        h *= _MIX
+        h ^= h >> np.uint64(33)
+        inside = owner[:m] == owner[n - 1:]
+        h = h[inside]
+        rows.append(owner[:m][inside])
+        cols.append((h % np.uint64(dim)).astype(np.int64))
+        signs.append(np.where(h >> np.uint64(63), 1.0, -1.0))
+    if rows:
+        flat = np.concatenate(rows) * dim + np.concatenate(cols)
+        out += np.bincount(flat, weights=np.concatenate(signs), minlength=len(docs) * dim).reshape(len(docs), dim)
+    return out
+
+
+def weight(raw, idf=None):
+    """
+    Sublinear tf (optionally x idf), L2-normalized rows, float32.
+    """
+    x = np.sign(raw) * np.log1p(np.abs(raw, dtype=np.float32))
+    if idf is not None:
+        x *= idf
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return (x / np.maximum(norms, 1e-9)).astype(np.float32, copy=False)
+
+
+def embed(texts, dim: int = None, mask_terms=(), idf=None):
+    return weight(hash_vectors(texts, dim, mask_terms), idf)
+
+
+def near_duplicate_mask(vectors, threshold: float = None, batch_size: int = 1024):
+    """
+    Greedy dedupe in input order: True for rows to keep. A row is dropped when its cosine
+    similarity to an earlier kept row reaches threshold. Similarities are computed one
+    batch x (kept so far) matrix product at a time.
+    """
+    threshold = DEDUP_THRESHOLD if threshold is None else threshold
+    n = len(vectors)
+    keep = np.ones(n, dtype=bool)
+    for start in range(0, n, batch_size):
+        end = min(n, start + batch_size)
+        block = vectors[start:end]
+        if start:
+            prior = vectors[:start][keep[:start]]
+            if len(prior):
+                keep[start:end] &= (block @ prior.T).max(axis=1) < threshold
+        sims = block @ block.T
+        for i in range(end - start):
+            if keep[start + i]:
+                keep[start + i + 1:end] &= sims[i, i + 1:] < threshold
+    return keep
+
+
+def novel(candidates, existing=(), threshold: float = None, mask_terms=()):
+    """
+    The candidates that are not near-duplicates of `existing` or of each other, in order.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return []
+    existing = list(existing)
+    vectors = embed(existing + candidates, mask_terms=mask_terms)
+    keep = np.ones(len(vectors), dtype=bool)
+    keep[len(existing):] = near_duplicate_mask(vectors[len(existing):], threshold)
+    if existing:
+        sims = vectors[len(existing):] @ vectors[:len(existing)].T
+        keep[len(existing):] &= sims.max(axis=1) < (DEDUP_THRESHOLD if threshold is None else threshold)
+    return [q for q, k in zip(candidates, keep[len(existing):]) if k]
+
+
+def dedupe_blocks(blocks, threshold: float = None, mask_technologies: bool = True):
+    """
+    Drop near-duplicate questions within and across blocks (earlier blocks and questions win).
+    Returns (deduped_blocks, dropped) where dropped[i] lists the questions removed from block i,
+    least similar first, so callers can top a short block back up.
+    """
+    flat = [(i, q) for i, block in enumerate(blocks) for q in (block.get("questions") or [])]
+    if len(flat) < 2:
+        return [dict(b, questions=list(b.get("questions") or [])) for b in blocks], [[] for _ in blocks]
+    mask_terms = sorted({b.get("technology") or "" for b in blocks}, key=len, reverse=True) if mask_technologies else ()
+    vectors = embed([q for _, q in flat], mask_terms=mask_terms)
+    keep = near_duplicate_mask(vectors, threshold)
+    kept = [[] for _ in blocks]
+    dropped = [[] for _ in blocks]
+    closeness = (vectors @ vectors[keep].T).max(axis=1)
+    for (i, q), k, c in zip(flat, keep, closeness):
+        (kept[i] if k else dropped[i]).append((c, q))
+    out = [dict(b, questions=[q for _, q in kept[i]]) for i, b in enumerate(blocks)]
+    return out, [[q for _, q in sorted(d, key=lambda cq: cq[0])] for d in dropped]
+
+
+class VectorIndex:
+    """
+    Append-only on-disk index of raw hashed vectors (float16) keyed by question_texts.id.
+    Document frequencies are kept alongside so queries are weighted with corpus IDF.
+    Reads go through np.memmap in chunks, so the index never has to fit in memory.
+    """
+
+    def __init__(self, path: str = None, dim: int = None):
+        self.path = path or VECTOR_INDEX_DIR
+        os.makedirs(self.path, exist_ok=True)
+        self._meta_path = os.path.join(self.path, "meta.json")
+        self._vectors_path = os.path.join(self.path, "vectors.f16")
+        self._ids_path = os.path.join(self.path, "ids.i64")
+        self._df_path = os.path.join(self.path, "df.npy")
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if dim and dim != self.meta["dim"]:
+                raise ValueError(f"index at {self.path} has dim {self.meta['dim']}, not {dim}")
+            self.df = np.load(self._df_path)
+        else:
+            self.meta = {"dim": dim or VECTOR_DIM, "count": 0, "last_source_id": 0}
+            self.df = np.zeros(self.meta["dim"], dtype=np.int64)
+
+    @property
+    def dim(self):
+        return self.meta["dim"]
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def idf(self):
+        return (np.log((1.0 + len(self)) / (1.0 + self.df)) + 1.0).astype(np.float32)
+
+    def add(self, ids, raw_vectors, last_source_id: int = None):
+        """
+        Append raw (unweighted) vectors from hash_vectors. The count in meta.json is written
+        last, so a crash mid-append leaves the previous index intact.
+        """
+        raw_vectors = np.asarray(raw_vectors, dtype=np.float32)
+        if not len(raw_vectors):
+            return
+        count = len(self)
+        with open(self._vectors_path, "r+b" if os.path.exists(self._vectors_path) else "wb") as f:
+            f.seek(count * self.dim * 2)
+            f.write(raw_vectors.astype(np.float16).tobytes())
+        with open(self._ids_path, "r+b" if os.path.exists(self._ids_path) else "wb") as f:
+            f.seek(count * 8)
+            f.write(np.asarray(ids, dtype=np.int64).tobytes())
+        self.df += (raw_vectors != 0).sum(axis=0)
+        np.save(self._df_path, self.df)
+        self.meta["count"] = count + len(raw_vectors)
+        if last_source_id is not None:
+            self.meta["last_source_id"] = int(last_source_id)
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def ids(self):
+        if not len(self):
+            return np.zeros(0, dtype=np.int64)
+        return np.memmap(self._ids_path, dtype=np.int64, mode="r", shape=(len(self),))
+
+    def _rows(self, start: int, end: int, idf):
+        vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r", shape=(len(self), self.dim))
+        return np.asarray(self.ids()[start:end]), weight(np.asarray(vectors[start:end], dtype=np.float32), idf)
+
+    def chunks(self, chunk_rows: int = 8192, idf=None):
+        """
+        Yields (start_row, ids, weighted vectors) over the whole index.
+        """
+        idf = self.idf() if idf is None else idf
+        for start in range(0, len(self), chunk_rows):
+            yield (start,) + self._rows(start, min(len(self), start + chunk_rows), idf)
+
+    def search(self, texts, k: int = 5, threshold: float = 0.0, chunk_rows: int = 8192):
+        """
+        Top-k indexed (id, score) pairs per text with score >= threshold.
+        """
+        idf = self.idf()
+        queries = weight(hash_vectors(texts, self.dim), idf)
+        best_scores = np.full((len(texts), 0), -1.0, dtype=np.float32)
+        best_ids = np.zeros((len(texts), 0), dtype=np.int64)
+        for _, ids, vectors in self.chunks(chunk_rows, idf):
+            scores = queries @ vectors.T
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_ids = np.concatenate([best_ids, np.broadcast_to(ids, scores.shape)], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_ids = np.take_along_axis(best_ids, top, axis=1)
+        out = []
+        for scores, ids in zip(best_scores, best_ids):
+            order = np.argsort(-scores)
+            out.append([(int(ids[j]), float(scores[j])) for j in order if scores[j] >= threshold])
+        return out
+
+    def near_duplicate_pairs(self, threshold: float = None, chunk_rows: int = 4096):
+        """
+        Yields (id_a, id_b, score) for every indexed pair at or above threshold (a indexed before b).
+        Exact, blocked all-pairs similarity: each chunk is compared with itself and every earlier chunk.
+        """
+        threshold = DEDUP_THRESHOLD if threshold is None else threshold
+        idf = self.idf()
+        for start, ids, vectors in self.chunks(chunk_rows, idf):
+            sims = vectors @ vectors.T
+            for i, j in zip(*np.nonzero(np.triu(sims >= threshold, k=1))):
+                yield int(ids[i]), int(ids[j]), float(sims[i, j])
+            for prev in range(0, start, chunk_rows):
+                prev_ids, prev_vectors = self._rows(prev, prev + chunk_rows, idf)
+                sims = prev_vectors @ vectors.T
+                for i, j in zip(*np.nonzero(sims >= threshold)):
+                    yield int(prev_ids[i]), int(ids[j]), float(sims[i, j])
+
+
+def update_index(index: VectorIndex = None, batch_size: int = 5000):
+    """
+    Index every question_texts row added since the last run. Returns the number of rows added.
+    """
+    from sqlalchemy import select # type: ignore
+    from backend.models import QuestionText
+    from backend.storage import SessionLocal
+
+    index = VectorIndex() if index is None else index
+    added = 0
+    session = SessionLocal()
+    try:
+        while True:
+            rows = session.execute(
+                select(QuestionText.id, QuestionText.text)
+                .where(QuestionText.id > index.meta["last_source_id"])
+                .order_by(QuestionText.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return added
+            index.add([r[0] for r in rows], hash_vectors([r[1] for r in rows], index.dim), last_source_id=rows[-1][0])
+            added += len(rows)
+            logger.info("Indexed %d questions", added)
+    finally:
+        session.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate detection over stored questions.")
+    parser.add_argument("--index", default=VECTOR_INDEX_DIR, help="index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="index questions added since the last run")
+    dup = sub.add_parser("duplicates", help="write near-duplicate question pairs as JSONL")
+    dup.add_argument("--threshold", type=float, default=DEDUP_THRESHOLD)
+    dup.add_argument("--out", default="-")
+    check = sub.add_parser("check", help="show the closest stored questions for a text")
+    check.add_argument("text")
+    check.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    index = VectorIndex(args.index)
+    if args.command == "index":
+        print(f"Indexed {update_index(index)} new questions ({len(index)} total).")
+    elif args.command == "duplicates":
+        out = open(args.out, "w", encoding="utf-8") if args.out != "-" else None
+        try:
+            n = 0
+            for a, b, score in index.near_duplicate_pairs(args.threshold):
+                line = json.dumps({"question_id": a, "duplicate_id": b, "score": round(score, 4)})
+                print(line, file=out or sys.stdout)
+                n += 1
+        finally:
+            if out:
+                out.close()
+        logger.info("%d near-duplicate pairs", n)
+    elif args.command == "check":
+        for question_id, score in index.search([args.text], k=args.k)[0]:
+            print(f"{score:.3f}  {question_id}")
+
+
+if __name__ == "__main__":
+    main()
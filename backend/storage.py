@@ -1,90 +1,953 @@
 # backend/storage.py
 import os
+import re
+import copy
 import json
+import queue
+import hashlib
+import atexit
+import logging
 from pathlib import Path
-from sqlalchemy import create_engine # type: ignore
-from sqlalchemy.orm import sessionmaker # type: ignore
-from backend.models import Base, Candidate, QuestionBlock
+import threading
+from itertools import groupby
+from concurrent.futures import Future
+from sqlalchemy import create_engine, event, insert, inspect, select, update, func, or_, and_ # type: ignore
+from sqlalchemy.orm import sessionmaker, selectinload # type: ignore
+from backend import metrics
+from backend.cache import normalize_tech_key
+from backend.models import Base, Candidate, CandidateTech, QuestionBlock, QuestionText, QuestionBlockItem, QuestionRollup
+from backend.utils import fallback_generate_questions, split_tech_stack
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 DB_FILE = os.getenv("TALENTSCOUT_DB", "talentscout.db")
-DB_URL = f"sqlite:///{DB_FILE}"
+DB_URL = os.getenv("DATABASE_URL") or f"sqlite:///{DB_FILE}"
+
+# SQLite tuning (ignored for other backends)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("TALENTSCOUT_DB_BUSY_TIMEOUT_MS", "10000"))
+SQLITE_SYNCHRONOUS = os.getenv("TALENTSCOUT_DB_SYNCHRONOUS", "NORMAL")  # WAL + NORMAL is durable across app crashes
+SQLITE_CACHE_KB = int(os.getenv("TALENTSCOUT_DB_CACHE_KB", "20000"))
+SQLITE_MMAP_BYTES = int(os.getenv("TALENTSCOUT_DB_MMAP_BYTES", str(128 * 1024 * 1024)))
+DB_POOL_SIZE = int(os.getenv("TALENTSCOUT_DB_POOL_SIZE", "8"))
+
+# Funnel writes through one background thread that commits queued saves together
+GROUP_COMMIT = os.getenv("TALENTSCOUT_GROUP_COMMIT", "1") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("TALENTSCOUT_GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("TALENTSCOUT_GROUP_COMMIT_WINDOW_MS", "2"))
 
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+STORAGE_METRIC = "talentscout_storage_seconds"
 
-# Create tables (idempotent)
-Base.metadata.create_all(bind=engine)
+def _sqlite_on_connect(dbapi_connection, connection_record):
+    # let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+    cursor.close()
 
-def save_candidate_with_questions(candidate: dict, question_blocks: list):
+def _sqlite_on_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+def make_engine(url: str = None):
     """
-    candidate: dict with keys full_name, email, phone, years_experience, desired_position, location, tech_stack_raw
-    question_blocks: list of {"technology": "...", "difficulty": "...", "questions": [...]}
+    Build an engine for url (default DB_URL). SQLite gets WAL, tuned pragmas and a
+    thread-shareable connection pool; other backends use SQLAlchemy defaults.
     """
-    session = SessionLocal()
-    try:
-        c = Candidate(
-            full_name=candidate.get("full_name"),
-            email=candidate.get("email"),
-            phone=candidate.get("phone"),
-            years_experience=candidate.get("years_experience"),
-            desired_position=candidate.get("desired_position"),
-            location=candidate.get("location"),
-            tech_stack_raw=candidate.get("tech_stack_raw"),
-            created_at=datetime.utcnow()
+    url = url or DB_URL
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True)
+    eng = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_POOL_SIZE,
+    )
+    event.listen(eng, "connect", _sqlite_on_connect)
+    event.listen(eng, "begin", _sqlite_on_begin)
+    return eng
+
+# The engine, schema and search index are created on first use (init_db), not at import,
+# so importing this module never opens or creates the database file.
+_engine = None
+_init_lock = threading.RLock()
+_initialized = False
+_initializing = False
+
+class _LazySessionmaker(sessionmaker):
+    """
+    sessionmaker that runs init_db() before handing out its first session.
+    """
+
+    def __call__(self, **local_kw):
+        if not _initialized:
+            init_db()
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                _engine = make_engine()
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+def __getattr__(name):
+    # storage.engine keeps working for callers that attach event listeners or open connections
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def init_db():
+    """
+    Create the engine, tables (idempotent), any missing indexes, the full-text index and (for
+    older files) the technology index and reporting rollups.
+    Runs once per process; the first SessionLocal() calls it implicitly. Returns the engine.
+    """
+    global _initialized, _initializing, SEARCH_ENABLED
+    if _initialized:
+        return _engine
+    with _init_lock:
+        if _initialized or _initializing:  # re-entered from the search index rebuild below
+            return get_engine()
+        _initializing = True
+        try:
+            eng = get_engine()
+            existing = set(inspect(eng).get_table_names())
+            Base.metadata.create_all(bind=eng)
+            _ensure_indexes(eng)
+            SEARCH_ENABLED = _fts_available(eng)
+            _ensure_search_index(eng)
+            if Candidate.__tablename__ in existing and CandidateTech.__tablename__ not in existing:
+                rebuild_tech_index()  # database from before the tech index existed
+            if QuestionBlock.__tablename__ in existing and QuestionRollup.__tablename__ not in existing:
+                rebuild_rollups()  # database from before the rollups existed
+            _initialized = True
+        finally:
+            _initializing = False
+    return eng
+
+def _ensure_indexes(eng):
+    """
+    create_all only builds indexes together with new tables; add any that older DB files lack.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=eng, checkfirst=True)
+
+# Full-text search over candidates and their questions (SQLite FTS5). rowid is the candidate id.
+SEARCH_TABLE = "candidate_search"
+SEARCH_COLUMNS = ("full_name", "desired_position", "location", "tech_stack_raw", "questions")
+SEARCH_WEIGHTS = (10.0, 5.0, 2.0, 5.0, 1.0)  # bm25 column weights, same order as SEARCH_COLUMNS
+SEARCH_ENABLED = False  # set by init_db()
+
+def _fts_available(eng):
+    if eng.dialect.name != "sqlite":
+        return False
+    with eng.connect() as conn:
+        options = [row[0] for row in conn.exec_driver_sql("PRAGMA compile_options").fetchall()]
+    return "ENABLE_FTS5" in options
+
+def _ensure_search_index(eng):
+    if not SEARCH_ENABLED:
+        return
+    with eng.begin() as conn:
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)
+        ).first()
+        if exists:
+            return
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            f"{', '.join(SEARCH_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
         )
-        session.add(c)
-        session.flush()  # obtain c.id
+    rebuild_search_index()
+
+def _search_rows(pairs):
+    """
+    pairs: list of (Candidate, question_blocks) -> rows for the FTS table.
+    """
+    rows = []
+    for c, question_blocks in pairs:
+        questions = "\n".join(str(q) for block in question_blocks for q in (block.get("questions") or []))
+        rows.append((c.id, c.full_name or "", c.desired_position or "", c.location or "", c.tech_stack_raw or "", questions))
+    return rows
+
+def _index_candidates(session, pairs):
+    if not SEARCH_ENABLED or not pairs:
+        return
+    session.connection().exec_driver_sql(
+        f"INSERT OR REPLACE INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+        _search_rows(pairs),
+    )
+
+def _tech_rows(candidates):
+    rows = []
+    for c in candidates:
+        for key in dict.fromkeys(normalize_tech_key(t) for t in split_tech_stack(c.tech_stack_raw or "")):
+            if key:
+                rows.append({"tech_key": key[:128], "candidate_id": c.id})
+    return rows
+
+def _index_techs(session, candidates):
+    rows = _tech_rows(candidates)
+    if rows:
+        session.execute(insert(CandidateTech), rows)
+
+# Read model for the Recent view: page results cached per (limit, cursor) and dropped on every write.
+# Entries also carry the newest candidate id they saw, so writes from other processes
+# (e.g. a bulk import) invalidate them through one indexed MAX(id) lookup.
+_read_cache = {}
+_read_cache_lock = threading.Lock()
+
+def _invalidate_read_cache():
+    with _read_cache_lock:
+        _read_cache.clear()
+
+def _candidate_from_dict(candidate: dict, created_at=None):
+    return Candidate(
+        full_name=candidate.get("full_name"),
+        email=candidate.get("email"),
+        phone=candidate.get("phone"),
+        years_experience=candidate.get("years_experience"),
+        desired_position=candidate.get("desired_position"),
+        location=candidate.get("location"),
+        tech_stack_raw=candidate.get("tech_stack_raw"),
+        created_at=created_at or datetime.utcnow()
+    )
+
+def question_hash(text: str):
+    """
+    Content hash used to dedupe questions: sha256 of the text with whitespace collapsed.
+    """
+    normalized = " ".join(str(text).split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def _dialect_insert(model):
+    # INSERT with ON CONFLICT support on the dialects that have it, else None
+    dialect = get_engine().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert # type: ignore
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert # type: ignore
+    else:
+        return None
+    return dialect_insert(model)
+
+def _insert_ignore(model, *keys: str):
+    # INSERT that skips rows violating the unique `keys` (another process may have added them)
+    stmt = _dialect_insert(model)
+    if stmt is None:
+        return insert(model)
+    return stmt.on_conflict_do_nothing(index_elements=list(keys))
+
+def _intern_questions(session, texts):
+    """
+    Returns {content_hash: question_texts.id} for texts, inserting the ones not stored yet.
+    """
+    by_hash = {}
+    for t in texts:
+        by_hash.setdefault(question_hash(t), str(t).strip())
+    hashes = list(by_hash)
+
+    def lookup(keys):
+        found = {}
+        for i in range(0, len(keys), 500):
+            found.update(session.execute(
+                select(QuestionText.content_hash, QuestionText.id).where(QuestionText.content_hash.in_(keys[i:i + 500]))
+            ).all())
+        return found
+
+    ids = lookup(hashes)
+    new = [h for h in hashes if h not in ids]
+    if new:
+        now = datetime.utcnow()
+        session.execute(_insert_ignore(QuestionText, "content_hash"),
+                        [{"content_hash": h, "text": by_hash[h], "created_at": now} for h in new])
+        ids.update(lookup(new))
+    return ids
+
+def _clean_questions(questions):
+    return [str(q).strip() for q in (questions or []) if q is not None and str(q).strip()]
 
+def _link_block_items(session, blocks):
+    """
+    blocks: list of (QuestionBlock with id, list of question texts). Writes the ordered item rows.
+    """
+    ids = _intern_questions(session, [q for _, qs in blocks for q in qs])
+    rows = [
+        {
+            "block_id": qb.id,
+            "position": position,
+            "question_id": ids[question_hash(q)],
+            "candidate_id": qb.candidate_id,
+            "technology": qb.technology,
+        }
+        for qb, qs in blocks
+        for position, q in enumerate(qs)
+    ]
+    if rows:
+        session.execute(insert(QuestionBlockItem), rows)
+
+def _insert_question_blocks(session, per_candidate, created_at=None):
+    """
+    per_candidate: list of (candidate_id, question_blocks). Blocks and their normalized
+    question links are written with batched inserts.
+    """
+    created_at = created_at or datetime.utcnow()
+    pending = []
+    for candidate_id, question_blocks in per_candidate:
         for block in question_blocks:
             qb = QuestionBlock(
-                candidate_id=c.id,
+                candidate_id=candidate_id,
                 technology=block.get("technology"),
                 difficulty=block.get("difficulty", "medium"),
-                questions_json=json.dumps(block.get("questions", [])),
-                created_at=datetime.utcnow()
+                created_at=created_at
             )
-            session.add(qb)
+            pending.append((qb, _clean_questions(block.get("questions", []))))
+    if not pending:
+        return
+    session.add_all([qb for qb, _ in pending])
+    session.flush()  # obtain block ids
+    _link_block_items(session, pending)
+    counts = {}
+    for qb, qs in pending:
+        _count_rollup(counts, created_at.date(), qb.technology, qb.difficulty, qs)
+    _add_rollups(session, counts)
+
+# Reporting rollups: per-day x technology x difficulty counters, added to in the saving transaction.
+ROLLUP_KEYS = ("day", "tech_key", "difficulty")
+ROLLUP_COUNTERS = ("blocks", "questions", "fallback_blocks")
+
+def is_fallback_block(technology: str, difficulty: str, questions: list):
+    """
+    True when questions are exactly what utils.fallback_generate_questions returns for the
+    technology (its templates are deterministic), i.e. neither the LLM nor the bank answered.
+    """
+    return bool(questions) and questions == fallback_generate_questions([technology], difficulty)[0]["questions"]
+
+def _count_rollup(counts, day, technology, difficulty, questions):
+    key = (day, (normalize_tech_key(technology or "") or "unknown")[:128], difficulty or "medium")
+    c = counts.setdefault(key, [0, 0, 0])
+    c[0] += 1
+    c[1] += len(questions)
+    c[2] += is_fallback_block(technology, difficulty, questions)
+
+def _add_rollups(session, counts):
+    rows = [dict(zip(ROLLUP_KEYS + ROLLUP_COUNTERS, key + tuple(c))) for key, c in counts.items()]
+    if not rows:
+        return
+    stmt = _dialect_insert(QuestionRollup)
+    if stmt is not None:
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEYS),
+            set_={c: getattr(QuestionRollup, c) + getattr(stmt.excluded, c) for c in ROLLUP_COUNTERS},
+        ), rows)
+        return
+    for row in rows:  # portable path: add to the existing row, insert when there is none
+        where = [getattr(QuestionRollup, k) == row[k] for k in ROLLUP_KEYS]
+        added = {c: getattr(QuestionRollup, c) + row[c] for c in ROLLUP_COUNTERS}
+        if not session.execute(update(QuestionRollup).where(*where).values(added)).rowcount:
+            session.execute(insert(QuestionRollup), [row])
+
+def _block_rows_questions(rows):
+    """
+    Question texts of one block from its rows in a questions LEFT JOIN question_block_items
+    LEFT JOIN question_texts scan (columns `text` and `questions_json`), in position order.
+    """
+    texts = [r.text for r in rows if r.text is not None]
+    if texts or not rows[0].questions_json:
+        return texts
+    try:
+        legacy = json.loads(rows[0].questions_json)
+    except ValueError:
+        return []
+    return _clean_questions(legacy) if isinstance(legacy, list) else []
+
+class GroupCommitWriter:
+    """
+    Single background writer thread. Callers submit fn(session) and block on the returned Future;
+    the thread drains whatever is queued (up to max_batch, waiting at most window_ms for stragglers),
+    runs each fn inside its own SAVEPOINT and commits the whole group once, so concurrent
+    submissions share a single fsync and never contend for SQLite's write lock.
+    """
+
+    def __init__(self, session_factory, max_batch: int = None, window_ms: float = None, on_commit=None):
+        self.session_factory = session_factory
+        self.max_batch = max_batch or GROUP_COMMIT_MAX_BATCH
+        self.window = (GROUP_COMMIT_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.on_commit = on_commit
+        self.batches = 0
+        self.writes = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn):
+        future = Future()
+        self._ensure_started()
+        self._queue.put((fn, future))
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="talentscout-db-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=self.window) if self.window else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # re-deliver the stop signal after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            if batch is None:
+                return
+            self._write_batch(batch)
 
+    def _write_batch(self, batch):
+        session = self.session_factory()
+        results = []
+        try:
+            for fn, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        results.append((future, fn(session)))
+                except Exception as e:
+                    future.set_exception(e)
+            with metrics.span(STORAGE_METRIC, op="group_commit"):
+                session.commit()
+        except Exception as e:
+            session.rollback()
+            for future, _ in results:
+                future.set_exception(e)
+            return
+        finally:
+            session.close()
+        self.batches += 1
+        self.writes += len(results)
+        if self.on_commit:
+            self.on_commit()
+        for future, result in results:
+            future.set_result(result)
+
+    def stop(self, timeout: float = 5):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+_writer = GroupCommitWriter(SessionLocal, on_commit=lambda: _invalidate_read_cache())
+atexit.register(_writer.stop)
+metrics.register_gauge("talentscout_group_commit_batches", lambda: _writer.batches, "Group-commit transactions written.")
+metrics.register_gauge("talentscout_group_commit_writes", lambda: _writer.writes, "Writes committed through group commit.")
+
+def run_write(fn):
+    """
+    Run fn(session) in a committed transaction: through the group-commit writer when enabled,
+    otherwise in a dedicated session on the calling thread. Other backend modules write through this.
+    """
+    if GROUP_COMMIT:
+        return _writer.submit(fn).result()
+    session = SessionLocal()
+    try:
+        result = fn(session)
         session.commit()
-        return c.id
     except Exception:
         session.rollback()
         raise
     finally:
         session.close()
+    _invalidate_read_cache()
+    return result
+
+def _insert_candidate(session, candidate: dict, question_blocks: list):
+    c = _candidate_from_dict(candidate)
+    session.add(c)
+    session.flush()  # obtain c.id
+
+    _insert_question_blocks(session, [(c.id, question_blocks)])
+    _index_candidates(session, [(c, question_blocks)])
+    _index_techs(session, [c])
+    return c.id
+
+def _insert_candidates_bulk(session, items: list):
+    now = datetime.utcnow()
+    candidates = [_candidate_from_dict(candidate, created_at=now) for candidate, _ in items]
+    session.add_all(candidates)
+    session.flush()  # batched INSERT ... RETURNING for the candidate ids
+
+    _insert_question_blocks(session, [(c.id, question_blocks) for c, (_, question_blocks) in zip(candidates, items)], created_at=now)
+    _index_candidates(session, [(c, question_blocks) for c, (_, question_blocks) in zip(candidates, items)])
+    _index_techs(session, candidates)
+    return [c.id for c in candidates]
+
+@metrics.timed(STORAGE_METRIC, op="save_candidate_with_questions")
+def save_candidate_with_questions(candidate: dict, question_blocks: list, after_insert=None):
+    """
+    candidate: dict with keys full_name, email, phone, years_experience, desired_position, location, tech_stack_raw
+    question_blocks: list of {"technology": "...", "difficulty": "...", "questions": [...]}
+    after_insert: optional fn(session, candidate_id) run in the same transaction (e.g. to mark a job done)
+    """
+    def write(session):
+        candidate_id = _insert_candidate(session, candidate, question_blocks)
+        if after_insert is not None:
+            after_insert(session, candidate_id)
+        return candidate_id
+
+    return run_write(write)
+
+@metrics.timed(STORAGE_METRIC, op="save_candidates_bulk")
+def save_candidates_bulk(items: list, chunk_size: int = 500, after_insert=None):
+    """
+    Bulk variant of save_candidate_with_questions.
+    items: list of (candidate_dict, question_blocks) pairs.
+    Each chunk of chunk_size candidates is written in one transaction with multi-row inserts.
+    after_insert: optional fn(session, start, candidate_ids) run in each chunk's transaction,
+    where start is the chunk's offset into items.
+    Returns the new candidate ids in input order.
+    """
+    def write(session, chunk, start):
+        candidate_ids = _insert_candidates_bulk(session, chunk)
+        if after_insert is not None:
+            after_insert(session, start, candidate_ids)
+        return candidate_ids
+
+    ids = []
+    for i in range(0, len(items), chunk_size):
+        chunk = items[i:i + chunk_size]
+        ids.extend(run_write(lambda session, chunk=chunk, start=i: write(session, chunk, start)))
+    return ids
 
+def _block_questions(b):
+    if b.items:
+        return [item.question.text for item in b.items]
+    # rows written before normalization and not migrated yet
+    return json.loads(b.questions_json or "[]")
+
+def _candidate_fields(c):
+    return {
+        "id": c.id,
+        "full_name": c.full_name,
+        "email": c.email,
+        "phone": c.phone,
+        "years_experience": c.years_experience,
+        "desired_position": c.desired_position,
+        "location": c.location,
+        "tech_stack_raw": c.tech_stack_raw,
+        "created_at": c.created_at.isoformat()
+    }
+
+def _candidate_to_dict(c):
+    return {
+        "candidate": _candidate_fields(c),
+        "question_blocks": [
+            {
+                "technology": b.technology,
+                "difficulty": b.difficulty,
+                "questions": _block_questions(b),
+                "created_at": b.created_at.isoformat()
+            }
+            for b in c.questions
+        ]
+    }
+
+def encode_cursor(created_at: str, candidate_id: int):
+    return f"{created_at}|{candidate_id}"
+
+def decode_cursor(cursor: str):
+    created_at, _, candidate_id = cursor.rpartition("|")
+    return datetime.fromisoformat(created_at), int(candidate_id)
+
+@metrics.timed(STORAGE_METRIC, op="load_recent_page")
+def load_recent_page(limit=10, cursor=None):
+    """
+    Keyset-paginated Recent view, newest first.
+    Returns {"items": [...same shape as load_recent_with_questions...], "next_cursor": str or None};
+    pass next_cursor back to get the following page. Cost is independent of table size and page depth.
+    Pages are cached until the newest candidate id changes (a write from any process); callers
+    get their own copy.
+    """
+    session = SessionLocal()
+    try:
+        newest_id = session.query(func.max(Candidate.id)).scalar()
+        key = (limit, cursor)
+        with _read_cache_lock:
+            hit = _read_cache.get(key)
+        if hit is not None and hit[0] == newest_id:
+            return copy.deepcopy(hit[1])
+
+        q = session.query(Candidate).options(selectinload(Candidate.questions).selectinload(QuestionBlock.items))
+        if cursor:
+            created_at, candidate_id = decode_cursor(cursor)
+            q = q.filter(or_(
+                Candidate.created_at < created_at,
+                and_(Candidate.created_at == created_at, Candidate.id < candidate_id),
+            ))
+        rows = q.order_by(Candidate.created_at.desc(), Candidate.id.desc()).limit(limit + 1).all()
+        items = [_candidate_to_dict(c) for c in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]["candidate"]
+            next_cursor = encode_cursor(last["created_at"], last["id"])
+        page = {"items": items, "next_cursor": next_cursor}
+        with _read_cache_lock:
+            if len(_read_cache) >= 256:
+                _read_cache.clear()
+            _read_cache[key] = (newest_id, copy.deepcopy(page))
+        return page
+    finally:
+        session.close()
+
+@metrics.timed(STORAGE_METRIC, op="load_recent_with_questions")
 def load_recent_with_questions(limit=10):
     """
     Returns list of dicts: [{candidate: {...}, question_blocks: [{...}, ...]}, ...]
     """
+    return load_recent_page(limit=limit)["items"]
+
+@metrics.timed(STORAGE_METRIC, op="load_candidate_with_questions")
+def load_candidate_with_questions(candidate_id: int):
+    """
+    Single candidate in the same shape as load_recent_with_questions items, or None.
+    """
     session = SessionLocal()
     try:
-        q = session.query(Candidate).order_by(Candidate.created_at.desc()).limit(limit).all()
-        results = []
-        for c in q:
-            blocks = []
-            for b in c.questions:
-                blocks.append({
-                    "technology": b.technology,
-                    "difficulty": b.difficulty,
-                    "questions": json.loads(b.questions_json or "[]"),
-                    "created_at": b.created_at.isoformat()
-                })
-            results.append({
-                "candidate": {
-                    "id": c.id,
-                    "full_name": c.full_name,
-                    "email": c.email,
-                    "phone": c.phone,
-                    "years_experience": c.years_experience,
-                    "desired_position": c.desired_position,
-                    "location": c.location,
-                    "tech_stack_raw": c.tech_stack_raw,
-                    "created_at": c.created_at.isoformat()
-                },
-                "question_blocks": blocks
+        c = (session.query(Candidate)
+             .options(selectinload(Candidate.questions).selectinload(QuestionBlock.items))
+             .filter(Candidate.id == candidate_id)
+             .one_or_none())
+        return _candidate_to_dict(c) if c is not None else None
+    finally:
+        session.close()
+
+@metrics.timed(STORAGE_METRIC, op="top_questions")
+def top_questions(technology: str = None, limit: int = 20):
+    """
+    Most frequently served questions, optionally for one technology.
+    Returns [{"question": str, "times_used": int, "candidates": int}, ...].
+    """
+    session = SessionLocal()
+    try:
+        q = (session.query(QuestionText.text,
+                           func.count(QuestionBlockItem.block_id),
+                           func.count(func.distinct(QuestionBlockItem.candidate_id)))
+             .join(QuestionBlockItem, QuestionBlockItem.question_id == QuestionText.id))
+        if technology:
+            q = q.filter(QuestionBlockItem.technology == technology)
+        rows = (q.group_by(QuestionText.id)
+                .order_by(func.count(QuestionBlockItem.block_id).desc())
+                .limit(limit)
+                .all())
+        return [{"question": text, "times_used": used, "candidates": candidates} for text, used, candidates in rows]
+    finally:
+        session.close()
+
+def migrate_legacy_questions(batch_size: int = 500):
+    """
+    Move questions stored as JSON text in questions.questions_json into the normalized
+    question_texts / question_block_items tables. Idempotent and resumable: each batch of
+    blocks is committed on its own and migrated blocks have questions_json cleared.
+    Returns the number of blocks migrated.
+    """
+    migrated = 0
+    last_id = 0
+    while True:
+        session = SessionLocal()
+        try:
+            blocks = (session.query(QuestionBlock)
+                      .filter(QuestionBlock.questions_json.isnot(None), QuestionBlock.id > last_id)
+                      .order_by(QuestionBlock.id)
+                      .limit(batch_size)
+                      .all())
+            if not blocks:
+                break
+            linked = {block_id for (block_id,) in session.query(QuestionBlockItem.block_id)
+                      .filter(QuestionBlockItem.block_id.in_([qb.id for qb in blocks])).distinct()}
+            pending = []
+            done_ids = []
+            for qb in blocks:
+                try:
+                    questions = json.loads(qb.questions_json or "[]")
+                except ValueError:
+                    logger.warning("Block %s has unreadable questions_json; leaving it in place", qb.id)
+                    continue
+                if qb.id not in linked:
+                    pending.append((qb, _clean_questions(questions if isinstance(questions, list) else [])))
+                done_ids.append(qb.id)
+            _link_block_items(session, pending)
+            session.execute(update(QuestionBlock)
+                            .where(QuestionBlock.id.in_(done_ids))
+                            .values(questions_json=None))
+            session.commit()
+            migrated += len(pending)
+            last_id = blocks[-1].id
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    if migrated:
+        _invalidate_read_cache()
+    return migrated
+
+def rebuild_search_index(batch_size: int = 1000):
+    """
+    (Re)build the full-text index from the candidates and questions tables. Returns rows indexed.
+    """
+    init_db()
+    if not SEARCH_ENABLED:
+        return 0
+    indexed = 0
+    last_id = 0
+    session = SessionLocal()
+    try:
+        session.connection().exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+        while True:
+            batch = (session.query(Candidate)
+                     .options(selectinload(Candidate.questions).selectinload(QuestionBlock.items))
+                     .filter(Candidate.id > last_id)
+                     .order_by(Candidate.id)
+                     .limit(batch_size)
+                     .all())
+            if not batch:
+                break
+            _index_candidates(session, [(c, [{"questions": _block_questions(b)} for b in c.questions]) for c in batch])
+            indexed += len(batch)
+            last_id = batch[-1].id
+            session.expunge_all()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    return indexed
+
+def rebuild_tech_index(batch_size: int = 5000):
+    """
+    (Re)build the candidate_techs inverted index from tech_stack_raw, e.g. for rows saved before
+    the index existed or after the alias dictionary changed. Returns rows indexed.
+    """
+    indexed = 0
+    last_id = 0
+    session = SessionLocal()
+    try:
+        session.query(CandidateTech).delete()
+        while True:
+            batch = (session.query(Candidate.id, Candidate.tech_stack_raw)
+                     .filter(Candidate.id > last_id)
+                     .order_by(Candidate.id)
+                     .limit(batch_size)
+                     .all())
+            if not batch:
+                break
+            rows = _tech_rows(batch)
+            if rows:
+                session.execute(insert(CandidateTech), rows)
+            indexed += len(rows)
+            last_id = batch[-1].id
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    _invalidate_read_cache()
+    return indexed
+
+def rebuild_rollups(batch_size: int = 5000):
+    """
+    Recompute question_rollups from the questions table in one streamed pass (only the
+    aggregates are held in memory). Returns the number of rollup rows written.
+    """
+    counts = {}
+    session = SessionLocal()
+    try:
+        rows = session.execute(
+            select(QuestionBlock.id, QuestionBlock.technology, QuestionBlock.difficulty, QuestionBlock.created_at,
+                   QuestionBlock.questions_json, QuestionText.text)
+            .outerjoin(QuestionBlockItem, QuestionBlockItem.block_id == QuestionBlock.id)
+            .outerjoin(QuestionText, QuestionText.id == QuestionBlockItem.question_id)
+            .order_by(QuestionBlock.id, QuestionBlockItem.position)
+            .execution_options(yield_per=batch_size)
+        )
+        for _, block_rows in groupby(rows, key=lambda r: r.id):
+            block_rows = list(block_rows)
+            first = block_rows[0]
+            day = (first.created_at or datetime.utcnow()).date()
+            _count_rollup(counts, day, first.technology, first.difficulty, _block_rows_questions(block_rows))
+        session.query(QuestionRollup).delete()
+        _add_rollups(session, counts)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    return len(counts)
+
+def _rollup_filter(q, since=None, until=None, technology=None):
+    if since is not None:
+        q = q.filter(QuestionRollup.day >= since)
+    if until is not None:
+        q = q.filter(QuestionRollup.day <= until)
+    if technology:
+        q = q.filter(QuestionRollup.tech_key == normalize_tech_key(technology))
+    return q
+
+@metrics.timed(STORAGE_METRIC, op="load_rollups")
+def load_rollups(since=None, until=None, technology: str = None):
+    """
+    Rollup rows (dates inclusive), oldest first:
+    [{"day": "YYYY-MM-DD", "tech_key", "difficulty", "blocks", "questions", "fallback_blocks"}, ...]
+    """
+    session = SessionLocal()
+    try:
+        q = _rollup_filter(session.query(QuestionRollup), since, until, technology)
+        return [
+            {"day": r.day.isoformat(), "tech_key": r.tech_key, "difficulty": r.difficulty,
+             "blocks": r.blocks, "questions": r.questions, "fallback_blocks": r.fallback_blocks}
+            for r in q.order_by(QuestionRollup.day, QuestionRollup.tech_key, QuestionRollup.difficulty)
+        ]
+    finally:
+        session.close()
+
+@metrics.timed(STORAGE_METRIC, op="rollup_summary")
+def rollup_summary(since=None, until=None, top: int = 20):
+    """
+    Dashboard aggregates read from question_rollups only:
+    totals and fallback rate, difficulty mix, the `top` technologies by demand (blocks) with
+    their fallback rate, and those technologies' blocks per day.
+    """
+    session = SessionLocal()
+    try:
+        sums = [func.coalesce(func.sum(getattr(QuestionRollup, c)), 0) for c in ROLLUP_COUNTERS]
+        blocks, questions, fallback = _rollup_filter(session.query(*sums), since, until).one()
+        mix = dict(_rollup_filter(session.query(QuestionRollup.difficulty, sums[0]), since, until)
+                   .group_by(QuestionRollup.difficulty).all())
+        techs = (_rollup_filter(session.query(QuestionRollup.tech_key, sums[0], sums[2]), since, until)
+                 .group_by(QuestionRollup.tech_key)
+                 .order_by(sums[0].desc(), QuestionRollup.tech_key)
+                 .limit(top)
+                 .all())
+        by_day = []
+        if techs:
+            by_day = (_rollup_filter(session.query(QuestionRollup.day, QuestionRollup.tech_key, sums[0]), since, until)
+                      .filter(QuestionRollup.tech_key.in_([t for t, _, _ in techs]))
+                      .group_by(QuestionRollup.day, QuestionRollup.tech_key)
+                      .order_by(QuestionRollup.day, QuestionRollup.tech_key)
+                      .all())
+        return {
+            "blocks": blocks,
+            "questions": questions,
+            "fallback_blocks": fallback,
+            "fallback_rate": round(fallback / blocks, 4) if blocks else 0.0,
+            "difficulty_mix": mix,
+            "technologies": [{"tech_key": t, "blocks": b, "fallback_rate": round(f / b, 4) if b else 0.0}
+                             for t, b, f in techs],
+            "by_day": [{"day": d.isoformat(), "tech_key": t, "blocks": b} for d, t, b in by_day],
+        }
+    finally:
+        session.close()
+
+_FTS_TERM = re.compile(r"\w+", re.UNICODE)
+
+def _fts_query(text: str):
+    # every term must match; the last one as a prefix so results update while typing
+    terms = _FTS_TERM.findall(text or "")
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " AND ".join(quoted)
+
+@metrics.timed(STORAGE_METRIC, op="search_candidates")
+def search_candidates(query: str, limit: int = 20, offset: int = 0):
+    """
+    Ranked full-text search over candidate name, position, location, tech stack and question text.
+    Returns {"items": [{"candidate": {...}, "score": float, "snippet": str}, ...], "total": int}.
+    """
+    match = _fts_query(query)
+    if not match:
+        return {"items": [], "total": 0}
+    session = SessionLocal()
+    try:
+        conn = session.connection()
+        if SEARCH_ENABLED:
+            weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+            total = conn.exec_driver_sql(
+                f"SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?", (match,)
+            ).scalar()
+            hits = conn.exec_driver_sql(
+                f"SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS score, "
+                f"snippet({SEARCH_TABLE}, -1, '**', '**', ' … ', 12) "
+                f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ? ORDER BY score LIMIT ? OFFSET ?",
+                (match, limit, offset),
+            ).fetchall()
+        else:
+            # portable fallback for non-SQLite backends: substring match, newest first
+            like = f"%{query.strip()}%"
+            q = session.query(Candidate.id).filter(or_(*[getattr(Candidate, col).ilike(like) for col in SEARCH_COLUMNS[:-1]]))
+            total = q.count()
+            hits = [(cid, 0.0, "") for (cid,) in q.order_by(Candidate.id.desc()).limit(limit).offset(offset)]
+
+        by_id = {c.id: c for c in session.query(Candidate).filter(Candidate.id.in_([h[0] for h in hits]))}
+        items = []
+        for candidate_id, score, snippet in hits:
+            c = by_id.get(candidate_id)
+            if c is None:
+                continue
+            items.append({
+                "candidate": _candidate_fields(c),
+                "score": -score,  # bm25 is lower-is-better; expose higher-is-better
+                "snippet": snippet,
             })
-        return results
+        return {"items": items, "total": total}
     finally:
         session.close()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="TalentScout storage maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate-questions", help="normalize legacy questions_json rows")
+    sub.add_parser("rebuild-search", help="rebuild the full-text search index")
+    sub.add_parser("rebuild-tech-index", help="rebuild the technology -> candidate index")
+    sub.add_parser("rebuild-rollups", help="recompute the per-day reporting rollups")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "migrate-questions":
+        print(f"Migrated {migrate_legacy_questions()} question blocks.")
+    elif args.command == "rebuild-search":
+        print(f"Indexed {rebuild_search_index()} candidates.")
+    elif args.command == "rebuild-tech-index":
+        print(f"Indexed {rebuild_tech_index()} candidate technologies.")
+    elif args.command == "rebuild-rollups":
+        print(f"Wrote {rebuild_rollups()} rollup rows.")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 # backend/utils.py
 import re
 import json
+from backend.normalizer import get_default_normalizer
 
 # Map common shorthand/mistypes to normalized display names
+# (merged into the alias dictionary in backend/data/tech_aliases.json)
 COMMON_NORMALIZATIONS = {
     "pytho": "Python",
     "py": "Python",
@@ -23,31 +25,140 @@ COMMON_NORMALIZATIONS = {
 def split_tech_stack(text: str):
     """
     Split freeform tech stack text into a normalized, deduped list of tech names.
+    Normalization is delegated to backend.normalizer (alias dictionary + COMMON_NORMALIZATIONS).
     """
     if not text:
         return []
-    parts = re.split(r"[,\n;/|]+", text)
-    cleaned = []
-    seen = set()
-    for p in parts:
-        t = p.strip()
-        if not t:
-            continue
-        # remove stray punctuation except +, #, . (for c++, c#)
-        t = re.sub(r"[^\w\+\#\.\- ]+", "", t)
-        key = t.lower()
-        normalized = COMMON_NORMALIZATIONS.get(key)
-        if not normalized:
-            if key in {"sql"}:
-                normalized = "SQL"
-            elif key in {"go"}:
-                normalized = "Go"
-            else:
-                normalized = t.title()
-        if normalized not in seen:
-            cleaned.append(normalized)
-            seen.add(normalized)
-    return cleaned
+    return get_default_normalizer(extra_aliases=COMMON_NORMALIZATIONS).split(text)
+
+# One token per match: a complete string literal, a structural bracket, or a lone quote that
+# starts a string which has not been fully received yet. Everything else is skipped by the
+# regex engine, so a scan is a single linear pass that never mistakes "{}" inside a string for structure.
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]|"', re.S)
+_TRAILING_COMMA = re.compile(r'"(?:[^"\\]|\\.)*"|,(\s*[}\]])', re.S)
+_CODE_FENCE = re.compile(r"```(?:json|JSON)?[ \t]*\n?")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONExtractor:
+    """
+    Single-pass, string/escape-aware extractor for the first JSON object in LLM output.
+    Text can be fed in chunks (e.g. from a token stream); scanning resumes where it stopped.
+    If the text ends before the object closes, result() rebuilds it from the last complete
+    element so truncated output still yields the blocks that did arrive.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._start = None
+        self._end = None
+        self._stack = []
+        self._safe = None  # (offset after last complete element, open brackets at that point)
+
+    @property
+    def complete(self):
+        return self._end is not None
+
+    def feed(self, chunk: str):
+        """
+        Add text; returns True once the first object is complete.
+        """
+        if chunk and not self.complete:
+            self._buf += chunk
+            self._scan()
+        return self.complete
+
+    def _scan(self):
+        buf = self._buf
+        if self._start is None:
+            i = buf.find("{", self._pos)
+            # a code fence only counts when it opens before the object (a fence inside a
+            # string or after the closing brace is just text)
+            fence = _CODE_FENCE.search(buf, self._pos, i if i >= 0 else len(buf))
+            if fence:
+                i = buf.find("{", fence.end())
+            if i < 0:
+                # keep a short tail in case a fence marker is split across chunks
+                self._pos = max(0, len(buf) - 8)
+                return
+            self._start = self._pos = i
+        stack = self._stack
+        for m in _JSON_TOKEN.finditer(buf, self._pos):
+            tok = m.group()
+            c = tok[0]
+            if c == '"':
+                if len(tok) == 1:
+                    # unterminated string: resume from its opening quote on the next feed
+                    self._pos = m.start()
+                    return
+                if stack and stack[-1] == "[":
+                    self._safe = (m.end(), tuple(stack))
+            elif c in "{[":
+                stack.append(c)
+            elif stack:
+                stack.pop()
+                if not stack:
+                    self._end = self._pos = m.end()
+                    return
+                self._safe = (m.end(), tuple(stack))
+        self._pos = len(buf)
+
+    def blob(self):
+        """
+        The raw text of the first complete object. Raises ValueError if there is none.
+        """
+        if self._start is None:
+            raise ValueError("No JSON found in text")
+        if not self.complete:
+            raise ValueError("Unbalanced JSON braces in text")
+        return self._buf[self._start:self._end]
+
+    def result(self, repair: bool = True):
+        """
+        Parse and return the first object, repairing trailing commas and truncation if allowed.
+        """
+        if self._start is None:
+            raise ValueError("No JSON found in text")
+        if self.complete:
+            text = self._buf[self._start:self._end]
+        elif repair and self._safe is not None:
+            safe_end, open_brackets = self._safe
+            text = self._buf[self._start:safe_end].rstrip().rstrip(",")
+            text += "".join(_CLOSERS[b] for b in reversed(open_brackets))
+        else:
+            raise ValueError("Unbalanced JSON braces in text")
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            if not repair:
+                raise
+        fixed = _TRAILING_COMMA.sub(lambda m: m.group(1) if m.group(1) is not None else m.group(0), text)
+        try:
+            return json.loads(fixed)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Could not parse JSON from text: {e}") from e
+
+
+def extract_json(text: str, repair: bool = True):
+    """
+    Parse and return the first JSON object in a text blob (code fences, prose around it,
+    trailing commas and truncated endings are tolerated when repair=True).
+    Raises ValueError if no usable JSON object is found.
+    """
+    if not text or "{" not in text:
+        raise ValueError("No JSON found in text")
+    extractor = JSONExtractor()
+    # fast path: well-formed output decodes in one C-level pass
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(text, text.find("{"))
+        if isinstance(obj, dict):
+            return obj
+    except json.JSONDecodeError:
+        pass
+    extractor.feed(text)
+    return extractor.result(repair=repair)
+
 
 def extract_json_blob(text: str):
     """
@@ -56,19 +167,59 @@ def extract_json_blob(text: str):
     """
     if not text or "{" not in text:
         raise ValueError("No JSON found in text")
-    # naive but works for typical LLM outputs: find first '{' and matching '}' by scanning.
-    start = text.find("{")
-    # Find matching closing brace by counting braces
-    depth = 0
-    for i in range(start, len(text)):
-        if text[i] == "{":
-            depth += 1
-        elif text[i] == "}":
-            depth -= 1
-            if depth == 0:
-                end = i
-                return text[start:end+1]
-    raise ValueError("Unbalanced JSON braces in text")
+    extractor = JSONExtractor()
+    extractor.feed(text)
+    return extractor.blob()
+
+
+_ARRAY_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class StreamingBlockParser:
+    """
+    Incrementally pulls complete objects out of the "technology_questions" array of a JSON
+    document that is still being streamed, so each block can be used as soon as it closes.
+    """
+
+    def __init__(self, key: str = "technology_questions"):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self.done = False
+
+    def feed(self, chunk: str):
+        """
+        Add text and return the list of objects completed by it (possibly empty).
+        """
+        out = []
+        if self.done or not chunk:
+            return out
+        self._buf += chunk
+        if not self._in_array:
+            m = self._key_pattern.search(self._buf)
+            if not m:
+                return out
+            self._buf = self._buf[m.end():]
+            self._in_array = True
+        while True:
+            self._pos = _ARRAY_SEPARATORS.match(self._buf, self._pos).end()
+            if self._pos >= len(self._buf):
+                break
+            if self._buf[self._pos] == "]":
+                self.done = True
+                break
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                break  # element not complete yet; wait for more text
+            if isinstance(obj, dict):
+                out.append(obj)
+            # drop consumed text so the buffer only ever holds the element in progress
+            self._buf = self._buf[end:]
+            self._pos = 0
+        return out
 
 def format_questions_as_text(payload: dict):
     lines = []
@@ -0,0 +1,141 @@
+"""
+Benchmark: streaming export and rollup-backed reporting.
+
+Seeds a throwaway database with --candidates candidates (--techs blocks of --questions questions
+each, spread over --days days) and measures:
+
+    export     backend.export streaming candidates to NDJSON and questions to CSV: rows/s and
+               peak Python memory (tracemalloc), against loading everything through the ORM
+               first (selectinload + storage._candidate_to_dict), the way the per-session
+               download works for one candidate
+    reporting  storage.rollup_summary (reads question_rollups) against the same aggregates
+               computed by scanning questions / question_block_items
+
+Run: python benchmarks/bench_export.py [--candidates 20000] [--techs 6] [--questions 4]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+TECHS = ["Python", "Django", "React", "PostgreSQL", "Docker", "Kubernetes", "Go", "TypeScript", "Redis", "AWS",
+         "Kafka", "Terraform", "GraphQL", "Rust", "Java", "Spring Boot", "Node.js", "Vue.js", "Swift", "Scala"]
+
+
+class Sink:
+    """Text file object that only counts what is written."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text):
+        self.bytes += len(text)
+        return len(text)
+
+
+def seed(storage, rng, n, techs, questions, days):
+    from backend.utils import fallback_generate_questions
+    start = datetime.utcnow() - timedelta(days=days)
+    for offset in range(0, n, 1000):
+        items = []
+        for i in range(offset, min(n, offset + 1000)):
+            stack = rng.sample(TECHS, techs)
+            difficulty = rng.choice(["easy", "medium", "hard"])
+            blocks = [fallback_generate_questions([t], difficulty)[0] if rng.random() < 0.1 else
+                      {"technology": t, "difficulty": difficulty,
+                       "questions": [f"{t} question {rng.randrange(5000)} #{q}" for q in range(questions)]}
+                      for t in stack]
+            items.append(({"full_name": f"Export Bench {i}", "email": f"bench{i}@example.com",
+                           "tech_stack_raw": ", ".join(stack), "years_experience": rng.randrange(15)}, blocks))
+        storage.save_candidates_bulk(items, chunk_size=1000)
+    # spread created_at over the period so the per-day rollups have something to group
+    with storage.get_engine().begin() as conn:
+        conn.exec_driver_sql("UPDATE candidates SET created_at = datetime(?, '+' || (id % ?) || ' days')",
+                             (start.isoformat(sep=" "), days))
+        conn.exec_driver_sql("UPDATE questions SET created_at = (SELECT created_at FROM candidates c "
+                             "WHERE c.id = questions.candidate_id)")
+    return storage.rebuild_rollups()
+
+
+def measured(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--techs", type=int, default=6)
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="talentscout-bench-export-")
+    os.environ["TALENTSCOUT_DB"] = os.path.join(tmp, "talentscout.db")
+    os.environ["TALENTSCOUT_CACHE_DB"] = os.path.join(tmp, "talentscout_cache.db")
+    from sqlalchemy.orm import selectinload # type: ignore
+    from backend import export, storage
+    from backend.models import Candidate, QuestionBlock
+
+    started = time.perf_counter()
+    rollup_rows = seed(storage, random.Random(11), args.candidates, args.techs, args.questions, args.days)
+    total_questions = args.candidates * args.techs * args.questions
+    print(f"seeded {args.candidates} candidates, ~{total_questions} questions, {rollup_rows} rollup rows "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    count, elapsed, peak = measured(lambda: export.export("candidates", Sink(), "ndjson"))
+    print(f"export candidates ndjson: {count} records  {count / elapsed:,.0f}/s  peak {peak:.1f} MB")
+    count, elapsed, peak = measured(lambda: export.export("questions", Sink(), "csv"))
+    print(f"export questions csv:     {count} rows  {count / elapsed:,.0f}/s  peak {peak:.1f} MB")
+
+    def load_all():
+        session = storage.SessionLocal()
+        try:
+            rows = (session.query(Candidate)
+                    .options(selectinload(Candidate.questions).selectinload(QuestionBlock.items))
+                    .order_by(Candidate.id).all())
+            return len([storage._candidate_to_dict(c) for c in rows])
+        finally:
+            session.close()
+
+    count, elapsed, peak = measured(load_all)
+    print(f"load-all via ORM:         {count} records  {count / elapsed:,.0f}/s  peak {peak:.1f} MB")
+
+    def timed(fn):
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - t) * 1000)
+        times.sort()
+        return times[len(times) // 2]
+
+    scan_sql = [
+        "SELECT difficulty, COUNT(*) FROM questions GROUP BY difficulty",
+        "SELECT lower(technology), date(created_at), COUNT(*) FROM questions GROUP BY 1, 2",
+        "SELECT COUNT(*) FROM question_block_items",
+    ]
+
+    def scan():
+        with storage.get_engine().connect() as conn:
+            for sql in scan_sql:
+                conn.exec_driver_sql(sql).fetchall()
+
+    print(f"reporting: rollup_summary p50 {timed(storage.rollup_summary):.2f} ms  "
+          f"vs scanning questions p50 {timed(scan):.1f} ms (no fallback detection)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold-start cost of the backend modules that workers and short-lived batch jobs import.
+
+Each module is imported in a fresh interpreter under `python -X importtime`, several times, and
+the median cumulative import time is reported together with its heaviest dependencies. The run
+also checks that importing never creates the database file (the schema is set up by
+storage.init_db() on first use, not at import).
+
+Run:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --repeat 7 --budget backend.utils=20 --budget backend.jobs=800
+    python benchmarks/bench_import_time.py --json benchmarks/results/import_time.json
+
+A budget that is exceeded (median ms) exits non-zero.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+MODULES = [
+    "backend",
+    "backend.utils",
+    "backend.metrics",
+    "backend.normalizer",
+    "backend.api_client",
+    "backend.generator",
+    "backend.storage",
+    "backend.jobs",
+    "backend.bulk_import",
+    "backend.http_api",
+]
+
+
+def import_once(module: str, db_path: str):
+    """
+    Import `module` in a new interpreter. Returns ({imported module: cumulative us}, total us).
+    """
+    env = dict(os.environ, TALENTSCOUT_DB=db_path, TALENTSCOUT_CACHE_DB=db_path + ".cache", PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=tempfile.gettempdir(), env=env, capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative, cumulative.get(module, 0)
+
+
+def measure(module: str, repeat: int, startup=(), top: int = 5):
+    """
+    Median/min/max import time of `module` over `repeat` fresh interpreters, its heaviest
+    top-level dependencies (ignoring modules in `startup`, which load before any user code).
+    """
+    with tempfile.TemporaryDirectory(prefix="talentscout-importtime-") as tmp:
+        db_path = os.path.join(tmp, "talentscout.db")
+        totals, deps = [], {}
+        for _ in range(repeat):
+            cumulative, total = import_once(module, db_path)
+            totals.append(total / 1000)
+            for name, us in cumulative.items():
+                deps.setdefault(name, []).append(us / 1000)
+        created_db = os.path.exists(db_path)
+    top_level = [name for name in deps if "." not in name and name not in startup and name != "backend"]
+    heaviest = sorted(((name, statistics.median(deps[name])) for name in top_level), key=lambda item: -item[1])[:top]
+    return {
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "heaviest": [{"module": name, "ms": round(ms, 1)} for name, ms in heaviest],
+        "created_db": created_db,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark for backend modules")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="fail if the median import time of MODULE exceeds MS")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    budgets = {}
+    for item in args.budget:
+        name, _, ms = item.partition("=")
+        budgets[name] = float(ms)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        startup = set(import_once("sys", os.path.join(tmp, "x.db"))[0])
+    results = {}
+    failures = []
+    print(f"{'module':<22} {'median':>9} {'min':>9} {'max':>9}  heaviest top-level dependencies")
+    for module in args.modules:
+        r = results[module] = measure(module, args.repeat, startup)
+        heavy = ", ".join(f"{d['module']} {d['ms']:.0f}ms" for d in r["heaviest"])
+        print(f"{module:<22} {r['median_ms']:>7.1f}ms {r['min_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms  {heavy}")
+        if r["created_db"]:
+            failures.append(f"{module}: importing created the database file")
+        if module in budgets and r["median_ms"] > budgets[module]:
+            failures.append(f"{module}: {r['median_ms']:.1f}ms over budget {budgets[module]:.1f}ms")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: backend.utils.extract_json vs. the original character-by-character
+extract_json_blob + json.loads, on large and adversarial LLM outputs.
+
+Run: python benchmarks/bench_json_extract.py
+"""
+import os
+import sys
+import json
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.utils import extract_json  # noqa: E402
+
+
+def legacy_extract_json_blob(text: str):
+    # the implementation extract_json replaced, kept verbatim for comparison
+    if not text or "{" not in text:
+        raise ValueError("No JSON found in text")
+    start = text.find("{")
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                end = i
+                return text[start:end+1]
+    raise ValueError("Unbalanced JSON braces in text")
+
+
+def legacy(text):
+    return json.loads(legacy_extract_json_blob(text))
+
+
+def _doc(n_techs, questions=5):
+    return {"technology_questions": [
+        {"technology": f"Tech{i}", "difficulty": "medium",
+         "questions": [f"Question {j} about Tech{i}: explain the trade-offs in detail." for j in range(questions)]}
+        for i in range(n_techs)
+    ]}
+
+
+CASES = {
+    "typical (8 techs)": "Here are the questions:\n" + json.dumps(_doc(8)),
+    "large (500 techs)": "Sure!\n" + json.dumps(_doc(500)) + "\nLet me know if you need more.",
+    "long prose prefix": ("Thinking about the candidate... " * 5000) + json.dumps(_doc(8)),
+    "braces in strings": json.dumps({"technology_questions": [
+        {"technology": "Python", "questions": ["What does `{}` mean? And `{`?"] * 200}]}),
+    "fenced + trailing commas": "```json\n" + json.dumps(_doc(50)).replace("]}", "],}") + "\n```",
+    "truncated (500 techs)": json.dumps(_doc(500))[:-4000],
+}
+
+
+def main(number=20):
+    print(f"{'case':28} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}")
+    for name, text in CASES.items():
+        new_t = timeit.timeit(lambda: extract_json(text), number=number) / number * 1000
+        try:
+            legacy(text)
+            old_t = timeit.timeit(lambda: legacy(text), number=number) / number * 1000
+            old_s = f"{old_t:10.3f}"
+            speedup = f"{old_t / new_t:7.1f}x"
+        except ValueError:
+            old_s = f"{'error':>10}"
+            speedup = f"{'-':>8}"
+        print(f"{name:28} {old_s} {new_t:10.3f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: backend.matching candidate-to-role ranking.
+
+Builds the in-memory bitset view for a synthetic pool (Zipf-distributed technology popularity,
+3-10 techs per candidate) and measures top-k match latency for typical role stacks, with and
+without must-have filters. Compares against the naive approach the index replaces: re-splitting
+every stored tech_stack_raw in Python for each query.
+
+Run: python benchmarks/bench_matching.py [--candidates 100000] [--naive-sample 5000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.cache import normalize_tech_key  # noqa: E402
+from backend.matching import CandidateMatcher  # noqa: E402
+from backend.utils import split_tech_stack  # noqa: E402
+
+TECHS = ["Python", "JavaScript", "React", "Node.js", "PostgreSQL", "Docker", "AWS", "Java", "TypeScript", "Go",
+         "Kubernetes", "Django", "Flask", "Spring Boot", "Redis", "MongoDB", "Kafka", "Terraform", "GraphQL", "Rust",
+         "C#", ".NET", "Vue.js", "Angular", "MySQL", "Spark", "Airflow", "Pandas", "PyTorch", "TensorFlow",
+         "Scala", "Ruby on Rails", "PHP", "Laravel", "Swift", "Kotlin", "Flutter", "Elasticsearch", "RabbitMQ",
+         "Azure", "GCP", "Jenkins", "Ansible", "Next.js", "FastAPI", "Snowflake", "dbt", "Tableau", "C++", "Linux"]
+ROLES = [
+    ("Python, Django, PostgreSQL, Redis, Docker", "Python"),
+    ("React, TypeScript, Node.js, GraphQL", "React, TypeScript"),
+    ("Go, Kubernetes, Terraform, AWS", ""),
+    ("Spark, Airflow, Snowflake, dbt, Python", "Spark"),
+]
+
+
+def pool(rng, n):
+    # keys go through split_tech_stack like storage's index, so "Spark" -> "apache spark"
+    keys = {t: normalize_tech_key(split_tech_stack(t)[0]) for t in TECHS}
+    weights = [1 / (i + 1) for i in range(len(TECHS))]
+    ids, years, pairs, raws = [], [], [], []
+    for cid in range(1, n + 1):
+        stack = set(rng.choices(TECHS, weights=weights, k=rng.randint(3, 10)))
+        ids.append(cid)
+        years.append(rng.choice([None, *range(0, 16)]))
+        pairs.extend((keys[t], cid) for t in stack)
+        raws.append(", ".join(stack))
+    return ids, years, pairs, raws
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(0.99 * (len(times) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--naive-sample", type=int, default=5000, help="rows to time the re-parse baseline on")
+    parser.add_argument("-k", type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    ids, years, pairs, raws = pool(rng, args.candidates)
+    started = time.perf_counter()
+    matcher = CandidateMatcher.from_rows(ids, years, pairs)
+    build_ms = (time.perf_counter() - started) * 1000
+    bitset_mb = sum(b.nbytes for b in matcher._bits.values()) / 1e6
+    print(f"pool: {len(matcher)} candidates, {len(pairs)} (tech, candidate) rows, "
+          f"{len(matcher._bits)} techs, bitsets {bitset_mb:.1f} MB, build {build_ms:.0f} ms")
+
+    for stack, must in ROLES:
+        p50, p99 = timed(lambda: matcher.match(stack, must_have=must, k=args.k, target_years=5), args.repeat)
+        top = matcher.match(stack, must_have=must, k=args.k, target_years=5)
+        print(f"match [{stack}] must=[{must}]: p50 {p50:.2f} ms  p99 {p99:.2f} ms  "
+              f"top score {top[0]['score'] if top else 0:.3f}")
+
+    # baseline: split every stack and score in Python, on a sample, extrapolated to the pool
+    sample = raws[:args.naive_sample]
+    wanted = {normalize_tech_key(t) for t in split_tech_stack(ROLES[0][0])}
+
+    def naive():
+        scores = []
+        for i, raw in enumerate(sample):
+            have = {normalize_tech_key(t) for t in split_tech_stack(raw)}
+            scores.append((len(have & wanted) / len(wanted), i))
+        scores.sort(reverse=True)
+        return scores[:args.k]
+
+    p50, _ = timed(naive, 3)
+    print(f"naive re-parse: {p50:.1f} ms per {len(sample)} rows -> ~{p50 * len(raws) / len(sample):.0f} ms "
+          f"for the pool (memoized normalizer; every row is also loaded from SQLite in practice)")
+
+
+if __name__ == "__main__":
+    main()
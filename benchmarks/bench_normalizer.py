@@ -0,0 +1,111 @@
+"""
+Benchmark: backend.normalizer (via split_tech_stack) vs. the original regex + 14-entry dict
+implementation, on stack strings from submissions.jsonl plus a synthetic corpus of realistic
+form entries. Also reports how many distinct names each produces (fewer = better cache keys).
+
+Run: python benchmarks/bench_normalizer.py
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.normalizer import TechNormalizer  # noqa: E402
+from backend.utils import COMMON_NORMALIZATIONS  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def legacy_split_tech_stack(text: str):
+    # the implementation split_tech_stack replaced, kept verbatim for comparison
+    if not text:
+        return []
+    parts = re.split(r"[,\n;/|]+", text)
+    cleaned = []
+    seen = set()
+    for p in parts:
+        t = p.strip()
+        if not t:
+            continue
+        t = re.sub(r"[^\w\+\#\.\- ]+", "", t)
+        key = t.lower()
+        normalized = COMMON_NORMALIZATIONS.get(key)
+        if not normalized:
+            if key in {"sql"}:
+                normalized = "SQL"
+            elif key in {"go"}:
+                normalized = "Go"
+            else:
+                normalized = t.title()
+        if normalized not in seen:
+            cleaned.append(normalized)
+            seen.add(normalized)
+    return cleaned
+
+
+SURFACE_FORMS = [
+    "Python", "python3", "py", "Pyhton", "Django", "django rest framework", "DRF", "Flask", "FastAPI",
+    "React", "reactjs", "React.js", "react js", "Redux", "Next.js", "nextjs", "Vue", "vue3", "Angular 2+",
+    "Node", "nodejs", "node.js", "Express", "TypeScript", "ts", "JavaScript", "js", "ES6",
+    "PostgreSQL", "postgres", "Postgress", "psql", "MySQL", "MongoDB", "mongo", "Redis",
+    "Docker", "docker-compose", "Kubernetes", "k8s", "Kubernets", "Helm", "Terraform", "AWS", "aws lambda",
+    "GCP", "Azure", "CI/CD", "GitHub Actions", "Jenkins", "Kafka", "RabbitMQ", "Spark", "pyspark",
+    "Pandas", "NumPy", "scikit-learn", "sklearn", "TensorFlow 2.x", "PyTorch", "ML", "NLP", "LLMs",
+    "Java 17", "Spring Boot", "springboot", "C#", ".NET Core", "asp.net core", "C++17", "Go", "golang", "Rust",
+]
+FREE_TEXT = [
+    "5 yrs react + redux, some k8s",
+    "Python/Django backend, AWS (EC2, S3, Lambda)",
+    "React Native and Flutter for mobile",
+    "Spring Boot microservices on Kubernetes with Kafka",
+]
+
+
+def build_corpus(n=5000, seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    path = os.path.join(ROOT, "submissions.jsonl")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                corpus.append(rec.get("tech_stack_raw") or ", ".join(rec.get("tech_stack", [])))
+    while len(corpus) < n:
+        picks = rng.sample(SURFACE_FORMS, rng.randint(3, 9))
+        if rng.random() < 0.2:
+            picks.append(rng.choice(FREE_TEXT))
+        corpus.append(rng.choice([", ", "\n", "; ", " / "]).join(picks))
+    return corpus
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    out = [fn(text) for text in corpus]
+    return (time.perf_counter() - start) * 1000, out
+
+
+def main():
+    corpus = build_corpus()
+    t0 = time.perf_counter()
+    normalizer = TechNormalizer.from_file(extra_aliases=COMMON_NORMALIZATIONS)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    legacy_ms, legacy_out = timed(legacy_split_tech_stack, corpus)
+    cold_ms, new_out = timed(normalizer.split, corpus)
+    warm_ms, _ = timed(normalizer.split, corpus)
+    info = normalizer.split_entry.cache_info()
+
+    legacy_names = {name for names in legacy_out for name in names}
+    new_names = {name for names in new_out for name in names}
+    print(f"corpus: {len(corpus)} stack strings; dictionary: {len(normalizer.aliases)} surface forms (built in {build_ms:.0f} ms)")
+    print(f"legacy split_tech_stack      {legacy_ms:8.1f} ms  distinct names: {len(legacy_names)}")
+    print(f"normalizer (cold memo)       {cold_ms:8.1f} ms  distinct names: {len(new_names)}")
+    print(f"normalizer (warm memo)       {warm_ms:8.1f} ms  entry cache: {info.currsize} entries, {info.hits} hits")
+
+
+if __name__ == "__main__":
+    main()
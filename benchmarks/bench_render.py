@@ -0,0 +1,104 @@
+"""
+Benchmark: Streamlit render cost of the main page.
+
+Runs app/streamlit_app.py headless through streamlit.testing (AppTest) against a temporary
+database seeded with --recent candidates, with --techs generated question blocks in session
+state (what the page shows right after a submission), and reports for a rerun of the script:
+
+    elements   nodes in the rendered tree (each is a delta message sent to the browser)
+    iframes    components.html iframes (each is a separate document the browser loads)
+    p50 / p95  wall time of a rerun: executing the script and building its deltas
+
+Compare against an older revision of the page by pointing --app at a copy of it:
+
+    git show <rev>:app/streamlit_app.py > /tmp/streamlit_app_before.py
+    python benchmarks/bench_render.py --app /tmp/streamlit_app_before.py
+    python benchmarks/bench_render.py
+
+Requires streamlit (see requirements.txt).
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from collections import Counter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.append(ROOT)
+
+TECHS = ["Python", "Django", "React", "PostgreSQL", "Docker", "Kubernetes", "Go", "TypeScript", "Redis", "AWS",
+         "Kafka", "Terraform", "GraphQL", "Rust", "Java", "Spring Boot"]
+
+
+def blocks_for(techs, questions):
+    return [{
+        "technology": tech,
+        "difficulty": "medium",
+        "questions": [f"How would you explain {tech} concept #{i} and its performance trade-offs in production?"
+                      for i in range(1, questions + 1)],
+    } for tech in techs]
+
+
+def seed(n, techs, questions):
+    from backend import storage
+    storage.save_candidates_bulk([({
+        "full_name": f"Bench Candidate {i}",
+        "email": f"bench{i}@example.com",
+        "desired_position": "Backend Engineer",
+        "location": "Remote",
+        "years_experience": i % 12,
+        "tech_stack_raw": ", ".join(techs),
+    }, blocks_for(techs, questions)) for i in range(n)])
+
+
+def walk(node, counts):
+    counts[getattr(node, "type", type(node).__name__)] += 1
+    for child in getattr(node, "children", {}).values():
+        walk(child, counts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default=os.path.join(ROOT, "app", "streamlit_app.py"))
+    parser.add_argument("--techs", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--recent", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="talentscout-bench-render-")
+    os.environ["TALENTSCOUT_DB"] = os.path.join(tmp, "talentscout.db")
+    os.environ["TALENTSCOUT_CACHE_DB"] = os.path.join(tmp, "talentscout_cache.db")
+    from streamlit.testing.v1 import AppTest
+
+    techs = TECHS[:args.techs]
+    seed(args.recent, techs, args.questions)
+
+    at = AppTest.from_file(args.app, default_timeout=60)
+    at.session_state["generated"] = blocks_for(techs, args.questions)
+    at.session_state["candidate"] = {"full_name": "Bench Candidate", "desired_position": "Backend Engineer"}
+    at.run()  # first run pays for imports and schema setup
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception[0].message}")
+
+    times = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - started) * 1000)
+    counts = Counter()
+    walk(at._tree, counts)
+    times.sort()
+
+    label = os.path.relpath(args.app, ROOT) if os.path.abspath(args.app).startswith(ROOT) else args.app
+    print(f"{label}: {args.techs} generated blocks x {args.questions} questions, "
+          f"{args.recent} recent candidates")
+    print(f"  elements {sum(counts.values())}  iframes {counts['iframe']}  markdown {counts['markdown']}  "
+          f"expanders {counts['expander']}")
+    print(f"  rerun p50 {statistics.median(times):.1f} ms  p95 {times[int(0.95 * (len(times) - 1))]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
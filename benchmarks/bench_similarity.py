@@ -0,0 +1,82 @@
+"""
+Benchmark: backend.similarity near-duplicate detection.
+
+Measures per-response dedupe latency (what every LLM response now pays), vectorized embedding
+throughput, and blocked all-pairs duplicate search over an on-disk index of a synthetic corpus.
+
+Run: python benchmarks/bench_similarity.py [--corpus 20000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.similarity import VectorIndex, dedupe_blocks, hash_vectors, embed  # noqa: E402
+
+TEMPLATES = [
+    "Explain the main use-cases of {t}.", "What is {t} used for?", "Describe a common pitfall when working with {t}.",
+    "How would you debug a performance issue related to {t}?", "How does {t} handle {c} under load?",
+    "Compare {t} with {o} for {c}.", "What are the trade-offs of using {t} for {c}?",
+    "Walk through how you would test {c} in a {t} codebase.", "How do you secure {c} in {t}?",
+]
+CONCEPTS = ["concurrency", "caching", "error handling", "memory management", "schema migrations", "logging",
+            "configuration", "dependency injection", "serialization", "pagination", "retries", "observability"]
+TECHS = ["Python", "Django", "React", "Go", "Rust", "Kafka", "PostgreSQL", "Redis", "Kubernetes", "Terraform",
+         "TypeScript", "Node.js", "Spring Boot", "Spark", "AWS Lambda", "GraphQL"]
+
+
+def question(rng):
+    return rng.choice(TEMPLATES).format(t=rng.choice(TECHS), o=rng.choice(TECHS), c=rng.choice(CONCEPTS))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=int, default=20000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    timings = []
+    dropped_total = 0
+    for _ in range(500):
+        techs = rng.sample(TECHS, 5)
+        blocks = [{"technology": t, "questions": [question(rng).replace(rng.choice(TECHS), t, 1) for _ in range(4)]}
+                  for t in techs]
+        start = time.perf_counter()
+        _, dropped = dedupe_blocks(blocks)
+        timings.append((time.perf_counter() - start) * 1000)
+        dropped_total += sum(map(len, dropped))
+    timings.sort()
+    print(f"dedupe_blocks (5 techs x 4 questions): p50 {statistics.median(timings):.2f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.2f} ms, {dropped_total / 500:.1f} dropped per response")
+
+    corpus = [question(rng) + f" ({i % 97})" for i in range(args.corpus)]
+    start = time.perf_counter()
+    raw = hash_vectors(corpus)
+    elapsed = time.perf_counter() - start
+    print(f"hash_vectors: {len(corpus) / elapsed:,.0f} questions/s")
+    start = time.perf_counter()
+    embed(corpus[:2000])
+    print(f"embed 2000: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VectorIndex(tmp)
+        start = time.perf_counter()
+        index.add(list(range(len(corpus))), raw, last_source_id=len(corpus))
+        print(f"index append: {(time.perf_counter() - start) * 1000:.1f} ms for {len(corpus)} rows")
+        start = time.perf_counter()
+        pairs = sum(1 for _ in index.near_duplicate_pairs(threshold=0.9))
+        elapsed = time.perf_counter() - start
+        print(f"all-pairs near-duplicate scan: {elapsed:.2f} s, {pairs:,} pairs >= 0.9 "
+              f"({len(corpus) ** 2 / 2 / elapsed / 1e6:,.0f}M comparisons/s)")
+        start = time.perf_counter()
+        index.search(corpus[:100], k=5)
+        print(f"search 100 queries: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
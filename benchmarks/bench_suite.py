@@ -0,0 +1,315 @@
+"""
+End-to-end benchmark suite for the submission path.
+
+Covers split_tech_stack, extract_json_blob, _extract_text_from_mistral_response,
+generate_questions_for_techs (against benchmarks/mock_mistral.py with configurable latency,
+jitter and error rates), save_candidate_with_questions and load_recent_with_questions on a
+table pre-seeded to a realistic size. Latency percentiles and throughput are written to JSON
+and compared with a stored baseline; any regression beyond the tolerance exits non-zero.
+
+Run:
+    python benchmarks/bench_suite.py                       # full run, compare with benchmarks/baseline.json
+    python benchmarks/bench_suite.py --quick               # smaller sizes, for a fast local check
+    python benchmarks/bench_suite.py --update-baseline     # accept the current numbers as the new baseline
+    python benchmarks/bench_suite.py --only generate       # cases whose name contains "generate"
+
+Baselines are machine-specific: regenerate it on the machine that runs the comparison.
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(HERE, "..")))
+sys.path.append(HERE)
+
+from mock_mistral import MockMistral  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_OUT = os.path.join(HERE, "results", "latest.json")
+
+TECHS = ["Python", "Django", "React", "PostgreSQL", "Docker", "Kubernetes", "Go", "TypeScript", "Redis", "AWS",
+         "Node.js", "Java", "Spring Boot", "Kafka", "Terraform", "GraphQL", "Rust", "Vue.js", "MongoDB", "Spark"]
+STACK_ENTRIES = ["python3", "Django", "reactjs", "node.js", "postgres", "k8s", "Docker", "golang", "TypeScript",
+                 "AWS Lambda", "Spring Boot", "C#", ".NET Core", "Kafka", "Terraform", "Kubernets", "Vue 3",
+                 "scikit-learn", "Pandas", "GraphQL", "CI/CD", "Redis", "Next.js", "Rust"]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def measure(fn, iterations: int, concurrency: int = 1, warmup: int = 0):
+    """
+    Call fn(i) iterations times from `concurrency` threads. Returns latency percentiles in ms
+    and throughput in calls per second of wall time.
+    """
+    for i in range(warmup):
+        fn(i)
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(iterations))
+
+    def worker():
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            fn(i)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        worker()
+    else:
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - started
+    return {
+        "n": len(latencies),
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(latencies, 50), 4),
+        "p90_ms": round(percentile(latencies, 90), 4),
+        "p99_ms": round(percentile(latencies, 99), 4),
+        "mean_ms": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        "max_ms": round(max(latencies), 4) if latencies else 0.0,
+        "ops_per_sec": round(len(latencies) / wall, 2) if wall else 0.0,
+    }
+
+
+def _stacks(rng, n):
+    return [", ".join(rng.sample(STACK_ENTRIES, rng.randint(3, 8))) for _ in range(n)]
+
+
+def _llm_outputs(rng, n):
+    docs = []
+    for i in range(n):
+        blocks = [{"technology": t, "difficulty": "medium", "questions": [f"Question {k} about {t} {{braces}}?" for k in range(4)]}
+                  for t in rng.sample(TECHS, rng.randint(1, 6))]
+        text = json.dumps({"technology_questions": blocks})
+        kind = i % 4
+        if kind == 1:
+            text = f"```json\n{text}\n```"
+        elif kind == 2:
+            text = f"Sure, here you go:\n{text}\nLet me know if you need more."
+        elif kind == 3:
+            text = text[:-len(text) // 5]  # truncated mid-output
+        docs.append(text)
+    return docs
+
+
+def _responses(rng, n):
+    shapes = [
+        lambda t: {"output": t},
+        lambda t: {"choices": [{"text": t}]},
+        lambda t: {"choices": [{"content": t}]},
+        lambda t: {"generations": [{"text": t}]},
+        lambda t: t,
+        lambda t: {"unexpected": {"nested": t}},
+    ]
+    return [shapes[i % len(shapes)](f"response {i} " + "x" * rng.randint(50, 2000)) for i in range(n)]
+
+
+def _submission(rng, i):
+    techs = rng.sample(TECHS, rng.randint(2, 6))
+    candidate = {
+        "full_name": f"Bench Candidate {i}",
+        "email": f"bench{i}@example.com",
+        "phone": "555-0100",
+        "years_experience": rng.randint(0, 15),
+        "desired_position": rng.choice(["Backend Engineer", "Data Engineer", "Frontend Engineer", "SRE"]),
+        "location": rng.choice(["Berlin", "Remote", "Bangalore", "Austin"]),
+        "tech_stack_raw": ", ".join(techs),
+    }
+    blocks = [{"technology": t, "difficulty": "medium",
+               "questions": [f"Explain {t} topic {rng.randint(0, 400)} variant {k}." for k in range(4)]} for t in techs]
+    return candidate, blocks
+
+
+def run_suite(args):
+    rng = random.Random(args.seed)
+    sizes = {"micro": 2000, "generate": 60, "save": 300, "load": 300} if args.quick else \
+            {"micro": 20000, "generate": 200, "save": 1000, "load": 1000}
+    table_size = args.table_size or (2000 if args.quick else 20000)
+
+    mock = MockMistral(args.latency_ms, args.jitter_ms, args.error_rate, args.malformed_rate, seed=args.seed).start()
+    # configure the backend before importing it: throwaway database, no caches, the mock endpoint
+    workdir = tempfile.mkdtemp(prefix="talentscout-bench-")
+    os.environ.update({
+        "TALENTSCOUT_DB": os.path.join(workdir, "bench.db"),
+        "TALENTSCOUT_CACHE": "0",
+        "TALENTSCOUT_QUESTION_BANK": "0",
+        "MISTRAL_API_URL": mock.url,
+        "MISTRAL_API_KEY": "bench",
+        "MISTRAL_MODEL": "",
+        "MISTRAL_RATE_LIMIT": "0",
+        "MISTRAL_BACKOFF_BASE": "0.01",
+        "MISTRAL_BACKOFF_MAX": "0.05",
+        "MISTRAL_BREAKER_THRESHOLD": "1000000",
+    })
+    from backend import storage
+    from backend.generator import _extract_text_from_mistral_response, generate_questions_for_techs
+    from backend.utils import extract_json, extract_json_blob, split_tech_stack
+
+    logging.getLogger("backend").setLevel(logging.ERROR)  # injected failures log a warning each
+    cases = {}
+
+    def wanted(name):
+        return not args.only or any(o in name for o in args.only)
+
+    def case(name, fn, iterations, **kwargs):
+        if not wanted(name):
+            return
+        cases[name] = measure(fn, iterations, **kwargs)
+        c = cases[name]
+        print(f"{name:50} p50 {c['p50_ms']:9.3f} ms  p99 {c['p99_ms']:9.3f} ms  {c['ops_per_sec']:12,.1f} ops/s")
+
+    stacks = _stacks(rng, 500)
+    case("split_tech_stack", lambda i: split_tech_stack(stacks[i % len(stacks)]), sizes["micro"], warmup=len(stacks))
+    outputs = _llm_outputs(rng, 400)
+    complete = [o for i, o in enumerate(outputs) if i % 4 != 3]
+    case("extract_json_blob", lambda i: extract_json_blob(complete[i % len(complete)]), sizes["micro"])
+    case("extract_json.with_truncation_repair", lambda i: extract_json(outputs[i % len(outputs)]), sizes["micro"])
+    responses = _responses(rng, 600)
+    case("extract_text_from_mistral_response", lambda i: _extract_text_from_mistral_response(responses[i % len(responses)]), sizes["micro"])
+
+    tech_sets = [rng.sample(TECHS, 5) for _ in range(50)]
+    case("generate_questions_for_techs.1_tech",
+         lambda i: generate_questions_for_techs([TECHS[i % len(TECHS)]], cache=False), sizes["generate"])
+    case("generate_questions_for_techs.5_techs",
+         lambda i: generate_questions_for_techs(tech_sets[i % len(tech_sets)], cache=False), sizes["generate"])
+    case("generate_questions_for_techs.5_techs_x8_sessions",
+         lambda i: generate_questions_for_techs(tech_sets[i % len(tech_sets)], cache=False), sizes["generate"] * 2,
+         concurrency=8)
+
+    if wanted("save_candidate_with_questions") or wanted("load_recent_with_questions"):
+        seed_started = time.perf_counter()
+        storage.save_candidates_bulk([_submission(rng, i) for i in range(table_size)], chunk_size=1000)
+        print(f"seeded {table_size} candidates in {time.perf_counter() - seed_started:.1f}s")
+    submissions = [_submission(rng, table_size + i) for i in range(sizes["save"] * 3)]
+    case("save_candidate_with_questions",
+         lambda i: storage.save_candidate_with_questions(*submissions[i]), sizes["save"])
+    case("save_candidate_with_questions.x8_sessions",
+         lambda i: storage.save_candidate_with_questions(*submissions[sizes["save"] + i]), sizes["save"] * 2, concurrency=8)
+
+    def load_cold(i):
+        storage._invalidate_read_cache()  # what the first reader after every save pays
+        storage.load_recent_with_questions(10)
+
+    case("load_recent_with_questions.cold", load_cold, sizes["load"])
+    case("load_recent_with_questions.warm", lambda i: storage.load_recent_with_questions(10), sizes["load"])
+
+    mock.close()
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "table_size": table_size,
+            "mock": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+                     "malformed_rate": args.malformed_rate, "requests": mock.requests, "errors": mock.errors,
+                     "malformed": mock.malformed},
+        },
+        "cases": cases,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results, baseline, tolerance: float = 0.25, p99_tolerance: float = 0.5, noise_floor_ms: float = 0.05):
+    """
+    Regressions of results against baseline: p50/p99 slower, or throughput lower, by more than the
+    tolerance (p99 gets its own, looser tolerance). Differences under noise_floor_ms are ignored.
+    Returns a list of human-readable findings; empty means no regression.
+    """
+    findings = []
+    for name, current in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        for metric, tol in (("p50_ms", tolerance), ("p99_ms", p99_tolerance)):
+            if current[metric] > base[metric] * (1 + tol) and current[metric] - base[metric] > noise_floor_ms:
+                findings.append(f"{name}: {metric} {current[metric]:.3f} vs baseline {base[metric]:.3f} "
+                                f"(+{(current[metric] / base[metric] - 1) * 100 if base[metric] else float('inf'):.0f}%)")
+        if base["ops_per_sec"] and current["ops_per_sec"] < base["ops_per_sec"] / (1 + tolerance):
+            findings.append(f"{name}: ops/s {current['ops_per_sec']:.1f} vs baseline {base['ops_per_sec']:.1f} "
+                            f"({(current['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:.0f}%)")
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TalentScout benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="smaller iteration counts and table size")
+    parser.add_argument("--only", nargs="*", default=None, help="run cases whose name contains any of these")
+    parser.add_argument("--table-size", type=int, default=None, help="candidates pre-seeded before storage cases")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--malformed-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--p99-tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {args.out}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against (run with --update-baseline)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("quick") != args.quick:
+        print("warning: baseline and this run use different --quick settings; comparison is indicative only")
+    findings = compare(results, baseline, args.tolerance, args.p99_tolerance)
+    if findings:
+        print(f"\n{len(findings)} regression(s) vs baseline {baseline.get('meta', {}).get('git_commit')}:")
+        for line in findings:
+            print("  " + line)
+        return 1
+    print("no regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
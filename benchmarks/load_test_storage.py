@@ -0,0 +1,102 @@
+"""
+Load test for backend.storage: N concurrent simulated sessions each saving M submissions.
+Reports p50/p99 save latency and throughput, with and without group commit.
+
+Run: python benchmarks/load_test_storage.py --sessions 16 --saves 25
+(uses a throwaway database unless TALENTSCOUT_DB is set)
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("TALENTSCOUT_DB", os.path.join(tempfile.mkdtemp(prefix="talentscout-load-"), "load.db"))
+
+from backend import storage  # noqa: E402
+
+TECHS = ["Python", "Django", "React", "PostgreSQL", "Docker", "Kubernetes", "Go", "TypeScript"]
+
+
+def _submission(i):
+    techs = random.sample(TECHS, 4)
+    candidate = {
+        "full_name": f"Load Test {i}",
+        "email": f"load{i}@example.com",
+        "years_experience": random.randint(0, 12),
+        "desired_position": "Backend Engineer",
+        "location": "Remote",
+        "tech_stack_raw": ", ".join(techs),
+    }
+    blocks = [{"technology": t, "difficulty": "medium", "questions": [f"{t} question {n}" for n in range(4)]} for t in techs]
+    return candidate, blocks
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def run(sessions: int, saves: int, think_ms: float, group_commit: bool):
+    storage.GROUP_COMMIT = group_commit
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def session_loop(sid):
+        barrier.wait()
+        for n in range(saves):
+            candidate, blocks = _submission(sid * saves + n)
+            start = time.perf_counter()
+            try:
+                storage.save_candidate_with_questions(candidate, blocks)
+            except Exception as e:  # "database is locked" and friends
+                with lock:
+                    errors.append(repr(e))
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+            if think_ms:
+                time.sleep(random.uniform(0, think_ms) / 1000)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session_loop, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    return {
+        "group_commit": group_commit,
+        "saves": len(latencies),
+        "errors": len(errors),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "saves_per_second": round(len(latencies) / wall, 1) if wall else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--saves", type=int, default=25)
+    parser.add_argument("--think-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"database: {storage.DB_URL}")
+    for group_commit in (False, True):
+        result = run(args.sessions, args.saves, args.think_ms, group_commit)
+        print(("group commit " if group_commit else "direct       ") + " ".join(f"{k}={v}" for k, v in result.items() if k != "group_commit"))
+    print(f"writer batches={storage._writer.batches} writes={storage._writer.writes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Local mock of the Mistral inference endpoint for benchmarks and manual load testing.
+
+Answers every POST with a generation-shaped JSON body for the technologies named in the prompt,
+after a configurable latency (+ uniform jitter). A configurable share of requests fails with a
+retryable status or returns malformed output, so retry and fallback paths get exercised too.
+
+Run standalone: python benchmarks/mock_mistral.py --port 8089 --latency-ms 80 --jitter-ms 40 --error-rate 0.05
+then point the app at it with MISTRAL_API_URL=http://127.0.0.1:8089 MISTRAL_API_KEY=mock.
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# a response never repeats a topic, so the generator's near-duplicate filter has nothing to drop
+TOPICS = [
+    "the concurrency model", "memory management", "error handling", "testing strategy", "packaging and releases",
+    "performance profiling", "security hardening", "configuration management", "observability", "data modelling",
+    "API design", "caching", "deployment", "debugging production incidents", "code organisation",
+    "dependency upgrades", "schema migrations", "rate limiting", "feature flags", "internationalisation",
+    "accessibility", "logging conventions", "load testing", "backpressure", "idempotent retries",
+    "secret rotation", "blue-green releases", "pagination", "search relevance", "batch jobs",
+    "event sourcing", "offline support", "cold start time", "bundle size", "query planning",
+    "connection pooling", "graceful shutdown", "multi-tenancy", "audit trails", "disaster recovery",
+]
+
+
+class MockMistral:
+    """
+    ThreadingHTTPServer on 127.0.0.1 (port 0 = any free port). Thread-safe counters for
+    requests, injected errors and malformed replies.
+    """
+
+    def __init__(self, latency_ms: float = 50, jitter_ms: float = 20, error_rate: float = 0.0,
+                 malformed_rate: float = 0.0, error_status: int = 503, port: int = 0, seed: int = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.malformed = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body = mock._respond(payload)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = None
+
+    def _respond(self, payload):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+            order = self._rng.sample(range(len(TOPICS)), len(TOPICS))
+            if roll < self.error_rate:
+                self.errors += 1
+            elif roll < self.error_rate + self.malformed_rate:
+                self.malformed += 1
+        time.sleep(delay)
+        if roll < self.error_rate:
+            return self.error_status, {"error": "injected failure"}
+        if roll < self.error_rate + self.malformed_rate:
+            return 200, {"output": "Sure! Here are some questions: 1. ..."}
+        prompt = payload.get("input") or ""
+        techs = prompt.split("Technologies: ", 1)[1].split("\n", 1)[0].split(", ") if "Technologies: " in prompt else []
+        difficulty = prompt.split("Requested difficulty: ", 1)[1].split("\n", 1)[0] if "Requested difficulty: " in prompt else "medium"
+        blocks = [
+            {"technology": t, "difficulty": difficulty,
+             "questions": [f"Explain {TOPICS[order[(n * 4 + k) % len(order)]]} in {t}." for k in range(4)]}
+            for n, t in enumerate(techs)
+        ]
+        text = json.dumps({"technology_questions": blocks})
+        return 200, {"output": f"```json\n{text}\n```"}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Mistral endpoint")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    mock = MockMistral(args.latency_ms, args.jitter_ms, args.error_rate, args.malformed_rate, port=args.port)
+    print(f"Mock Mistral listening on {mock.url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+import shutil
+import tempfile
+
+# Keep test runs away from the committed database and the default cache file. Set at import
+# time (before any backend module reads its settings) and removed when the session ends.
+_tmpdir = tempfile.mkdtemp(prefix="talentscout-tests-")
+os.environ.setdefault("TALENTSCOUT_DB", os.path.join(_tmpdir, "talentscout.db"))
+os.environ.setdefault("TALENTSCOUT_CACHE_DB", os.path.join(_tmpdir, "talentscout_cache.db"))
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_tmpdir, ignore_errors=True)
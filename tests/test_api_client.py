@@ -0,0 +1,181 @@
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest # type: ignore
+import requests
+
+from backend.api_client import (MistralClient, CircuitBreaker, CircuitOpenError, RequestCancelled, TokenBucket,
+                                _retry_after_seconds, cancellation)
+
+
+class StubMistral:
+    """
+    Local HTTP server that replays a scripted list of (status, headers, body) responses.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = []
+        self.connections = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                stub.requests.append(json.loads(self.rfile.read(length)))
+                stub.connections.add(self.client_address)
+                status, headers, body = stub.script.pop(0) if len(stub.script) > 1 else stub.script[0]
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+OK = (200, {}, {"output": "hello"})
+
+
+def _client(stub, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("backoff_max", 0.05)
+    return MistralClient(base_url=stub.url, api_key="test-key", **kwargs)
+
+
+def test_reuses_pooled_connection():
+    stub = StubMistral([OK])
+    try:
+        client = _client(stub)
+        for _ in range(3):
+            assert client.generate("hi") == {"output": "hello"}
+        assert len(stub.requests) == 3
+        assert len(stub.connections) == 1
+        assert stub.requests[0]["input"] == "hi"
+    finally:
+        stub.close()
+
+
+def test_retries_429_and_5xx_then_succeeds():
+    stub = StubMistral([(429, {"Retry-After": "0"}, {}), (503, {}, {}), OK])
+    try:
+        client = _client(stub, max_retries=3)
+        assert client.generate("hi") == {"output": "hello"}
+        assert len(stub.requests) == 3
+    finally:
+        stub.close()
+
+
+def test_client_error_is_not_retried():
+    stub = StubMistral([(401, {}, {"error": "bad key"})])
+    try:
+        client = _client(stub, max_retries=3)
+        with pytest.raises(requests.HTTPError):
+            client.generate("hi")
+        assert len(stub.requests) == 1
+        assert client.breaker.state == "closed"
+    finally:
+        stub.close()
+
+
+def test_circuit_breaker_short_circuits():
+    stub = StubMistral([(500, {}, {})])
+    try:
+        client = _client(stub, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                client.generate("hi")
+        with pytest.raises(CircuitOpenError):
+            client.generate("hi")
+        assert len(stub.requests) == 2
+    finally:
+        stub.close()
+
+
+
+def test_unexpected_error_frees_half_open_trial():
+    class BrokenSession:
+        def post(self, *args, **kwargs):
+            raise requests.exceptions.ChunkedEncodingError("connection broken mid-body")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    client = MistralClient(base_url="http://mistral.invalid", api_key="test-key", session=BrokenSession(),
+                           breaker=breaker, rate_limiter=TokenBucket(rate=0.001, capacity=1))
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.generate("hi")
+    assert breaker.allow()  # the trial slot was released, not leaked
+    breaker.release()
+    # a local rate-limiter timeout is not a provider failure
+    with pytest.raises(TimeoutError):
+        client.generate("hi", timeout=0.01)
+    assert breaker.failures == 1 and breaker.allow()
+
+def test_cancellation_stops_retries():
+    stub = StubMistral([(503, {}, {})])
+    try:
+        client = _client(stub, max_retries=5)
+        client._backoff = lambda attempt, retry_after=None: 0.5
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        with cancellation(cancel), pytest.raises(RequestCancelled):
+            client.generate("hi")
+        assert len(stub.requests) == 1  # cancelled during the first backoff
+        with cancellation(cancel), pytest.raises(RequestCancelled):
+            client.generate("hi")
+        assert len(stub.requests) == 1 and client.breaker.state == "closed"
+    finally:
+        stub.close()
+
+
+def test_async_variant():
+    stub = StubMistral([OK])
+    try:
+        client = _client(stub)
+
+        async def run():
+            return await asyncio.gather(*(client.agenerate(f"q{i}") for i in range(4)))
+
+        assert asyncio.run(run()) == [{"output": "hello"}] * 4
+    finally:
+        stub.close()
+
+
+def test_cancelling_async_call_stops_retries():
+    stub = StubMistral([(503, {}, {})])
+    try:
+        client = _client(stub, max_retries=5)
+        client._backoff = lambda attempt, retry_after=None: 0.5
+
+        async def run():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.agenerate("hi"), timeout=0.1)
+            await asyncio.sleep(0.7)  # past the first backoff, where a retry would have gone out
+
+        asyncio.run(run())
+        assert len(stub.requests) == 1 and client.breaker.state == "closed"
+    finally:
+        stub.close()
+
+def test_token_bucket_and_retry_after_parsing():
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+    assert _retry_after_seconds("2") == 2.0
+    assert _retry_after_seconds("garbage") is None
@@ -0,0 +1,52 @@
+import json
+
+from backend import bulk_import
+from backend.storage import SessionLocal
+from backend.models import Candidate, QuestionBlock
+
+
+def _write_jsonl(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8")
+
+
+def test_import_dedupes_techs_and_resumes(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_generate(techs, difficulty="medium", model=None, **kwargs):
+        calls.append((tuple(techs), difficulty))
+        return [{"technology": t, "difficulty": difficulty, "questions": [f"{t} q"]} for t in techs]
+
+    monkeypatch.setattr(bulk_import, "generate_questions_for_techs", fake_generate)
+    src = tmp_path / "drive.jsonl"
+    _write_jsonl(src, [
+        {"full_name": "A", "years_experience": 1, "tech_stack": ["Python", "Go"]},
+        {"full_name": "B", "years_experience": 3, "tech_stack_raw": "go, Python"},
+        {"full_name": "C", "tech_stack": []},
+        {"full_name": "D", "tech_stack_raw": "React", "difficulty": "hard"},
+    ])
+    checkpoint = str(tmp_path / "cp.json")
+
+    def count():
+        session = SessionLocal()
+        try:
+            return session.query(Candidate).count()
+        finally:
+            session.close()
+
+    before = count()
+    summary = bulk_import.import_candidates(str(src), batch_size=10, workers=2, checkpoint=checkpoint)
+    assert summary["candidates_saved"] == 3
+    assert summary["skipped"] == 1
+    assert summary["unique_tech_difficulty"] == 3
+    generated = sorted(t for techs, _ in calls for t in techs)
+    assert generated == ["Go", "Python", "React"]
+    assert count() == before + 3
+    session = SessionLocal()
+    names = {b.technology for b in session.query(QuestionBlock).join(Candidate).filter(Candidate.full_name == "B")}
+    session.close()
+    assert names == {"Go", "Python"}
+
+    # rerunning with the checkpoint is a no-op
+    summary = bulk_import.import_candidates(str(src), checkpoint=checkpoint)
+    assert summary["candidates_saved"] == 0
+    assert count() == before + 3
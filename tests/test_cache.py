@@ -0,0 +1,68 @@
+import json
+import time
+
+from backend.cache import QuestionCache, make_cache_key, experience_band
+from backend import generator
+
+
+def _llm_response(blocks):
+    return {"output": json.dumps({"technology_questions": blocks})}
+
+
+def test_make_cache_key_normalizes():
+    assert make_cache_key(" Python ", "MEDIUM", 3) == make_cache_key("python", "medium", 2)
+    assert make_cache_key("python", "medium", 0) != make_cache_key("python", "medium", 12)
+    assert experience_band(None) == "any"
+
+
+def test_cache_persists_and_expires(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = QuestionCache(path=path, ttl=60)
+    cache.set("k", {"technology": "Python", "questions": ["q1"]})
+    assert cache.get("k")["questions"] == ["q1"]
+
+    # a fresh instance only has the SQLite tier
+    reopened = QuestionCache(path=path, ttl=60)
+    assert reopened.get("k")["technology"] == "Python"
+    assert reopened.stats()["hits"] == 1
+
+    expired = QuestionCache(path=path, ttl=1)
+    expired._conn.execute("UPDATE question_cache SET created_at = ?", (time.time() - 10,))
+    expired._conn.commit()
+    assert expired.get("k") is None
+    assert expired.stats()["misses"] == 1
+
+
+def test_cache_size_eviction(tmp_path):
+    cache = QuestionCache(path=str(tmp_path / "cache.db"), max_entries=2, memory_entries=1)
+    for i in range(4):
+        cache.set(f"k{i}", {"i": i})
+    (count,) = cache._conn.execute("SELECT COUNT(*) FROM question_cache").fetchone()
+    assert count == 2
+    assert len(cache._memory) == 1
+
+
+def test_generate_only_sends_cache_misses(monkeypatch, tmp_path):
+    cache = QuestionCache(path=str(tmp_path / "cache.db"))
+    cache.set(make_cache_key("Python", "medium", None), {"technology": "Python", "difficulty": "medium", "questions": ["cached q"]})
+    prompts = []
+
+    def fake_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        prompts.append(prompt)
+        return _llm_response([
+            {"technology": "React", "difficulty": "medium", "questions": ["r1"]},
+            {"technology": "Django", "difficulty": "medium", "questions": ["d1"]},
+        ])
+
+    monkeypatch.setattr(generator, "call_mistral", fake_call_mistral)
+    result = generator.generate_questions_for_techs(["Django", "Python", "React"], cache=cache)
+
+    assert [b["technology"] for b in result] == ["Django", "Python", "React"]
+    assert result[1]["questions"] == ["cached q"]
+    assert len(prompts) == 1
+    assert "Technologies: Django, React" in prompts[0]
+
+    # second call is served entirely from cache
+    result = generator.generate_questions_for_techs(["Django", "Python", "React"], cache=cache)
+    assert len(prompts) == 1
+    assert result[0]["questions"] == ["d1"]
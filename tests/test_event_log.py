@@ -0,0 +1,80 @@
+import gzip
+import json
+import threading
+
+from backend import event_log
+from backend.storage import load_candidate_with_questions, save_candidate_with_questions, search_candidates
+
+
+def _candidate(name):
+    return {"full_name": name, "email": f"{name.split()[0].lower()}@example.com", "tech_stack_raw": "Haskell"}
+
+
+def test_dedup_batching_and_rotation(tmp_path):
+    log = event_log.EventLog(str(tmp_path), max_bytes=600, flush_ms=1, dedup_seconds=60)
+    seqs = [log.append(_candidate(f"Log Person{i}"), ["Haskell"], ts=1000.0 + i) for i in range(8)]
+    assert seqs == list(range(1, 9))
+    assert log.append(_candidate("Log Person0"), ["haskell"], ts=1030.0) is None  # double-submit
+    assert log.append(_candidate("Log Person0"), ["Haskell"], ts=1100.0) == 9  # outside the window
+    assert log.flush(timeout=5)
+    log.close()
+
+    segments = event_log.list_segments(str(tmp_path))
+    assert segments and all(path.endswith(".gz") for _, _, path in segments)
+    with gzip.open(segments[0][2], "rt") as f:
+        assert json.loads(f.readline())["seq"] == segments[0][0]
+    events = list(event_log.iter_events(str(tmp_path)))
+    assert [e["seq"] for e in events] == list(range(1, 10))
+    assert [e["seq"] for e in event_log.iter_events(str(tmp_path), since_seq=7)] == [8, 9]
+
+    # a reopened log continues the sequence and remembers recent keys from the active segment
+    active_dir = str(tmp_path / "active")
+    first = event_log.EventLog(active_dir, flush_ms=1, dedup_seconds=60)
+    first.append(_candidate("Log Person0"), ["Haskell"], ts=1000.0)
+    first.close()
+    reopened = event_log.EventLog(active_dir, flush_ms=1, dedup_seconds=60)
+    assert reopened.append(_candidate("Log Person0"), ["Haskell"], ts=1010.0) is None
+    assert reopened.append(_candidate("Log Person99"), ["Haskell"], ts=1010.0) == 2
+    reopened.close()
+
+
+
+def test_forget_lets_a_failed_save_be_resubmitted(tmp_path):
+    log = event_log.EventLog(str(tmp_path), flush_ms=1, dedup_seconds=60)
+    assert log.append(_candidate("Retry Person"), ["Haskell"], key="retry-key", ts=1000.0) == 1
+    assert log.append(_candidate("Retry Person"), ["Haskell"], key="retry-key", ts=1001.0) is None
+    log.forget("retry-key")
+    assert log.append(_candidate("Retry Person"), ["Haskell"], key="retry-key", ts=1002.0) == 2
+    log.close()
+
+def test_replay_and_tail(tmp_path):
+    log = event_log.EventLog(str(tmp_path), flush_ms=1)
+    blocks = [{"technology": "Haskell", "difficulty": "hard", "questions": ["What is a monad transformer?"]}]
+    log.append({"full_name": "Replay Person", "tech_stack_raw": "Haskell"}, ["Haskell"], "hard", question_blocks=blocks)
+    log.flush(timeout=5)
+
+    summary = event_log.replay(str(tmp_path))
+    assert summary["candidates_saved"] == 1 and summary["pairs_generated"] == 0
+    hit = search_candidates("Replay Person")["items"][0]
+    saved = load_candidate_with_questions(hit["candidate"]["id"])
+    assert saved["question_blocks"][0]["questions"] == ["What is a monad transformer?"]
+    assert event_log.replay(str(tmp_path))["candidates_saved"] == 0  # checkpointed
+
+    # saved directly by the app (as it does after logging), then a full replay without the checkpoint
+    direct = {"full_name": "Direct Save Person", "tech_stack_raw": "Haskell"}
+    seq = log.append(direct, ["Haskell"], "hard", question_blocks=blocks, key="direct-key")
+    save_candidate_with_questions(direct, blocks, after_insert=event_log.mark_saved(seq, "direct-key"))
+    log.flush(timeout=5)
+    summary = event_log.replay(str(tmp_path), since_seq=0)
+    assert summary["candidates_saved"] == 0 and summary["already_saved"] == 2
+    assert search_candidates("Direct Save Person")["total"] == 1
+    assert search_candidates("Replay Person")["total"] == 1
+
+    stop = threading.Event()
+    follower = event_log.tail(str(tmp_path), since_seq=0, poll_interval=0.01, stop_event=stop)
+    seen = [next(follower)["seq"], next(follower)["seq"]]
+    log.append({"full_name": "Tail Person"}, ["Haskell"], "hard", question_blocks=blocks)
+    seen.append(next(follower)["seq"])
+    stop.set()
+    log.close()
+    assert seen == [1, 2, 3]
@@ -0,0 +1,68 @@
+import io
+import csv
+import json
+from datetime import datetime, timedelta
+
+from backend import export, storage
+from backend.utils import fallback_generate_questions
+
+
+def _rollup(day, tech_key, difficulty):
+    rows = [r for r in storage.load_rollups(since=day, until=day, technology=tech_key) if r["difficulty"] == difficulty]
+    return rows[0] if rows else {"blocks": 0, "questions": 0, "fallback_blocks": 0}
+
+
+def test_rollups_are_maintained_on_save_and_match_a_rebuild():
+    today = datetime.utcnow().date().isoformat()  # rollup days are UTC, like created_at
+    before = _rollup(today, "nim", "hard"), _rollup(today, "zig", "hard")
+    storage.save_candidate_with_questions({"full_name": "Rollup One", "tech_stack_raw": "Nim, Zig"}, [
+        {"technology": "Nim", "difficulty": "hard", "questions": ["Nim q1", "Nim q2"]},
+        fallback_generate_questions(["Zig"], "hard")[0],
+    ])
+    storage.save_candidates_bulk([({"full_name": "Rollup Two", "tech_stack_raw": "nim"},
+                                   [{"technology": "nim", "difficulty": "hard", "questions": ["Nim q3"]}])])
+
+    nim, zig = _rollup(today, "nim", "hard"), _rollup(today, "zig", "hard")
+    assert (nim["blocks"] - before[0]["blocks"], nim["questions"] - before[0]["questions"]) == (2, 3)
+    assert nim["fallback_blocks"] == before[0]["fallback_blocks"]
+    assert zig["fallback_blocks"] - before[1]["fallback_blocks"] == 1
+
+    incremental = storage.load_rollups()
+    assert storage.rebuild_rollups() == len(incremental)
+    assert storage.load_rollups() == incremental
+
+    summary = storage.rollup_summary(since=today, top=1000)
+    assert summary["blocks"] >= 3 and 0 < summary["fallback_rate"] < 1
+    assert {"tech_key": "zig", "blocks": zig["blocks"], "fallback_rate": round(zig["fallback_blocks"] / zig["blocks"], 4)} \
+        in summary["technologies"]
+    assert summary["difficulty_mix"]["hard"] >= 3
+    assert storage.rollup_summary(until=datetime.utcnow().date() - timedelta(days=3650))["blocks"] == 0
+
+
+def test_streaming_export_formats():
+    cid = storage.save_candidate_with_questions({"full_name": "Export Me", "email": "e@x.io", "tech_stack_raw": "Crystal"}, [
+        {"technology": "Crystal", "difficulty": "easy", "questions": ["Crystal q1", 'Has "quotes", commas']},
+    ])
+    bare = storage.save_candidate_with_questions({"full_name": "Export Bare", "tech_stack_raw": ""}, [])
+
+    out = io.StringIO()
+    count = export.export("candidates", out, "ndjson", since=datetime.utcnow().date(), batch_size=2)
+    records = {r["candidate"]["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+    assert count == len(records) and list(records) == sorted(records)
+    assert records[cid]["question_blocks"][0]["questions"] == ["Crystal q1", 'Has "quotes", commas']
+    assert records[bare]["question_blocks"] == []
+    assert records[cid] == storage.load_candidate_with_questions(cid)
+
+    out = io.StringIO()
+    export.export("questions", out, "csv", batch_size=3)
+    rows = [r for r in csv.DictReader(io.StringIO(out.getvalue())) if r["candidate_id"] == str(cid)]
+    assert [(r["position"], r["question"]) for r in rows] == [("1", "Crystal q1"), ("2", 'Has "quotes", commas')]
+
+    out = io.StringIO()
+    export.export("candidates", out, "csv")
+    row = next(r for r in csv.DictReader(io.StringIO(out.getvalue())) if r["id"] == str(cid))
+    assert (row["technologies"], row["question_count"]) == ("Crystal", "2")
+
+    out = io.StringIO()
+    export.export("rollups", out, "ndjson", since=datetime.utcnow().date())
+    assert any(r["tech_key"] == "crystal" and r["difficulty"] == "easy" for r in map(json.loads, out.getvalue().splitlines()))
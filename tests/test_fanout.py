@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+
+from backend import generator
+
+
+def _fake_llm(fail_for=(), slow_for=(), delay=0.0):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        techs = prompt.split("Technologies: ", 1)[1].split("\n", 1)[0].split(", ")
+        with lock:
+            calls.append(techs)
+        if any(t in slow_for for t in techs):
+            time.sleep(delay)
+        if any(t in fail_for for t in techs):
+            return {"output": "not json at all"}
+        blocks = [{"technology": t, "difficulty": "medium", "questions": [f"llm {t}"]} for t in techs]
+        return {"output": json.dumps({"technology_questions": blocks})}
+
+    return fake_call_mistral, calls
+
+
+def test_fan_out_merges_in_order_and_falls_back_per_tech(monkeypatch):
+    monkeypatch.setattr(generator, "DEDUP_ENABLED", False)  # the fake repeats one template per tech
+    fake, calls = _fake_llm(fail_for={"Go"})
+    monkeypatch.setattr(generator, "call_mistral", fake)
+    techs = ["Python", "Go", "React", "Django"]
+    result = generator.generate_questions_for_techs(techs, cache=False, fan_out=True, group_size=1, max_workers=4)
+
+    assert [b["technology"] for b in result] == techs
+    assert len(calls) == 4
+    assert result[0]["questions"] == ["llm Python"]
+    assert result[1]["questions"][0] != "llm Go"  # templated fallback
+    assert result[3]["questions"] == ["llm Django"]
+
+
+def test_fan_out_groups_and_deadline(monkeypatch):
+    monkeypatch.setattr(generator, "DEDUP_ENABLED", False)  # the fake repeats one template per tech
+    fake, calls = _fake_llm(slow_for={"Rust"}, delay=1.0)
+    monkeypatch.setattr(generator, "call_mistral", fake)
+    techs = ["Python", "Go", "Rust", "React"]
+    start = time.monotonic()
+    result = generator.generate_questions_for_techs(techs, cache=False, fan_out=True, group_size=2, max_workers=2, deadline=0.3)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.9
+    assert sorted(len(c) for c in calls) == [2, 2]
+    assert result[0]["questions"] == ["llm Python"]
+    # the slow group missed the deadline and was filled in by the fallback
+    assert result[2]["questions"][0] != "llm Rust"
+    assert result[3]["questions"][0] != "llm React"
+
+
+def test_streaming_parser_yields_blocks_as_they_complete():
+    from backend.utils import StreamingBlockParser
+
+    text = '```json\n{"technology_questions": [{"technology": "Python", "questions": ["What does `{}` mean?"]}, {"technology": "Go", "questions": ["q"]}]}'
+    parser = StreamingBlockParser()
+    split = text.index(', {"technology": "Go"')
+    first = []
+    for i in range(0, split, 7):
+        first.extend(parser.feed(text[i:min(i + 7, split)]))
+    assert [b["technology"] for b in first] == ["Python"]
+    assert [b["technology"] for b in parser.feed(text[split:])] == ["Go"]
+    assert parser.done
+
+
+def test_stream_questions_for_techs(monkeypatch):
+    doc = json.dumps({"technology_questions": [
+        {"technology": "react", "difficulty": "medium", "questions": ["r1"]},
+        {"technology": "Python", "difficulty": "medium", "questions": ["p1"]},
+    ]})
+
+    def fake_stream(prompt, model=None, temperature=0.2, timeout=30):
+        for i in range(0, len(doc), 5):
+            yield {"choices": [{"delta": {"content": doc[i:i + 5]}}]}
+
+    monkeypatch.setattr(generator, "stream_mistral", fake_stream)
+    pairs = list(generator.stream_questions_for_techs(["Python", "React", "Go"], cache=False))
+    assert [t for t, _ in pairs] == ["React", "Python", "Go"]
+    assert pairs[0][1]["questions"] == ["r1"]
+    assert pairs[2][1]["questions"][0] != "q"  # fallback for the tech the stream never produced
+
+
+def test_stream_renamed_block_takes_first_uncovered_tech(monkeypatch):
+    doc = json.dumps({"technology_questions": [
+        {"technology": "Go", "difficulty": "medium", "questions": ["g1"]},
+        {"technology": "Python 3", "difficulty": "medium", "questions": ["p1"]},
+    ]})
+
+    def fake_stream(prompt, model=None, temperature=0.2, timeout=30):
+        yield {"choices": [{"delta": {"content": doc}}]}
+
+    monkeypatch.setattr(generator, "stream_mistral", fake_stream)
+    pairs = dict(generator.stream_questions_for_techs(["Erlang", "Go"], cache=False))
+    assert pairs["Go"]["questions"] == ["g1"]
+    assert pairs["Erlang"]["questions"] == ["p1"]  # renamed block is kept, not dropped for the fallback
@@ -0,0 +1,99 @@
+import json
+import threading
+import http.client
+import urllib.error
+import urllib.request
+
+import pytest # type: ignore
+
+from backend import jobs
+from backend.http_api import make_server
+from backend.storage import load_candidate_with_questions, search_candidates
+
+
+def _fake_generate(techs, difficulty="medium", model=None, years_experience=None, **kwargs):
+    return [{"technology": t, "difficulty": difficulty, "questions": [f"{t} job q"]} for t in techs]
+
+
+def test_enqueue_dedupes_and_worker_saves_result(monkeypatch):
+    monkeypatch.setattr(jobs, "generate_questions_for_techs", _fake_generate)
+    candidate = {"full_name": "Queue Person", "email": "q@example.com", "tech_stack_raw": "Python, Go"}
+    job_id = jobs.enqueue_generation(candidate, ["Python", "Go"], difficulty="hard")
+    assert jobs.enqueue_generation(candidate, ["python", "go"], difficulty="hard") == job_id
+    assert jobs.get_job(job_id)["status"] == "queued"
+
+    assert jobs.worker_loop(worker_id="test", stop_when_idle=True) >= 1
+    job = jobs.get_job(job_id)
+    assert job["status"] == "done"
+    assert [b["technology"] for b in job["result"]] == ["Python", "Go"]
+    saved = load_candidate_with_questions(job["candidate_id"])
+    assert saved["candidate"]["full_name"] == "Queue Person"
+    assert saved["question_blocks"][0]["questions"] == ["Python job q"]
+
+    # a finished duplicate is served from the stored result, not regenerated
+    assert jobs.enqueue_generation(candidate, ["Python", "Go"], difficulty="hard") == job_id
+
+
+def test_failed_job_and_stale_lease(monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("generator exploded")
+
+    monkeypatch.setattr(jobs, "generate_questions_for_techs", boom)
+    job_id = jobs.enqueue_generation({"full_name": "Failing"}, ["Rust"], save=False)
+    jobs.worker_loop(worker_id="test", stop_when_idle=True)
+    job = jobs.get_job(job_id)
+    assert job["status"] == "failed" and "generator exploded" in job["error"]
+
+    stale_id = jobs.enqueue_generation({"full_name": "Stale"}, ["Rust"], save=False)
+    assert jobs.claim_next_job("dead-worker")[0] == stale_id
+    assert jobs.requeue_stale_jobs(lease_seconds=-1)[0] >= 1
+    assert jobs.get_job(stale_id)["status"] == "queued"
+
+
+def test_http_api_round_trip(monkeypatch):
+    monkeypatch.setattr(jobs, "generate_questions_for_techs", _fake_generate)
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        body = json.dumps({"candidate": {"full_name": "Api Person"}, "tech_stack_raw": "nodejs, postgres"}).encode()
+        req = urllib.request.Request(base + "/jobs", data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req) as resp:
+            assert resp.status == 202
+            job_id = json.load(resp)["job_id"]
+        jobs.worker_loop(worker_id="test", stop_when_idle=True)
+        with urllib.request.urlopen(f"{base}/jobs/{job_id}") as resp:
+            job = json.load(resp)
+        assert job["status"] == "done"
+        assert [b["technology"] for b in job["result"]] == ["Node.js", "PostgreSQL"]
+        for length in ("abc", "-1"):
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            conn.putrequest("POST", "/jobs")
+            conn.putheader("Content-Length", length)
+            conn.endheaders()
+            assert conn.getresponse().status == 400
+            conn.close()
+        for bad in ([1, 2], {"candidate": "Api Person", "techs": ["Go"]}, {"techs": "Go"}, {"techs": ["Go", 3]}):
+            req = urllib.request.Request(base + "/jobs", data=json.dumps(bad).encode())
+            with pytest.raises(urllib.error.HTTPError) as err:
+                urllib.request.urlopen(req)
+            assert err.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_worker_that_lost_its_lease_does_not_finish_the_job(monkeypatch):
+    monkeypatch.setattr(jobs, "generate_questions_for_techs", _fake_generate)
+    job_id = jobs.enqueue_generation({"full_name": "Lease Person"}, ["Crystal"])
+    slow_id, payload, slow_claim = jobs.claim_next_job("slow-worker")
+    assert slow_id == job_id
+    jobs.requeue_stale_jobs(lease_seconds=-1)
+    _, _, fresh_claim = jobs.claim_next_job("fresh-worker")
+
+    jobs.run_job(job_id, payload, slow_claim)  # finishes late: its save is rolled back
+    assert jobs.get_job(job_id)["status"] == "running"
+    jobs.run_job(job_id, payload, fresh_claim)
+    job = jobs.get_job(job_id)
+    assert job["status"] == "done"
+    assert search_candidates("Lease Person")["total"] == 1
@@ -0,0 +1,51 @@
+import json
+
+import pytest # type: ignore
+
+from backend.utils import JSONExtractor, extract_json, extract_json_blob
+
+
+def test_braces_inside_strings_are_ignored():
+    raw = 'Sure! {"q": "What does `{}` mean in Python?", "b": "close } and \\" quote"} trailing {'
+    assert extract_json(raw) == {"q": "What does `{}` mean in Python?", "b": 'close } and " quote'}
+    assert json.loads(extract_json_blob(raw))["q"] == "What does `{}` mean in Python?"
+
+
+def test_code_fence_and_trailing_commas():
+    raw = 'Here you go:\n```json\n{"technology_questions": [{"technology": "Go", "questions": ["a", "b",],},],}\n```'
+    parsed = extract_json(raw)
+    assert parsed["technology_questions"][0]["questions"] == ["a", "b"]
+
+
+def test_truncated_output_keeps_complete_elements():
+    raw = '{"technology_questions": [{"technology": "Python", "questions": ["p1", "p2"]}, {"technology": "Go", "questions": ["g1", "g'
+    parsed = extract_json(raw)
+    blocks = parsed["technology_questions"]
+    assert blocks[0] == {"technology": "Python", "questions": ["p1", "p2"]}
+    assert blocks[1]["questions"] == ["g1"]
+    with pytest.raises(ValueError):
+        extract_json(raw, repair=False)
+    with pytest.raises(ValueError):
+        extract_json_blob(raw)
+
+
+def test_chunked_feed_matches_whole_text():
+    doc = {"technology_questions": [{"technology": "C#", "questions": ['Escape \\" and {braces}', "x"]}]}
+    text = "prefix " + json.dumps(doc) + " suffix"
+    extractor = JSONExtractor()
+    for i in range(0, len(text), 3):
+        extractor.feed(text[i:i + 3])
+    assert extractor.complete
+    assert extractor.result() == doc
+
+
+def test_fence_after_or_inside_the_object_is_ignored():
+    assert extract_json('{"a": 1}\n```') == {"a": 1}
+    doc = {"technology_questions": [{"technology": "Python", "questions": ["Explain ```print()``` output"]}]}
+    text = "Here:\n" + json.dumps(doc)
+    assert extract_json(text) == doc
+    assert json.loads(extract_json_blob(text)) == doc
+    extractor = JSONExtractor()
+    for i in range(0, len(text), 4):
+        extractor.feed(text[i:i + 4])
+    assert extractor.result() == doc
@@ -0,0 +1,40 @@
+from backend import storage
+from backend.matching import CandidateMatcher, match_candidates
+
+
+def _save(name, stack, years):
+    return storage.save_candidate_with_questions(
+        {"full_name": name, "tech_stack_raw": stack, "years_experience": years}, [])
+
+
+def test_match_ranks_by_overlap_experience_and_must_haves():
+    strong = _save("Match Strong", "OCaml, Erlang, Clojure", 6)
+    partial = _save("Match Partial", "ocaml; F#", 10)
+    (no_must,) = storage.save_candidates_bulk([({"full_name": "Match NoMust", "tech_stack_raw": "Erlang, Clojure",
+                                                 "years_experience": 2}, [])])
+    matcher = CandidateMatcher(reload_seconds=0)
+
+    hits = matcher.match("OCaml, Erlang, Clojure", k=5, target_years=5)
+    ranked = [h["candidate_id"] for h in hits if h["candidate_id"] in (strong, partial, no_must)]
+    assert ranked == [strong, no_must, partial]
+    assert hits[0]["matched"] == ["ocaml", "erlang", "clojure"] and hits[0]["score"] == 1.0
+
+    must = [h["candidate_id"] for h in matcher.match("OCaml, Erlang, Clojure", must_have="OCaml", k=5)]
+    assert no_must not in must and strong in must
+    assert [h["candidate_id"] for h in matcher.match("F#", min_years=8)] == [partial]
+
+    # new candidates extend the loaded view; a rebuild of the index forces a full reload
+    late = _save("Match Late", "F#, OCaml", None)
+    assert late in [h["candidate_id"] for h in matcher.match("F#")]
+    assert storage.rebuild_tech_index() > 0
+    hits = match_candidates("F#", k=5, matcher=matcher)
+    assert {h["candidate"]["full_name"] for h in hits} == {"Match Partial", "Match Late"}
+
+
+def test_from_rows_top_k_and_weights():
+    matcher = CandidateMatcher.from_rows(
+        [1, 2, 3, 4], [1, None, 3, 9], [("go", 1), ("rust", 1), ("go", 2), ("rust", 3), ("go", 4)])
+    assert [h["candidate_id"] for h in matcher.match(["Go", "Rust"], k=1)] == [1]
+    weighted = matcher.match(["Go", "Rust"], weights={"rust": 3}, experience_weight=0)
+    assert [h["candidate_id"] for h in weighted] == [1, 3, 2, 4]
+    assert matcher.match(["Haskell"]) == []
@@ -0,0 +1,65 @@
+import json
+import threading
+import urllib.request
+
+from backend import generator, metrics
+from backend.http_api import make_server
+
+
+def test_spans_counters_and_prometheus_text():
+    registry = metrics.Registry(buckets=(0.01, 0.1))
+    registry.observe("demo_seconds", 0.005, (("op", "a"),))
+    registry.observe("demo_seconds", 0.05, (("op", "a"),))
+    registry.inc("demo_total", 3, (("reason", 'say "hi"'),))
+    registry.register_gauge("demo_gauge", lambda: 7)
+
+    snap = registry.snapshot()
+    row = snap["histograms"]["demo_seconds"][0]
+    assert row["labels"] == {"op": "a"} and row["count"] == 2
+    assert 0 < row["p50_ms"] <= 10
+    assert snap["gauges"]["demo_gauge"][0]["value"] == 7
+
+    text = registry.render_prometheus()
+    assert "# TYPE demo_seconds histogram" in text
+    assert 'demo_seconds_bucket{op="a",le="0.01"} 1' in text
+    assert 'demo_seconds_bucket{op="a",le="+Inf"} 2' in text
+    assert 'demo_total{reason="say \\"hi\\""} 3' in text
+    assert "demo_gauge 7" in text
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    metrics.reset()
+    with metrics.span("off_seconds"):
+        pass
+    metrics.inc("off_total")
+    assert metrics.timed("off_seconds")(lambda: 5)() == 5
+    snap = metrics.snapshot()
+    assert "off_seconds" not in snap["histograms"] and "off_total" not in snap["counters"]
+
+
+def test_generation_failure_counts_fallback_and_serves_metrics(monkeypatch):
+    def fake_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        raise RuntimeError("API not available")
+
+    monkeypatch.setattr(generator, "call_mistral", fake_call_mistral)
+    metrics.reset()
+    generator.generate_questions_for_techs(["Elixir"], cache=False, bank=False)
+    snap = metrics.snapshot()
+    assert snap["counters"]["talentscout_fallbacks_total"][0]["value"] == 1
+    stages = {r["labels"]["stage"] for r in snap["histograms"]["talentscout_stage_seconds"]}
+    assert {"mistral_call", "fallback", "total"} <= stages
+    assert snap["counters"]["talentscout_stage_errors_total"][0]["labels"] == {"stage": "mistral_call"}
+
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(base + "/metrics") as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "talentscout_fallbacks_total 1" in resp.read().decode()
+        with urllib.request.urlopen(base + "/metrics.json") as resp:
+            assert "talentscout_stage_seconds" in json.load(resp)["histograms"]
+    finally:
+        server.shutdown()
+        server.server_close()
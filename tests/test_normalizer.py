@@ -0,0 +1,30 @@
+from backend.normalizer import TechNormalizer, get_default_normalizer
+from backend.utils import split_tech_stack
+
+
+def test_aliases_versions_and_typos_collapse_to_one_name():
+    assert split_tech_stack("nodejs, node.js, Node") == ["Node.js"]
+    assert split_tech_stack("python3.11; Python 3; pytho; Pyhton") == ["Python"]
+    assert split_tech_stack("Djangoo, Kubernets, Postgress") == ["Django", "Kubernetes", "PostgreSQL"]
+    assert split_tech_stack("C++17, c#, .NET core, CI/CD") == ["C++", "C#", ".NET", "CI/CD"]
+
+
+def test_compound_entries_and_unknown_techs():
+    assert split_tech_stack("React + Redux, Spring Boot") == ["React", "Redux", "Spring Boot"]
+    assert split_tech_stack("python/django") == ["Python", "Django"]
+    assert split_tech_stack("Foobar DB, go") == ["Foobar Db", "Go"]
+
+
+def test_free_text_extraction_skips_ambiguous_words():
+    normalizer = get_default_normalizer()
+    assert normalizer.extract("5 yrs react + redux, some k8s") == ("React", "Redux", "Kubernetes")
+    assert normalizer.extract("I will go to the next rest stop") == ()
+
+
+def test_custom_dictionary_and_memoization():
+    normalizer = TechNormalizer({"Acme Engine": ["acme", "acme-eng"]})
+    assert normalizer.normalize("ACME eng") == "Acme Engine"
+    assert normalizer.normalize("acmme engine") == "Acme Engine"
+    assert normalizer.normalize("something else") is None
+    normalizer.normalize("ACME eng")
+    assert normalizer.normalize.cache_info().hits >= 1
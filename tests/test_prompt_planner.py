@@ -0,0 +1,54 @@
+import json
+import threading
+
+from backend import generator
+from backend.prompts import ENVELOPE_TOKENS, PROMPT_PREFIX, PromptPlanner, build_generation_prompt
+
+TECHS = ["Python", "Django", "React", "PostgreSQL", "Docker", "Kubernetes", "Go", "TypeScript", "Redis", "AWS"]
+
+
+def test_plan_fits_budget_with_fewest_groups():
+    planner = PromptPlanner(budget=512)
+    groups = planner.plan(TECHS, "medium")
+    assert sorted(t for g in groups for t in g) == sorted(TECHS)
+    assert all(planner.estimate(g, "medium") <= 512 for g in groups)
+    per_tech = max(planner.block_tokens(t, "medium") for t in TECHS)
+    assert len(groups) <= -(-len(TECHS) * per_tech // (512 - ENVELOPE_TOKENS))
+    assert all(g == sorted(g, key=TECHS.index) for g in groups)  # original order inside a group
+    assert planner.plan(["Python"], "medium") == [["Python"]]
+    assert build_generation_prompt(["Go"], "hard").startswith(PROMPT_PREFIX)
+
+
+def test_record_tunes_the_estimate():
+    planner = PromptPlanner(budget=512)
+    before = len(planner.plan(TECHS, "medium"))
+    for _ in range(20):
+        planner.record(["Python", "Go"], "medium", ENVELOPE_TOKENS + 2 * 40, 2)  # short answers
+    assert len(planner.plan(TECHS, "medium")) < before
+    shrunk = planner.block_tokens("Go", "medium")
+    assert planner.record(["Python", "Go"], "medium", 510, 1) is True  # hit the budget: truncated
+    assert planner.block_tokens("Go", "medium") > shrunk
+    stats = planner.stats()
+    assert stats["truncated"] == 1 and stats["requests"] == 21
+
+
+def test_large_stack_is_split_instead_of_truncated(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fake_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        techs = prompt.split("Technologies: ", 1)[1].split("\n", 1)[0].split(", ")
+        with lock:
+            calls.append(techs)
+        blocks = [{"technology": t, "difficulty": "medium", "questions": [f"planned {t}"]} for t in techs]
+        return {"output": json.dumps({"technology_questions": blocks}), "usage": {"completion_tokens": 30 * len(techs)}}
+
+    planner = PromptPlanner(budget=400)
+    monkeypatch.setattr(generator, "get_default_planner", lambda: planner)
+    monkeypatch.setattr(generator, "call_mistral", fake_call_mistral)
+    monkeypatch.setattr(generator, "DEDUP_ENABLED", False)  # the fake repeats one template per tech
+    result = generator.generate_questions_for_techs(TECHS, cache=False, bank=False)
+
+    assert [b["questions"] for b in result] == [[f"planned {t}"] for t in TECHS]
+    assert len(calls) > 1 and all(planner.estimate(c, "medium") <= 400 for c in calls)
+    assert planner.stats()["actual_tokens"] == 30 * len(TECHS)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update # type: ignore
+
+from backend import generator, question_bank, storage
+from backend.models import QuestionBankEntry
+from backend.storage import run_write
+
+
+TOPICS = [
+    "How does garbage collection work", "Explain the module import system", "Describe error handling idioms",
+    "When would you reach for concurrency primitives", "Walk through packaging and dependency pinning",
+    "What are the trade-offs of dynamic typing", "How do you profile memory usage", "Compare testing frameworks",
+    "Why do closures capture variables late", "Explain serialization pitfalls", "How is string interning done",
+    "Describe the build toolchain",
+]
+
+
+def _fake_call_mistral(calls):
+    def fake(prompt, model=None, temperature=0.2, timeout=30):
+        calls.append(prompt)
+        techs = prompt.split("Technologies: ")[1].split("\n")[0].split(", ")
+        topics = TOPICS[(len(calls) - 1) * 3:len(calls) * 3]
+        return {"output": '{"technology_questions": [%s]}' % ", ".join(
+            '{"technology": "%s", "questions": [%s]}' % (t, ", ".join('"%s in %s?"' % (topic, t) for topic in topics))
+            for t in techs)}
+    return fake
+
+
+def test_warm_up_then_serve_without_llm(monkeypatch):
+    calls = []
+    monkeypatch.setattr(generator, "call_mistral", _fake_call_mistral(calls))
+    bank = question_bank.QuestionBank(min_entries=5, sample_size=4, reload_seconds=0)
+
+    summary = question_bank.warm_up(["Bankscript", "Bankbase"], difficulties=["medium"], per_pair=6, bank=bank)
+    assert summary["questions_added"] == 12
+    assert bank.count("bankscript", "medium") == 6
+    # warm-up stops once every pair is full: 2 rounds of 3 new questions
+    assert len(calls) == 2
+
+    calls.clear()
+    blocks = generator.generate_questions_for_techs(["Bankscript", "Unbanked Tool"], difficulty="medium",
+                                                    bank=bank, cache=False)
+    assert len(blocks[0]["questions"]) == 4
+    assert all(q.endswith("in Bankscript?") for q in blocks[0]["questions"])
+    # only the unknown tech reaches the LLM
+    assert len(calls) == 1 and "Technologies: Unbanked Tool\n" in calls[0]
+
+
+def test_refresh_rotates_stale_entries(monkeypatch):
+    calls = []
+    monkeypatch.setattr(generator, "call_mistral", _fake_call_mistral(calls))
+    bank = question_bank.QuestionBank(min_entries=1, reload_seconds=0)
+    question_bank.warm_up(["Rotatelang"], difficulties=["hard"], per_pair=3, bank=bank)
+    old = datetime.utcnow() - timedelta(days=90)
+    run_write(lambda s: s.execute(update(QuestionBankEntry)
+                                  .where(QuestionBankEntry.tech_key == "rotatelang")
+                                  .values(created_at=old)))
+
+    result = question_bank.refresh_stale(max_age_days=30, bank=bank)
+    assert result == {"pairs": 1, "added": 3, "removed": 3}
+    assert bank.count("Rotatelang", "hard") == 3
+    assert set(bank.sample("Rotatelang", "hard", k=3)["questions"]) == {f"{topic} in Rotatelang?" for topic in TOPICS[3:6]}
+
+
+def test_bank_is_opt_in_and_add_appends_without_reloading():
+    assert question_bank.get_default_bank() is None  # TALENTSCOUT_QUESTION_BANK is unset
+
+    bank = question_bank.QuestionBank(min_entries=1, reload_seconds=3600)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(storage.engine, "before_cursor_execute", listener)
+    try:
+        assert bank.add("Appendlang", "easy", ["What is a thunk in Appendlang?"]) == 1
+        loads = sum("JOIN question_texts" in s for s in statements)
+        assert bank.add("Appendlang", "easy", ["How are modules resolved in Appendlang?"]) == 1
+        assert bank.add("Appendlang", "easy", ["What is a thunk in Appendlang?"]) == 0
+    finally:
+        event.remove(storage.engine, "before_cursor_execute", listener)
+    assert sum("JOIN question_texts" in s for s in statements) == loads  # no reload after the first
+    assert bank.count("Appendlang", "easy") == 2
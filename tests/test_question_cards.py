@@ -0,0 +1,20 @@
+from app.question_cards import blocks_markdown, cards_html, cards_height, questions_text
+
+BLOCKS = [
+    {"technology": "Python", "difficulty": "hard", "questions": ["What does `yield` do?", "Why is <b>GIL</b> & co. slow?"]},
+    {"technology": "<img src=x onerror=alert(1)>", "questions": ["Close it: </script><script>alert(1)</script>"]},
+]
+
+
+def test_cards_html_is_one_escaped_payload():
+    doc = cards_html(BLOCKS)
+    assert doc.count('class="copy-btn"') == 2 and doc.count("<script>") == 1
+    assert "<img" not in doc and "&lt;b&gt;GIL&lt;/b&gt; &amp; co." in doc
+    assert "</script><script>alert" not in doc  # question text cannot end the copy script
+    assert questions_text(BLOCKS[0]) == "1. What does `yield` do?\n2. Why is <b>GIL</b> & co. slow?"
+    assert 0 < cards_height(BLOCKS) <= 1600
+
+
+def test_blocks_markdown():
+    assert blocks_markdown(BLOCKS[:1]) == "**Python** (hard)\n\n1. What does `yield` do?\n2. Why is <b>GIL</b> & co. slow?\n"
+    assert blocks_markdown([]) == ""
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+
+import pytest # type: ignore
+
+from backend import api_client, generator
+from backend.routing import Route, Router
+
+
+def _fake_call(delays, calls):
+    lock = threading.Lock()
+
+    def call(prompt, model=None, temperature=0.2, timeout=30):
+        with lock:
+            calls.append(model)
+        cancel = api_client._call_context.cancel
+        if cancel.wait(delays.get(model, 0)):
+            raise api_client.RequestCancelled("cancelled")
+        return {"output": model}
+
+    return call
+
+
+def test_hedge_to_second_model_when_primary_is_slow():
+    calls = []
+    router = Router([Route("slow"), Route("fast")], hedge_delay=0.05)
+    started = time.monotonic()
+    result = router.generate("p", lambda resp: resp["output"], deadline=5, call=_fake_call({"slow": 2.0}, calls))
+
+    assert result == "fast" and calls == ["slow", "fast"]
+    assert time.monotonic() - started < 1.0
+    # the loser is called off and recorded as a latency lower bound, not an error
+    time.sleep(0.05)
+    assert router.stats()["slow"]["samples"] == 1 and router.stats()["slow"]["error_rate"] == 0.0
+
+
+def test_deadline_budget_and_failover():
+    calls = []
+    router = Router([Route("a")], hedge_delay=0.05, budget=0.0, burst=1)
+    call = _fake_call({"a": 0.3}, calls)
+    assert router.generate("p", lambda resp: resp["output"], deadline=5, call=call) == "a"
+    assert calls == ["a", "a"]  # hedged to the same model: the only route
+    calls.clear()
+    router.generate("p", lambda resp: resp["output"], deadline=5, call=call)
+    assert calls == ["a"]  # hedge budget spent
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        router.generate("p", lambda resp: resp, deadline=0.1, call=call)
+    assert time.monotonic() - started < 0.25
+
+    def reject_bad(resp):
+        if resp["output"] == "bad":
+            raise ValueError("unparseable")
+        return resp["output"]
+
+    calls.clear()
+    router = Router([Route("bad"), Route("good")], hedge_delay=5)
+    assert router.generate("p", reject_bad, deadline=5, call=_fake_call({}, calls)) == "good"
+    assert calls == ["bad", "good"]
+    for _ in range(5):
+        router.routes[0].stats.record(0.01, error=True)
+    assert [r.name for r in router.order()] == ["good", "bad"]
+    assert router.order("bad")[0].name == "bad"
+
+
+def test_generation_serves_fallback_at_the_deadline(monkeypatch):
+    def slow_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        time.sleep(1.0)
+        return {"output": json.dumps({"technology_questions": [{"technology": "Elixir", "questions": ["llm"]}]})}
+
+    monkeypatch.setattr(generator, "call_mistral", slow_call_mistral)
+    monkeypatch.setattr(generator, "get_default_router", lambda: Router([Route(None)], hedge=False))
+    started = time.monotonic()
+    result = generator.generate_questions_for_techs(["Elixir"], cache=False, bank=False, deadline=0.2)
+    assert time.monotonic() - started < 0.6
+    assert result[0]["questions"] and result[0]["questions"] != ["llm"]
+
+
+def test_dedupe_regeneration_shares_the_request_deadline(monkeypatch):
+    def slow_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        time.sleep(0.7)
+        questions = ["What is OTP in Erlang?", "What is OTP in Erlang ?", "Explain Erlang supervisors."]
+        return {"output": json.dumps({"technology_questions": [{"technology": "Erlang", "questions": questions}]})}
+
+    monkeypatch.setattr(generator, "call_mistral", slow_call_mistral)
+    monkeypatch.setattr(generator, "get_default_router", lambda: Router([Route(None)], hedge=False))
+    started = time.monotonic()
+    result = generator.generate_questions_for_techs(["Erlang"], cache=False, bank=False, deadline=1.0)
+    # the regeneration round only gets what the first call left of the 1s budget
+    assert time.monotonic() - started <= 1.1
+    assert len(result[0]["questions"]) == 3
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+
+from backend import generator, similarity
+from backend.models import QuestionText
+from backend.storage import SessionLocal, save_candidate_with_questions
+
+
+def test_dedupe_blocks_within_and_across_technologies():
+    blocks = [
+        {"technology": "Python", "questions": [
+            "Explain the main use-cases of Python.",
+            "How does the GIL affect multithreading in Python?",
+            "Explain the main use cases of Python?",
+        ]},
+        {"technology": "Django", "questions": [
+            "Explain the main use-cases of Django.",
+            "How does the Django ORM avoid N+1 queries?",
+        ]},
+    ]
+    deduped, dropped = similarity.dedupe_blocks(blocks)
+    assert deduped[0]["questions"] == blocks[0]["questions"][:2]
+    assert deduped[1]["questions"] == ["How does the Django ORM avoid N+1 queries?"]
+    assert dropped == [["Explain the main use cases of Python?"], ["Explain the main use-cases of Django."]]
+
+    vectors = similarity.embed(["What is a closure?", "What is a closure?", "Describe Kafka partitions."])
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert similarity.near_duplicate_mask(vectors, batch_size=1).tolist() == [True, False, True]
+
+
+def test_generator_regenerates_blocks_left_short(monkeypatch):
+    responses = [
+        [{"technology": "Go", "questions": ["What are goroutines in Go?", "What are goroutines in Go ?", "Explain Go channels."]}],
+        [{"technology": "Go", "questions": ["Explain Go channels!", "How does the Go scheduler preempt work?"]}],
+    ]
+    temperatures = []
+
+    def fake_call_mistral(prompt, model=None, temperature=0.2, timeout=30):
+        temperatures.append(temperature)
+        return {"output": json.dumps({"technology_questions": responses[len(temperatures) - 1]})}
+
+    monkeypatch.setattr(generator, "call_mistral", fake_call_mistral)
+    result = generator.generate_questions_for_techs(["Go"], cache=False, bank=False)
+    assert result[0]["questions"] == [
+        "What are goroutines in Go?", "Explain Go channels.", "How does the Go scheduler preempt work?",
+    ]
+    assert temperatures == [0.2, 0.7]
+
+
+def test_vector_index_finds_corpus_duplicates(tmp_path):
+    save_candidate_with_questions(
+        {"full_name": "Vector Person", "tech_stack_raw": "Kafka"},
+        [{"technology": "Kafka", "difficulty": "medium", "questions": [
+            "How are Kafka partitions assigned to consumers?",
+            "How are Kafka partitions assigned to consumers ?",
+            "What is log compaction?",
+        ]}],
+    )
+    index = similarity.VectorIndex(str(tmp_path / "index"), dim=512)
+    assert similarity.update_index(index) >= 3
+    assert similarity.update_index(index) == 0  # incremental
+
+    session = SessionLocal()
+    try:
+        ids = {text: qid for qid, text in session.query(QuestionText.id, QuestionText.text)
+               .filter(QuestionText.text.like("How are Kafka partitions%"))}
+    finally:
+        session.close()
+    reopened = similarity.VectorIndex(str(tmp_path / "index"))
+    pairs = {(a, b) for a, b, _ in reopened.near_duplicate_pairs(threshold=0.8, chunk_rows=2)}
+    assert tuple(sorted(ids.values())) in pairs
+    best = reopened.search(["what is log compaction"], k=1)[0]
+    assert best and best[0][1] > 0.9
+
+
+def test_masking_replaces_whole_technology_names_only():
+    masked = similarity._prepare("How does pointer arithmetic work in C? Compare C++ and C#.", ["Python", "C", "R", "C++", "C#"])
+    assert masked == b" how does pointer arithmetic work in tech compare tech and tech "
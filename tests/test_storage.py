@@ -0,0 +1,185 @@
+import os
+import sys
+import subprocess
+
+from sqlalchemy import event # type: ignore
+
+from backend import storage
+
+
+def _count_queries(fn):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if statement not in ("BEGIN", "COMMIT", "ROLLBACK"):
+            statements.append(statement)
+
+    event.listen(storage.engine, "before_cursor_execute", before)
+    try:
+        result = fn()
+    finally:
+        event.remove(storage.engine, "before_cursor_execute", before)
+    return result, statements
+
+
+def _save(name, techs=("Python", "Go")):
+    blocks = [{"technology": t, "difficulty": "medium", "questions": [f"{t} q1", f"{t} q2"]} for t in techs]
+    return storage.save_candidate_with_questions({"full_name": name, "tech_stack_raw": ", ".join(techs)}, blocks)
+
+
+def test_recent_view_has_no_n_plus_one_and_is_cached():
+    for i in range(6):
+        _save(f"recent-{i}")
+    storage._invalidate_read_cache()
+
+    recent, statements = _count_queries(lambda: storage.load_recent_with_questions(5))
+    assert len(recent) == 5
+    assert recent[0]["candidate"]["full_name"] == "recent-5"
+    assert recent[0]["question_blocks"][1]["questions"] == ["Go q1", "Go q2"]
+    # MAX(id) probe + candidates + one selectin load for all blocks + one for their questions
+    assert len(statements) == 4
+
+    _, statements = _count_queries(lambda: storage.load_recent_with_questions(5))
+    assert len(statements) == 1
+
+    _save("recent-new")
+    recent = storage.load_recent_with_questions(5)
+    assert recent[0]["candidate"]["full_name"] == "recent-new"
+
+
+def test_keyset_pagination_walks_every_candidate_once():
+    seen = []
+    cursor = None
+    while True:
+        page = storage.load_recent_page(limit=3, cursor=cursor)
+        seen.extend(item["candidate"]["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen))
+    assert seen == sorted(seen, reverse=True)
+    session = storage.SessionLocal()
+    assert len(seen) == session.query(storage.Candidate).count()
+    session.close()
+
+    # cached pages are handed out as copies: editing one does not change the next read
+    first = storage.load_recent_page(limit=3)
+    first["items"][0]["candidate"]["full_name"] = "edited by the caller"
+    first["items"].clear()
+    again = storage.load_recent_page(limit=3)
+    assert again["items"] and again["items"][0]["candidate"]["full_name"] != "edited by the caller"
+
+
+def test_group_commit_batches_concurrent_writes_and_isolates_failures():
+    import threading
+    from sqlalchemy import text # type: ignore
+
+    with storage.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+
+    writer = storage.GroupCommitWriter(storage.SessionLocal, window_ms=20)
+    barrier = threading.Barrier(8)
+    futures = []
+    lock = threading.Lock()
+
+    def submit(i):
+        barrier.wait()
+        if i == 3:
+            fn = lambda session: 1 / 0
+        else:
+            fn = lambda session, i=i: storage._insert_candidate(session, {"full_name": f"gc-{i}"}, [])
+        with lock:
+            futures.append((i, writer.submit(fn)))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i, future in futures:
+        if i == 3:
+            assert isinstance(future.exception(timeout=5), ZeroDivisionError)
+        else:
+            assert future.result(timeout=5) > 0
+    writer.stop()
+    assert writer.writes == 7
+    assert writer.batches < 7
+
+
+def test_questions_are_deduplicated_and_legacy_rows_migrate():
+    from backend.models import Candidate, QuestionBlock, QuestionText
+
+    _save("dedupe-1", techs=("Rust",))
+    session = storage.SessionLocal()
+    before = session.query(QuestionText).count()
+    session.close()
+    storage.save_candidate_with_questions({"full_name": "dedupe-2"}, [
+        {"technology": "Rust", "difficulty": "medium", "questions": ["Rust q1", "  Explain the main use-cases of   Rust. "]},
+    ])
+    session = storage.SessionLocal()
+    assert session.query(QuestionText).count() == before + 1  # only the new wording is stored
+
+    # a row written by the old JSON-blob schema
+    legacy = Candidate(full_name="legacy")
+    session.add(legacy)
+    session.flush()
+    session.add(QuestionBlock(candidate_id=legacy.id, technology="Rust", difficulty="easy", questions_json='["Rust q1", "Legacy only?"]'))
+    session.commit()
+    legacy_id = legacy.id
+    session.close()
+
+    assert storage.load_candidate_with_questions(legacy_id)["question_blocks"][0]["questions"] == ["Rust q1", "Legacy only?"]
+    assert storage.migrate_legacy_questions() >= 1
+    assert storage.migrate_legacy_questions() == 0
+    item = storage.load_candidate_with_questions(legacy_id)
+    assert item["question_blocks"][0]["questions"] == ["Rust q1", "Legacy only?"]
+    assert item["question_blocks"][0]["difficulty"] == "easy"
+
+    session = storage.SessionLocal()
+    assert session.query(QuestionBlock).filter(QuestionBlock.candidate_id == legacy_id).one().questions_json is None
+    session.close()
+    top = storage.top_questions(technology="Rust", limit=1)
+    assert top[0] == {"question": "Rust q1", "times_used": 3, "candidates": 3}
+
+
+def test_full_text_search_ranks_and_paginates():
+    storage.save_candidate_with_questions(
+        {"full_name": "Zelda Kowalski", "desired_position": "Platform Engineer", "location": "Kraków", "tech_stack_raw": "Kubernetes, Terraform"},
+        [{"technology": "Kubernetes", "difficulty": "hard", "questions": ["How do you debug a CrashLoopBackOff pod?"]}],
+    )
+    for i in range(3):
+        storage.save_candidate_with_questions(
+            {"full_name": f"Search Filler {i}", "desired_position": "Data Engineer", "tech_stack_raw": "Spark"},
+            [{"technology": "Spark", "difficulty": "medium", "questions": ["Explain Kubernetes operators for Spark."]}],
+        )
+
+    result = storage.search_candidates("kubernetes")
+    assert result["total"] == 4
+    # name/tech-stack matches outrank a mention buried in question text
+    assert result["items"][0]["candidate"]["full_name"] == "Zelda Kowalski"
+
+    assert storage.search_candidates("krakow")["items"][0]["candidate"]["location"] == "Kraków"
+    # hits carry candidate fields only: no question blocks are loaded per hit
+    found, statements = _count_queries(lambda: storage.search_candidates("search fill", limit=10))
+    assert len(found["items"]) >= 2 and "question_blocks" not in found["items"][0]
+    assert not [s for s in statements if "question_blocks" in s or "FROM questions" in s]
+    assert storage.search_candidates("crashloop")["total"] == 1  # prefix match on question text
+    assert storage.search_candidates("search fill", limit=2, offset=2)["items"][0]["candidate"]["full_name"].startswith("Search Filler")
+    assert storage.search_candidates('"; DROP TABLE candidates; --')["total"] == 0
+
+    assert storage.rebuild_search_index() >= 4
+    assert storage.search_candidates("terraform")["total"] == 1
+
+
+def test_import_does_not_touch_the_database(tmp_path):
+    db_path = tmp_path / "lazy.db"
+    env = dict(os.environ, TALENTSCOUT_DB=str(db_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run(code):
+        subprocess.run([sys.executable, "-c", code], env=env, cwd=root, check=True)
+
+    run("import backend.storage, backend.jobs, backend.http_api")
+    assert not db_path.exists()
+    run("from backend import storage; storage.init_db(); storage.init_db()")
+    assert db_path.exists()